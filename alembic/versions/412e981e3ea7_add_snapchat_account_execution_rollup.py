@@ -0,0 +1,83 @@
+"""Add snapchat_account_execution_rollup
+
+Revision ID: 412e981e3ea7
+Revises: 5d68931b7bf1
+Create Date: 2026-10-17 09:12:31.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '412e981e3ea7'
+down_revision: Union[str, None] = '5d68931b7bf1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The table may already exist if the API created it through Base.metadata.create_all.
+    if not sa.inspect(op.get_bind()).has_table('snapchat_account_execution_rollup'):
+        op.create_table(
+            'snapchat_account_execution_rollup',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('snapchat_account_id', sa.Integer(),
+                      sa.ForeignKey('snapchat_account.id', ondelete='CASCADE'), nullable=False, unique=True),
+            sa.Column('total_executions', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('successful_executions', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('quick_adds_sent_requests', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('quick_adds_rejected_count', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('consume_leads_sent_requests', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('generated_leads', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('generate_leads_rejected_count', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('last_conversations', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('last_conversations_execution_id', sa.Integer(), nullable=True),
+        )
+
+    # Seed the rollup from the existing execution history. Frozen snapshot of
+    # SnapchatAccountStatisticsService.EXECUTION_ROLLUP_REBUILD_SQL as of this revision: the
+    # result JSON is still text here, the counter columns come with b81e3f57c2d4. Use
+    # rebuild_execution_rollups to repair the table on a current schema.
+    op.execute("DELETE FROM snapchat_account_execution_rollup")
+    op.execute("""
+        INSERT INTO snapchat_account_execution_rollup (
+            snapchat_account_id,
+            total_executions,
+            successful_executions,
+            quick_adds_sent_requests,
+            quick_adds_rejected_count,
+            consume_leads_sent_requests,
+            generated_leads,
+            generate_leads_rejected_count,
+            last_conversations,
+            last_conversations_execution_id
+        )
+        SELECT
+            ae.snap_account_id,
+            COUNT(*),
+            COUNT(*) FILTER (WHERE ae.status = 'DONE'),
+            COALESCE(SUM(CAST(ae.result->>'total_sent_requests' AS INTEGER))
+                FILTER (WHERE ae.status = 'DONE' AND ae.type = 'QUICK_ADDS'), 0),
+            COALESCE(SUM(CAST(ae.result->>'rejected_count' AS INTEGER))
+                FILTER (WHERE ae.status = 'DONE' AND ae.type = 'QUICK_ADDS'), 0),
+            COALESCE(SUM(CAST(ae.result->>'total_sent_requests' AS INTEGER))
+                FILTER (WHERE ae.status = 'DONE' AND ae.type = 'CONSUME_LEADS'), 0),
+            COALESCE(SUM(CAST(ae.result->>'generated_leads' AS INTEGER))
+                FILTER (WHERE ae.status = 'DONE' AND ae.type = 'GENERATE_LEADS'), 0),
+            COALESCE(SUM(CAST(ae.result->>'rejected_count' AS INTEGER))
+                FILTER (WHERE ae.status = 'DONE' AND ae.type = 'GENERATE_LEADS'), 0),
+            COALESCE((ARRAY_AGG(COALESCE(CAST(ae.result->>'conversations' AS INTEGER), 0) ORDER BY ae.id DESC)
+                FILTER (WHERE ae.status = 'DONE' AND ae.type = 'CHECK_CONVERSATIONS'
+                        AND jsonb_exists(ae.result::jsonb, 'conversations')))[1], 0),
+            MAX(ae.id) FILTER (WHERE ae.status = 'DONE' AND ae.type = 'CHECK_CONVERSATIONS'
+                               AND jsonb_exists(ae.result::jsonb, 'conversations'))
+        FROM account_execution ae
+        GROUP BY ae.snap_account_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('snapchat_account_execution_rollup')
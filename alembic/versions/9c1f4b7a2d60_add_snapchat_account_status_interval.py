@@ -0,0 +1,72 @@
+"""Add snapchat_account_status_interval
+
+Revision ID: 9c1f4b7a2d60
+Revises: 412e981e3ea7
+Create Date: 2026-10-17 10:04:52.918344
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c1f4b7a2d60'
+down_revision: Union[str, None] = '412e981e3ea7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The table may already exist if the API created it through Base.metadata.create_all.
+    if not sa.inspect(op.get_bind()).has_table('snapchat_account_status_interval'):
+        op.create_table(
+            'snapchat_account_status_interval',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('snapchat_account_id', sa.Integer(),
+                      sa.ForeignKey('snapchat_account.id', ondelete='CASCADE'), nullable=False),
+            sa.Column('status', postgresql.ENUM(name='account_status_enum', create_type=False), nullable=True),
+            sa.Column('entered_at', sa.DateTime(), nullable=False),
+            sa.Column('exited_at', sa.DateTime(), nullable=True),
+            sa.Column('is_first_exit', sa.Boolean(), nullable=False, server_default=sa.false()),
+        )
+        op.create_index('ix_snapchat_account_status_interval_account_open',
+                        'snapchat_account_status_interval', ['snapchat_account_id', 'exited_at'])
+        op.create_index('ix_snapchat_account_status_interval_first_exit',
+                        'snapchat_account_status_interval', ['snapchat_account_id'],
+                        unique=True, postgresql_where=sa.text('is_first_exit'))
+
+    # Rebuild the intervals from the status log: each log entry opens an interval that the
+    # next entry of the same account closes. Frozen snapshot of the statements of
+    # SnapchatAccountStatisticsService.rebuild_status_intervals as of this revision.
+    op.execute("DELETE FROM snapchat_account_status_interval")
+    op.execute("""
+        INSERT INTO snapchat_account_status_interval (snapchat_account_id, status, entered_at, exited_at, is_first_exit)
+        SELECT
+            sal.snapchat_account_id,
+            sal.new_status,
+            sal.changed_at,
+            LEAD(sal.changed_at) OVER (PARTITION BY sal.snapchat_account_id ORDER BY sal.changed_at, sal.id),
+            FALSE
+        FROM snapchat_account_status_log sal
+        WHERE sal.changed_at IS NOT NULL
+    """)
+    op.execute("""
+        UPDATE snapchat_account_status_interval si
+        SET is_first_exit = TRUE
+        FROM (
+            SELECT DISTINCT ON (si.snapchat_account_id) si.id
+            FROM snapchat_account_status_interval si
+            JOIN snapchat_account sa ON sa.id = si.snapchat_account_id
+            WHERE si.status NOT IN ('RECENTLY_INGESTED', 'GOOD_STANDING')
+              AND si.entered_at > sa.added_to_system_date
+            ORDER BY si.snapchat_account_id, si.entered_at, si.id
+        ) first_exit
+        WHERE si.id = first_exit.id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('snapchat_account_status_interval')
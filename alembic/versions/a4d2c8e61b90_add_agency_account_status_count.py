@@ -0,0 +1,67 @@
+"""Add agency account status counters and quick-add flag
+
+Revision ID: a4d2c8e61b90
+Revises: f7a09b3c6e15
+Create Date: 2026-10-17 13:41:05.218734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d2c8e61b90'
+down_revision: Union[str, None] = 'f7a09b3c6e15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    existing = {column['name'] for column in inspector.get_columns('snapchat_account')}
+    if 'has_completed_quick_add' not in existing:
+        op.add_column('snapchat_account',
+                      sa.Column('has_completed_quick_add', sa.Boolean(), nullable=False, server_default=sa.false()))
+
+    op.execute("""
+        UPDATE snapchat_account sa
+        SET has_completed_quick_add = TRUE
+        WHERE EXISTS (
+            SELECT 1 FROM account_execution ae
+            WHERE ae.snap_account_id = sa.id
+              AND ae.type = 'QUICK_ADDS'
+              AND ae.status = 'DONE'
+        )
+    """)
+
+    if not inspector.has_table('agency_account_status_count'):
+        op.create_table(
+            'agency_account_status_count',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('agency_id', sa.Integer(), nullable=False),
+            sa.Column('status', postgresql.ENUM(name='account_status_enum', create_type=False), nullable=False),
+            sa.Column('accounts', sa.Integer(), nullable=False),
+            sa.Column('completed_quick_add_accounts', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['agency_id'], ['agencies.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('agency_id', 'status', name='uq_agency_account_status_count'),
+        )
+
+    # Frozen snapshot of SnapchatAccountStatisticsService.STATUS_COUNTERS_REBUILD_SQL as of
+    # this revision.
+    op.execute("DELETE FROM agency_account_status_count")
+    op.execute("""
+        INSERT INTO agency_account_status_count (agency_id, status, accounts, completed_quick_add_accounts)
+        SELECT agency_id, status, COUNT(*), COUNT(*) FILTER (WHERE has_completed_quick_add)
+        FROM snapchat_account
+        WHERE agency_id IS NOT NULL AND status IS NOT NULL
+        GROUP BY agency_id, status
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('agency_account_status_count')
+    op.drop_column('snapchat_account', 'has_completed_quick_add')
@@ -0,0 +1,33 @@
+"""Add snapchat_account (agency_id, id) index
+
+Revision ID: a9d4e6b1c372
+Revises: f3c95d7a1e28
+Create Date: 2026-10-17 18:12:40.305918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d4e6b1c372'
+down_revision: Union[str, None] = 'f3c95d7a1e28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Serves the keyset pagination of the account list; built without locking out writes.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_snapchat_account_agency_id', 'snapchat_account', ['agency_id', 'id'],
+            if_not_exists=True, postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_snapchat_account_agency_id', table_name='snapchat_account', if_exists=True, postgresql_concurrently=True
+        )
@@ -0,0 +1,49 @@
+"""Store account_execution.result as JSONB with generated counter columns
+
+Revision ID: b81e3f57c2d4
+Revises: a4d2c8e61b90
+Create Date: 2026-10-17 14:22:37.904512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81e3f57c2d4'
+down_revision: Union[str, None] = 'a4d2c8e61b90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+RESULT_COUNTERS = ('total_sent_requests', 'rejected_count', 'generated_leads', 'conversations')
+
+
+def upgrade() -> None:
+    columns = {column['name']: column for column in sa.inspect(op.get_bind()).get_columns('account_execution')}
+
+    if not isinstance(columns['result']['type'], postgresql.JSONB):
+        op.execute("ALTER TABLE account_execution ALTER COLUMN result TYPE JSONB USING result::jsonb")
+
+    for key in RESULT_COUNTERS:
+        if key not in columns:
+            op.execute(
+                f"ALTER TABLE account_execution ADD COLUMN {key} INTEGER GENERATED ALWAYS AS ("
+                f"CASE WHEN jsonb_typeof(result -> '{key}') = 'number' "
+                f"THEN (result ->> '{key}')::numeric::integer END) STORED"
+            )
+
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_account_execution_account_type_status "
+        "ON account_execution (snap_account_id, type, status)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_account_execution_account_type_status")
+    for key in RESULT_COUNTERS:
+        op.drop_column('account_execution', key)
+    op.execute("ALTER TABLE account_execution ALTER COLUMN result TYPE JSON USING result::json")
@@ -0,0 +1,55 @@
+"""Add daily activity rollup tables
+
+Revision ID: c3e8a51f0b27
+Revises: 9c1f4b7a2d60
+Create Date: 2026-10-17 11:21:07.530912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e8a51f0b27'
+down_revision: Union[str, None] = '9c1f4b7a2d60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # History is loaded separately with `python -m scripts.backfill_daily_activity`.
+    inspector = sa.inspect(op.get_bind())
+    execution_type = postgresql.ENUM(name='executiontypeenum', create_type=False)
+
+    if not inspector.has_table('agency_daily_activity'):
+        op.create_table(
+            'agency_daily_activity',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('agency_id', sa.Integer(), sa.ForeignKey('agencies.id', ondelete='CASCADE'), nullable=False),
+            sa.Column('day', sa.Date(), nullable=False),
+            sa.Column('execution_type', execution_type, nullable=False),
+            sa.Column('executions', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('accounts_ran', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('total_sent_requests', sa.Integer(), nullable=False, server_default='0'),
+            sa.UniqueConstraint('agency_id', 'day', 'execution_type', name='uq_agency_daily_activity'),
+        )
+
+    if not inspector.has_table('snapchat_account_daily_activity'):
+        op.create_table(
+            'snapchat_account_daily_activity',
+            sa.Column('snapchat_account_id', sa.Integer(),
+                      sa.ForeignKey('snapchat_account.id', ondelete='CASCADE'), primary_key=True),
+            sa.Column('day', sa.Date(), primary_key=True),
+            sa.Column('execution_type', execution_type, primary_key=True),
+            sa.Column('agency_id', sa.Integer(), sa.ForeignKey('agencies.id', ondelete='CASCADE'), nullable=False),
+        )
+        op.create_index('ix_snapchat_account_daily_activity_agency_day',
+                        'snapchat_account_daily_activity', ['agency_id', 'day'])
+
+
+def downgrade() -> None:
+    op.drop_table('snapchat_account_daily_activity')
+    op.drop_table('agency_daily_activity')
@@ -0,0 +1,43 @@
+"""Add composite and partial snapchat_account indexes
+
+Revision ID: c6f1a9d3e820
+Revises: b81e3f57c2d4
+Create Date: 2026-10-17 14:58:12.417093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6f1a9d3e820'
+down_revision: Union[str, None] = 'b81e3f57c2d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# name -> (columns, partial index predicate)
+INDEXES = {
+    'ix_snapchat_account_agency_status': (['agency_id', 'status'], None),
+    'ix_snapchat_account_agency_model': (['agency_id', 'model_id'], None),
+    'ix_snapchat_account_workflow': (['workflow_id'], 'workflow_id IS NOT NULL'),
+    'ix_snapchat_account_proxy': (['proxy_id'], 'proxy_id IS NOT NULL'),
+}
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction; build without locking out writes.
+    with op.get_context().autocommit_block():
+        for name, (columns, where) in INDEXES.items():
+            op.create_index(
+                name, 'snapchat_account', columns, if_not_exists=True, postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.drop_index(name, table_name='snapchat_account', if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,42 @@
+"""Add execution and account_execution indexes
+
+Revision ID: d2b7e4c9a153
+Revises: c6f1a9d3e820
+Create Date: 2026-10-17 15:03:40.682215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2b7e4c9a153'
+down_revision: Union[str, None] = 'c6f1a9d3e820'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# name -> (table, columns, partial index predicate)
+INDEXES = {
+    'ix_execution_agency_start_time': ('execution', ['agency_id', 'start_time'], None),
+    'ix_execution_job': ('execution', ['job_id'], 'job_id IS NOT NULL'),
+    'ix_account_execution_execution': ('account_execution', ['execution_id'], None),
+}
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction; build without locking out writes.
+    with op.get_context().autocommit_block():
+        for name, (table, columns, where) in INDEXES.items():
+            op.create_index(
+                name, table, columns, if_not_exists=True, postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, (table, _, _) in INDEXES.items():
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
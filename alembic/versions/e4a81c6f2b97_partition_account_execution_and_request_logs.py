@@ -0,0 +1,122 @@
+"""Partition account_execution and snapkat_request_logs by month
+
+Revision ID: e4a81c6f2b97
+Revises: d2b7e4c9a153
+Create Date: 2026-10-17 15:46:21.530864
+
+"""
+from datetime import date, datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a81c6f2b97'
+down_revision: Union[str, None] = 'd2b7e4c9a153'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+MONTHS_AHEAD = 3
+
+# table -> (partition key, foreign keys, indexes)
+TABLES = {
+    'account_execution': (
+        'start_time',
+        [
+            'FOREIGN KEY (execution_id) REFERENCES execution (id)',
+            'FOREIGN KEY (snap_account_id) REFERENCES snapchat_account (id)',
+        ],
+        {
+            'ix_account_execution_id': ['id'],
+            'idx_account_execution_type': ['type'],
+            'ix_account_execution_account_start_time': ['snap_account_id', 'start_time', 'id'],
+            'ix_account_execution_account_type_status': ['snap_account_id', 'type', 'status'],
+            'ix_account_execution_execution': ['execution_id'],
+        },
+    ),
+    'snapkat_request_logs': ('created_at', [], {}),
+}
+
+
+def _add_months(value: date, months: int) -> date:
+    month_index = value.year * 12 + value.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def _is_partitioned(bind, table: str) -> bool:
+    return bind.execute(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+        "WHERE c.relname = :table)"
+    ), {'table': table}).scalar()
+
+
+def _partition(bind, table: str, key: str, foreign_keys: list, indexes: dict) -> None:
+    old_table = f'{table}_unpartitioned'
+    columns = sa.inspect(bind).get_columns(table)
+    copied = ', '.join(column['name'] for column in columns if not column.get('computed'))
+
+    op.execute(f"UPDATE {table} SET {key} = now() WHERE {key} IS NULL")
+    op.execute(f"ALTER TABLE {table} RENAME TO {old_table}")
+    op.execute(f"ALTER TABLE {old_table} RENAME CONSTRAINT {table}_pkey TO {old_table}_pkey")
+    # The id sequence belongs to the old table; keep it alive for the new one.
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY NONE")
+    op.execute(
+        f"CREATE TABLE {table} (LIKE {old_table} INCLUDING DEFAULTS INCLUDING GENERATED) "
+        f"PARTITION BY RANGE ({key})"
+    )
+    op.execute(f"ALTER TABLE {table} ALTER COLUMN {key} SET NOT NULL")
+    op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id, {key})")
+    for foreign_key in foreign_keys:
+        op.execute(f"ALTER TABLE {table} ADD {foreign_key}")
+
+    first = bind.execute(sa.text(f"SELECT min({key}) FROM {old_table}")).scalar() or datetime.utcnow()
+    month = date(first.year, first.month, 1)
+    now = datetime.utcnow()
+    last = _add_months(date(now.year, now.month, 1), MONTHS_AHEAD)
+    while month <= last:
+        op.execute(
+            f"CREATE TABLE {table}_p{month:%Y%m} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+        )
+        month = _add_months(month, 1)
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+    op.execute(f"INSERT INTO {table} ({copied}) SELECT {copied} FROM {old_table}")
+    op.execute(f"DROP TABLE {old_table}")
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+    for name, index_columns in indexes.items():
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(index_columns)})")
+    op.execute(f"ANALYZE {table}")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    for table, (key, foreign_keys, indexes) in TABLES.items():
+        if not _is_partitioned(bind, table):
+            _partition(bind, table, key, foreign_keys, indexes)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    for table, (key, foreign_keys, indexes) in TABLES.items():
+        if not _is_partitioned(bind, table):
+            continue
+        old_table = f'{table}_partitioned'
+        columns = sa.inspect(bind).get_columns(table)
+        copied = ', '.join(column['name'] for column in columns if not column.get('computed'))
+
+        op.execute(f"ALTER TABLE {table} RENAME TO {old_table}")
+        op.execute(f"ALTER TABLE {old_table} RENAME CONSTRAINT {table}_pkey TO {old_table}_pkey")
+        op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY NONE")
+        op.execute(f"CREATE TABLE {table} (LIKE {old_table} INCLUDING DEFAULTS INCLUDING GENERATED)")
+        op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id)")
+        for foreign_key in foreign_keys:
+            op.execute(f"ALTER TABLE {table} ADD {foreign_key}")
+        op.execute(f"INSERT INTO {table} ({copied}) SELECT {copied} FROM {old_table}")
+        op.execute(f"DROP TABLE {old_table} CASCADE")
+        op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+        for name, index_columns in indexes.items():
+            op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(index_columns)})")
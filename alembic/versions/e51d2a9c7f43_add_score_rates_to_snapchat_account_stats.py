@@ -0,0 +1,42 @@
+"""Add score rates to snapchat_account_stats
+
+Revision ID: e51d2a9c7f43
+Revises: c3e8a51f0b27
+Create Date: 2026-10-17 12:02:44.187265
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e51d2a9c7f43'
+down_revision: Union[str, None] = 'c3e8a51f0b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+RATE_COLUMNS = ('rejecting_rate', 'conversation_rate', 'conversion_rate')
+
+
+def upgrade() -> None:
+    existing = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('snapchat_account_stats')}
+    for name in RATE_COLUMNS:
+        if name not in existing:
+            op.add_column('snapchat_account_stats',
+                          sa.Column(name, sa.Float(), nullable=False, server_default='0'))
+
+    op.execute("""
+        UPDATE snapchat_account_stats
+        SET rejecting_rate = COALESCE(
+                rejected_total::float / NULLIF(rejected_total + quick_ads_sent + generated_leads, 0), 0),
+            conversation_rate = COALESCE(total_conversations::float / NULLIF(quick_ads_sent, 0), 0),
+            conversion_rate = COALESCE(total_conversions::float / NULLIF(conversations_charged, 0), 0)
+    """)
+
+
+def downgrade() -> None:
+    for name in RATE_COLUMNS:
+        op.drop_column('snapchat_account_stats', name)
@@ -0,0 +1,35 @@
+"""Add execution_archive_month
+
+Revision ID: f3c95d7a1e28
+Revises: e4a81c6f2b97
+Create Date: 2026-10-17 16:31:54.108327
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c95d7a1e28'
+down_revision: Union[str, None] = 'e4a81c6f2b97'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table('execution_archive_month'):
+        return
+    op.create_table(
+        'execution_archive_month',
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('uri', sa.String(), nullable=False),
+        sa.Column('rows', sa.Integer(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('month'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('execution_archive_month')
@@ -0,0 +1,33 @@
+"""Add account timeline indexes
+
+Revision ID: f7a09b3c6e15
+Revises: e51d2a9c7f43
+Create Date: 2026-10-17 12:48:19.663502
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7a09b3c6e15'
+down_revision: Union[str, None] = 'e51d2a9c7f43'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_account_execution_account_start_time "
+        "ON account_execution (snap_account_id, start_time, id)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_snapchat_account_status_log_account_changed_at "
+        "ON snapchat_account_status_log (snapchat_account_id, changed_at, id)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_snapchat_account_status_log_account_changed_at")
+    op.execute("DROP INDEX IF EXISTS ix_account_execution_account_start_time")
@@ -13,6 +13,11 @@ if protobuf_path not in sys.path:
 setup_logging()
 logger = logging.getLogger(__name__)
 
+# Celery workers get the "worker" connection pool profile (see app/database.py). This has
+# to be decided before app.database is imported and builds its engine.
+if os.path.basename(sys.argv[0]) == "celery" and "worker" in sys.argv:
+    os.environ.setdefault("DB_PROCESS_ROLE", "worker")
+
 from app.services.key_vault.key_vault_manager import KeyVaultManager
 
 # Load API key only once when Celery worker starts
@@ -44,6 +49,13 @@ def configure_worker_logging(**kwargs):
     setup_logging()
     logger.info("✅ Worker logging configured.")
 
+
+@worker_process_init.connect
+def reset_worker_connection_pool(**kwargs):
+    # Forked children must not reuse connections pooled by the parent.
+    from app.database import engine
+    engine.dispose(close=False)
+
 @after_setup_task_logger.connect
 def configure_task_logger(logger, *args, **kwargs):
     setup_logging()
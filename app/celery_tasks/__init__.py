@@ -3,5 +3,8 @@ from .job_task import JobTaskManager
 from .unlock_accounts_job import UnlockAccountsTaskManager
 from .workflow_task import WorkflowTaskManager
 from .email_task import EmailTaskManager
+from .partition_maintenance_task import PartitionMaintenanceTaskManager
+from .subscription_expiry_task import SubscriptionExpiryTaskManager
 
-__all__ = ["ExecutionTaskManager", "JobTaskManager", "UnlockAccountsTaskManager", "WorkflowTaskManager", "EmailTaskManager"]
+__all__ = ["ExecutionTaskManager", "JobTaskManager", "UnlockAccountsTaskManager", "WorkflowTaskManager", "EmailTaskManager",
+           "PartitionMaintenanceTaskManager", "SubscriptionExpiryTaskManager"]
@@ -16,7 +16,7 @@ from datetime import datetime
 from celery import group, chord
 from typing import Optional
 from sqlalchemy.orm import Session
-from app.event_listeners import log_status_change
+from app.event_listeners import log_status_changes
 from app.services.snapchat_account_statistics_service import SnapchatAccountStatisticsService
 
 logger = logging.getLogger(__name__)
@@ -62,6 +62,7 @@ class ExecutionTaskManager:
             if execution.type == ExecutionTypeEnum.GENERATE_LEADS:
                 snapchat_accounts = SnapchatAccountStatisticsService.select_top_n_snapchat_accounts_optimized(
                     session=db,
+                    agency_id=execution.agency_id,
                     n=execution.configuration["accounts_number"],
                     weight_rejecting_rate=execution.configuration["weight_rejecting_rate"],
                     weight_conversation_rate=execution.configuration["weight_conversation_rate"],
@@ -85,6 +86,19 @@ class ExecutionTaskManager:
                 )
                 account_ids = list(set(snapchat_account.id for snapchat_account in snapchat_accounts))
 
+            if execution.type == ExecutionTypeEnum.COMPUTE_STATISTICS and (execution.configuration or {}).get("bulk_mode"):
+                # Agency-wide recompute: one set-based pass instead of a chord of child tasks.
+                results = JobExecutorService.handle_compute_statistics_bulk(db, execution, account_ids)
+                execution.status = StatusEnum.DONE
+                execution.end_time = datetime.utcnow()
+                db.commit()
+                return {
+                    "execution_id": execution_id,
+                    "final_status": execution.status.name,
+                    "end_time": execution.end_time.isoformat(),
+                    "failed_accounts": sum(1 for result in results.values() if not result.success),
+                }
+
             for account_id in account_ids:
                 execution_account = AccountExecution(
                     execution_id=execution_id,
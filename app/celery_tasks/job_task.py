@@ -11,7 +11,7 @@ from app.models.status_enum import StatusEnum
 from app.schemas import SnapchatAccount
 from app.schemas.executions.execution import Execution
 from app.schemas.executions.job import Job
-from app.event_listeners import log_status_change
+from app.event_listeners import log_status_changes
 from app.services.snapchat_account_statistics_service import SnapchatAccountStatisticsService
 from app.services.subscription_service import SubscriptionService
 
@@ -43,7 +43,7 @@ class JobTaskManager:
                 logger.warning(f"Job ID {job_id} not found or is not active.")
                 return {"detail": "Job not found or is not active."}
 
-            if not SubscriptionService.is_subscription_available(db, job.agency_id):
+            if not SubscriptionService.is_subscription_available(job.agency_id):
                 message = f"Job {job.name} was not executed because subscription is expired."
                 logger.info(message)
                 return {"detail": message}
@@ -0,0 +1,29 @@
+import logging
+
+from app.celery_app import celery
+from app.database import SessionLocal
+from app.services.execution_archive_service import ExecutionArchiveService
+from app.services.partition_service import PartitionService
+
+logger = logging.getLogger(__name__)
+
+
+class PartitionMaintenanceTaskManager:
+
+    @staticmethod
+    @celery.task
+    def maintain_partitions():
+        """
+        Celery task that creates the upcoming monthly partitions, archives old account
+        execution months to Parquet and applies the retention policy to the partitioned tables.
+
+        Returns:
+            None
+        """
+        try:
+            with SessionLocal() as db:
+                PartitionService.ensure_partitions(db)
+                ExecutionArchiveService.archive_expired(db)
+                PartitionService.apply_retention(db)
+        except Exception as e:
+            logger.error(f"Failure in partition maintenance: {e}", exc_info=True)
@@ -0,0 +1,28 @@
+import logging
+
+from app.celery_app import celery
+from app.database import SessionLocal
+from app.services.subscription_service import SubscriptionService
+
+logger = logging.getLogger(__name__)
+
+
+class SubscriptionExpiryTaskManager:
+
+    @staticmethod
+    @celery.task
+    def expire_subscriptions():
+        """
+        Celery task that moves the subscriptions whose turned_off_at has passed to EXPIRED
+        and publishes their new state to the API and worker processes.
+
+        Returns:
+            None
+        """
+        try:
+            with SessionLocal() as db:
+                expired = SubscriptionService.expire_due_subscriptions(db)
+            if expired:
+                logger.info(f"Expired the subscriptions of agencies {expired}.")
+        except Exception as e:
+            logger.error(f"Failure in subscription expiry: {e}", exc_info=True)
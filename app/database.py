@@ -1,7 +1,18 @@
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy import create_engine, MetaData, text, make_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import NullPool
+import asyncio
+import logging
 import os
+import threading
+import time
+
+from app.utils.pool_metrics import InstrumentedQueuePool, InstrumentedAsyncQueuePool
+
+logger = logging.getLogger(__name__)
+
 # Testing Paths
 # # Database URLs
 # POSTGRES_USER = "postgres"
@@ -35,17 +46,46 @@ ASYNC_DATABASE_URL = (f"postgresql+asyncpg://{POSTGRES_USER}:{POSTGRES_PASSWORD}
 # )
 # SessionLocalNeo = sessionmaker(autocommit=False, autoflush=False, bind=neo_engine)
 
+# ------------------------------
+# Connection pool profiles
+# ------------------------------
+# Pool sizing depends on the kind of process importing this module (DB_PROCESS_ROLE):
+# - "api": one pool shared by the uvicorn threadpool.
+# - "worker": Celery prefork children. Each child is its own process, so pools multiply
+#   with concurrency; NullPool (default) opens a connection per session, which is what
+#   PgBouncer in transaction mode expects. DB_WORKER_POOL=small keeps a tiny pool instead.
+# - "script": CLIs and one-off jobs.
+# DB_POOL_SIZE / DB_MAX_OVERFLOW / DB_POOL_TIMEOUT override the profile's sizes.
+DB_PROCESS_ROLE = os.getenv("DB_PROCESS_ROLE", "api")
+
+POOL_PROFILES = {
+    "api": {"pool_size": 40, "max_overflow": 20, "pool_timeout": 30},
+    "worker": {"pool_size": 2, "max_overflow": 2, "pool_timeout": 60},
+    "script": {"pool_size": 2, "max_overflow": 0, "pool_timeout": 60},
+}
+
+
+def pool_options(role: str = DB_PROCESS_ROLE, instrumented_pool=InstrumentedQueuePool) -> dict:
+    """
+    Returns the create_engine pool arguments for a process role.
+    """
+    if role == "worker" and os.getenv("DB_WORKER_POOL", "null") == "null":
+        return {"poolclass": NullPool}
+    profile = POOL_PROFILES.get(role, POOL_PROFILES["api"])
+    return {
+        "poolclass": instrumented_pool,
+        "pool_size": int(os.getenv("DB_POOL_SIZE", profile["pool_size"])),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", profile["max_overflow"])),
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", profile["pool_timeout"])),
+        "pool_recycle": 3600,  # Recycle connections every 1 hour to prevent them from hanging too long
+        "pool_pre_ping": True,
+    }
+
+
 # ------------------------------
 # Synchronous Database Setup
 # ------------------------------
-engine = create_engine(
-    SYNC_DATABASE_URL,
-    echo=False,
-    pool_size=300,        # Increase the pool size for better connection handling
-    max_overflow=100,     # Allow up to 50 extra connections beyond the pool size
-    pool_timeout=60,     # Increase the timeout to 60 seconds for long-running jobs
-    pool_recycle=3600    # Recycle connections every 1 hour to prevent them from hanging too long
-)
+engine = create_engine(SYNC_DATABASE_URL, echo=False, **pool_options())
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def get_db():
@@ -59,17 +99,105 @@ def get_db():
         db.close()
 
 # ------------------------------
-# Asynchronous Database Setup
+# Read replica
 # ------------------------------
-async_engine = create_async_engine(
-    ASYNC_DATABASE_URL,
-    echo=False,
-    pool_size=300,  # Increase the pool size for better connection handling
-    max_overflow=100,  # Allow up to 50 extra connections beyond the pool size
-    pool_timeout=60,  # Increase the timeout to 60 seconds for long-running jobs
-    pool_recycle=3600  # Recycle connections every 1 hour to prevent them from hanging too long
+# Optional streaming replica for read-only endpoints (get_read_db). Reads fall back to the
+# primary when no replica is configured, when it cannot be reached, or when it lags more
+# than READ_REPLICA_MAX_LAG_SECONDS. The replica's state is re-checked at most every
+# READ_REPLICA_CHECK_INTERVAL_SECONDS.
+READ_REPLICA_DATABASE_URL = os.getenv("READ_REPLICA_DATABASE_URL")
+READ_REPLICA_MAX_LAG_SECONDS = float(os.getenv("READ_REPLICA_MAX_LAG_SECONDS", "30"))
+READ_REPLICA_CHECK_INTERVAL_SECONDS = float(os.getenv("READ_REPLICA_CHECK_INTERVAL_SECONDS", "5"))
+
+read_engine = (
+    create_engine(READ_REPLICA_DATABASE_URL, echo=False, **pool_options())
+    if READ_REPLICA_DATABASE_URL else None
+)
+ReadSessionLocal = (
+    sessionmaker(autocommit=False, autoflush=False, bind=read_engine, info={"read_replica": True})
+    if read_engine is not None else None
 )
-AsyncSessionLocal = async_sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False)
+
+_replica_state = {"checked_at": None, "usable": False}
+_replica_lock = threading.Lock()
+
+
+def _replica_usable() -> bool:
+    now = time.monotonic()
+    checked_at = _replica_state["checked_at"]
+    if checked_at is not None and now - checked_at < READ_REPLICA_CHECK_INTERVAL_SECONDS:
+        return _replica_state["usable"]
+    with _replica_lock:
+        if _replica_state["checked_at"] is not checked_at:
+            return _replica_state["usable"]
+        try:
+            with read_engine.connect() as connection:
+                # An idle primary produces no new WAL; a fully replayed replica is not lagging.
+                lag = connection.execute(text("""
+                    SELECT CASE
+                        WHEN NOT pg_is_in_recovery() THEN 0
+                        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+                    END
+                """)).scalar()
+            usable = lag <= READ_REPLICA_MAX_LAG_SECONDS
+            if not usable:
+                logger.warning(f"Read replica lags {lag:.1f}s, reading from the primary.")
+        except SQLAlchemyError as e:
+            logger.warning(f"Read replica unavailable, reading from the primary: {e}")
+            usable = False
+        _replica_state.update(checked_at=time.monotonic(), usable=usable)
+        return usable
+
+
+def new_read_session():
+    """
+    Returns a new session for read-only work, bound to the read replica when it is
+    configured and fresh enough, otherwise to the primary.
+
+    Replica sessions have session.info["read_replica"] set.
+    """
+    if ReadSessionLocal is not None and _replica_usable():
+        return ReadSessionLocal()
+    return SessionLocal()
+
+
+def get_read_db():
+    """
+    Dependency to get a synchronous session for read-only endpoints (see new_read_session).
+    """
+    db = new_read_session()
+    try:
+        yield db
+    finally:
+        db.close()
+
+# ------------------------------
+# Asynchronous Database Setup
+# ------------------------------
+# Built on first use: only the API's request-log writer needs it, so workers and
+# scripts never open asyncpg connections.
+_async_engine = None
+_async_sessionmaker = None
+
+
+def get_async_engine():
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            ASYNC_DATABASE_URL, echo=False, **pool_options(instrumented_pool=InstrumentedAsyncQueuePool)
+        )
+    return _async_engine
+
+
+def AsyncSessionLocal() -> AsyncSession:
+    """
+    Returns a new AsyncSession, building the async engine on first use.
+    """
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        _async_sessionmaker = async_sessionmaker(bind=get_async_engine(), class_=AsyncSession, expire_on_commit=False)
+    return _async_sessionmaker()
 
 async def get_async_db():
     """
@@ -78,6 +206,46 @@ async def get_async_db():
     async with AsyncSessionLocal() as session:
         yield session
 
+
+_async_read_sessionmaker = None
+
+
+def AsyncReadSessionLocal() -> AsyncSession:
+    """
+    Returns a new AsyncSession bound to the read replica, building its engine on first use.
+    """
+    global _async_read_sessionmaker
+    if _async_read_sessionmaker is None:
+        async_read_engine = create_async_engine(
+            make_url(READ_REPLICA_DATABASE_URL).set(drivername="postgresql+asyncpg"),
+            echo=False, **pool_options(instrumented_pool=InstrumentedAsyncQueuePool)
+        )
+        _async_read_sessionmaker = async_sessionmaker(
+            bind=async_read_engine, class_=AsyncSession, expire_on_commit=False, info={"read_replica": True}
+        )
+    return _async_read_sessionmaker()
+
+
+async def _replica_usable_async() -> bool:
+    checked_at = _replica_state["checked_at"]
+    if checked_at is not None and time.monotonic() - checked_at < READ_REPLICA_CHECK_INTERVAL_SECONDS:
+        return _replica_state["usable"]
+    # The check itself uses the synchronous replica engine; keep it off the event loop.
+    return await asyncio.to_thread(_replica_usable)
+
+
+async def get_async_read_db():
+    """
+    Dependency to get an asynchronous session for read-only endpoints, with the same
+    replica selection and fallback as get_read_db.
+    """
+    if READ_REPLICA_DATABASE_URL and await _replica_usable_async():
+        session = AsyncReadSessionLocal()
+    else:
+        session = AsyncSessionLocal()
+    async with session:
+        yield session
+
 # ------------------------------
 # Declarative Base
 # ------------------------------
@@ -60,3 +60,28 @@ class SnapchatAccountResponseV2(BaseModel):
     class Config:
         orm_mode = True
         from_attributes = True
+
+class SnapchatAccountListItemResponse(BaseModel):
+    """
+    Item of the account list. Only the requested fields are set (and serialized); the
+    device and cookie payloads are replaced by has_device / has_cookies flags.
+    """
+    id: int
+    username: Optional[str] = None
+    password: Optional[str] = None
+    snapchat_link: Optional[str] = None
+    two_fa_secret: Optional[str] = None
+    creation_date: Optional[datetime] = None
+    added_to_system_date: Optional[datetime] = None
+    status: Optional[str] = None
+    proxy: Optional[ProxySimpleResponse] = None
+    has_device: Optional[bool] = None
+    has_cookies: Optional[bool] = None
+    account_executions: Optional[List[AccountExecutionSimpleResponse]] = None
+    model: Optional[ModelResponse] = None
+    chat_bot: Optional[ChatBotResponse] = None
+    tags: Optional[List[str]] = None
+    account_source: Optional[str] = None
+    workflow: Optional[WorkflowSimplifiedNameResponse] = None
+    email: Optional[str] = None
+    email_password: Optional[str] = None
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 class SnapchatAccountStatsDTO(BaseModel):
     total_conversations: int = 0
@@ -33,6 +33,8 @@ class SnapchatAccountTimelineStatisticsDTO(BaseModel):
     ingestion_date: datetime
     account_executions: List[AccountExecutionDTO]
     status_changes: List[StatusChangeDTO]
+    # Set when the timeline was requested page by page and more executions follow
+    next_cursor: Optional[str] = None
 
 class ModelSnapchatAccountStatsDTO(BaseModel):
     model_name: str
@@ -1,41 +1,530 @@
+from collections import defaultdict
 from sqlalchemy.event import listens_for
-from datetime import datetime
+from datetime import datetime, timedelta
+from sqlalchemy import func, case, select, literal, exists, and_, column, cast, Integer, String
+from sqlalchemy import values as sa_values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
 from sqlalchemy.orm.attributes import get_history
 
 from app.models.account_status_enum import AccountStatusEnum
+from app.models.execution_type_enum import ExecutionTypeEnum
+from app.models.status_enum import StatusEnum
+from app.schemas.agency_account_status_count import AgencyAccountStatusCount
+from app.schemas.agency_daily_activity import AgencyDailyActivity
+from app.schemas.executions.account_execution import AccountExecution
+from app.schemas.model import Model
 from app.schemas.snapchat_account import SnapchatAccount
+from app.schemas.snapchat_account_daily_activity import SnapchatAccountDailyActivity
+from app.schemas.snapchat_account_execution_rollup import SnapchatAccountExecutionRollup
+from app.schemas.snapchat_account_status_interval import SnapchatAccountStatusInterval
 from app.schemas.snapchat_account_status_log import SnapchatAccountStatusLog
+from app.utils.statistics_cache import StatisticsCache
+
+ROLLUP_COUNTERS = (
+    "total_executions",
+    "successful_executions",
+    "quick_adds_sent_requests",
+    "quick_adds_rejected_count",
+    "consume_leads_sent_requests",
+    "generated_leads",
+    "generate_leads_rejected_count",
+)
+
+DAILY_ACTIVITY_COUNTERS = ("executions", "accounts_ran", "total_sent_requests")
+
+# Statuses an account is expected to leave; moving to any other status counts as its first exit.
+EXIT_FROM_STATUSES = (AccountStatusEnum.RECENTLY_INGESTED, AccountStatusEnum.GOOD_STANDING)
+
 
 def to_enum_if_str(value):
     if isinstance(value, str):
         return AccountStatusEnum(value)
     return value
 
-@listens_for(SnapchatAccount, 'before_update')
-def log_status_change(mapper, connection, target):
-    """Logs status changes for SnapchatAccount objects."""
-    # Retrieve the old and new values for the 'status' attribute
-    print("Attempting to change the status")
+def _status_change(target):
+    """Returns the (old, new) statuses of a pending status change of the account, or None."""
     history = get_history(target, 'status')
-    if history.has_changes():
-        old_status = history.deleted[0] if history.deleted else None
-        new_status = history.added[0] if history.added else None
-
-        if old_status:
-            old_status_enum = to_enum_if_str(old_status)
-        else:
-            old_status_enum = None
-        new_status_enum = to_enum_if_str(new_status)
-
-        if old_status_enum != new_status_enum and (
-                old_status_enum is None or old_status_enum.value != new_status_enum.value
-        ):
-            connection.execute(
-                SnapchatAccountStatusLog.__table__.insert(),
-                {
-                    'snapchat_account_id': target.id,
-                    'old_status': old_status_enum,
-                    'new_status': new_status_enum,
-                    'changed_at': datetime.utcnow()
-                }
+    if not history.has_changes():
+        return None
+    old_status = history.deleted[0] if history.deleted else None
+    new_status = history.added[0] if history.added else None
+
+    old_status_enum = to_enum_if_str(old_status) if old_status else None
+    new_status_enum = to_enum_if_str(new_status)
+
+    if old_status_enum != new_status_enum and (
+            old_status_enum is None or old_status_enum.value != new_status_enum.value
+    ):
+        return old_status_enum, new_status_enum
+    return None
+
+
+@listens_for(Session, 'after_flush')
+def log_status_changes(session, flush_context):
+    """
+    Logs the status changes of the SnapchatAccount objects updated by the flush, with one
+    multi-row insert into the status log and one set of interval updates per flush.
+    """
+    changes = []
+    for obj in session.dirty:
+        if isinstance(obj, SnapchatAccount) and obj not in session.deleted:
+            change = _status_change(obj)
+            if change:
+                changes.append((obj.id, *change))
+    if changes:
+        record_status_changes(session.connection(), changes, datetime.utcnow())
+
+
+def record_status_changes(connection, changes, changed_at):
+    """
+    Writes the status log entries of a batch of status changes and moves the accounts'
+    status intervals.
+
+    :param changes: [(snapchat_account_id, old_status, new_status)]
+    :param changed_at: Time of the changes.
+    """
+    connection.execute(SnapchatAccountStatusLog.__table__.insert().values([
+        {
+            'snapchat_account_id': snapchat_account_id,
+            'old_status': old_status,
+            'new_status': new_status,
+            'changed_at': changed_at
+        }
+        for snapchat_account_id, old_status, new_status in changes
+    ]))
+    record_status_intervals(
+        connection, [(snapchat_account_id, new_status) for snapchat_account_id, _, new_status in changes], changed_at
+    )
+
+
+def apply_status_count_deltas(connection, deltas_by_key: dict):
+    """
+    Adds deltas to agency_account_status_count rows with one multi-row INSERT ... ON CONFLICT.
+
+    :param deltas_by_key: {(agency_id, status): {"accounts": n, "completed_quick_add_accounts": m}}
+    """
+    rows = [
+        {"agency_id": agency_id, "status": to_enum_if_str(status),
+         "accounts": deltas.get("accounts", 0),
+         "completed_quick_add_accounts": deltas.get("completed_quick_add_accounts", 0)}
+        for (agency_id, status), deltas in deltas_by_key.items()
+        if agency_id is not None and status is not None and any(deltas.values())
+    ]
+    if not rows:
+        return
+    table = AgencyAccountStatusCount.__table__
+    stmt = pg_insert(table).values(rows)
+    connection.execute(stmt.on_conflict_do_update(
+        index_elements=[table.c.agency_id, table.c.status],
+        set_={name: table.c[name] + stmt.excluded[name] for name in ("accounts", "completed_quick_add_accounts")}
+    ))
+
+
+def _status_count_contribution(agency_id, status, has_completed_quick_add, sign=1) -> dict:
+    return {(agency_id, to_enum_if_str(status)): {
+        "accounts": sign,
+        "completed_quick_add_accounts": sign if has_completed_quick_add else 0,
+    }}
+
+
+def status_move_deltas(moves) -> dict:
+    """
+    Sums the status counter deltas of accounts moving between counters.
+
+    :param moves: [((old_agency_id, old_status, old_has_completed_quick_add),
+                    (new_agency_id, new_status, new_has_completed_quick_add))]
+    :return: Deltas keyed like apply_status_count_deltas expects.
+    """
+    deltas = defaultdict(lambda: {"accounts": 0, "completed_quick_add_accounts": 0})
+    for previous, current in moves:
+        for contribution in (_status_count_contribution(*previous, sign=-1), _status_count_contribution(*current)):
+            for key, values in contribution.items():
+                for name, value in values.items():
+                    deltas[key][name] += value
+    return deltas
+
+
+@listens_for(SnapchatAccount, 'after_insert')
+def status_count_account_insert(mapper, connection, target):
+    """Counts a new account in its agency's status counters."""
+    apply_status_count_deltas(connection, _status_count_contribution(
+        target.agency_id, target.status, target.has_completed_quick_add
+    ))
+
+
+@listens_for(SnapchatAccount, 'before_update')
+def status_count_account_update(mapper, connection, target):
+    """Moves an account between status counters when its agency, status or quick-add flag changes."""
+    histories = {name: get_history(target, name) for name in ('agency_id', 'status', 'has_completed_quick_add')}
+    if not any(history.has_changes() for history in histories.values()):
+        return
+    previous = {name: _previous_value(history) for name, history in histories.items()}
+    if previous['status'] is None or previous['agency_id'] is None:
+        return
+
+    apply_status_count_deltas(connection, status_move_deltas([(
+        (previous['agency_id'], previous['status'], previous['has_completed_quick_add']),
+        (target.agency_id, target.status, target.has_completed_quick_add),
+    )]))
+
+
+@listens_for(SnapchatAccount, 'after_delete')
+def status_count_account_delete(mapper, connection, target):
+    """Removes a deleted account from its agency's status counters."""
+    apply_status_count_deltas(connection, _status_count_contribution(
+        target.agency_id, target.status, target.has_completed_quick_add, sign=-1
+    ))
+
+
+def record_status_intervals(connection, new_statuses, changed_at):
+    """
+    Closes the open status interval of each account and opens one for its new status.
+
+    The new interval is flagged as the account's first exit when it is the first move out
+    of RECENTLY_INGESTED/GOOD_STANDING after the account was added to the system.
+
+    :param new_statuses: [(snapchat_account_id, new_status)]
+    """
+    table = SnapchatAccountStatusInterval.__table__
+    account_table = SnapchatAccount.__table__
+    connection.execute(
+        table.update()
+        .where(table.c.snapchat_account_id.in_([account_id for account_id, _ in new_statuses]),
+               table.c.exited_at.is_(None))
+        .values(exited_at=changed_at)
+    )
+
+    changes = sa_values(
+        column('snapchat_account_id', Integer), column('status', String), name='status_changes'
+    ).data([(account_id, status.name if status is not None else None) for account_id, status in new_statuses])
+    previous_exit = select(table.c.id).where(
+        table.c.snapchat_account_id == changes.c.snapchat_account_id, table.c.is_first_exit.is_(True)
+    )
+    is_first_exit = and_(
+        changes.c.status.is_not(None),
+        changes.c.status.not_in([status.name for status in EXIT_FROM_STATUSES]),
+        account_table.c.added_to_system_date < changed_at,
+        ~exists(previous_exit),
+    )
+    connection.execute(
+        table.insert().from_select(
+            ['snapchat_account_id', 'status', 'entered_at', 'is_first_exit'],
+            select(
+                account_table.c.id,
+                cast(changes.c.status, table.c.status.type),
+                literal(changed_at, type_=table.c.entered_at.type),
+                is_first_exit,
+            ).join_from(account_table, changes, account_table.c.id == changes.c.snapchat_account_id)
+        )
+    )
+
+
+def _result_int(result, key) -> int:
+    """Reads an integer counter from an execution result, mirroring cast(result->>key, Integer)."""
+    try:
+        return int(result.get(key) or 0)
+    except (TypeError, ValueError, AttributeError):
+        return 0
+
+
+def _previous_value(history):
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return None
+
+
+def execution_rollup_contribution(execution_type, status, result) -> dict:
+    """
+    Returns what a single account execution contributes to the per-account rollup
+    (every counter except total_executions, which is tracked on insert/delete).
+    """
+    if isinstance(execution_type, str):
+        execution_type = ExecutionTypeEnum(execution_type)
+    if isinstance(status, str):
+        status = StatusEnum(status)
+
+    contribution = dict.fromkeys(ROLLUP_COUNTERS, 0)
+    if status != StatusEnum.DONE:
+        return contribution
+
+    result = result or {}
+    contribution["successful_executions"] = 1
+    if execution_type == ExecutionTypeEnum.QUICK_ADDS:
+        contribution["quick_adds_sent_requests"] = _result_int(result, "total_sent_requests")
+        contribution["quick_adds_rejected_count"] = _result_int(result, "rejected_count")
+    elif execution_type == ExecutionTypeEnum.CONSUME_LEADS:
+        contribution["consume_leads_sent_requests"] = _result_int(result, "total_sent_requests")
+    elif execution_type == ExecutionTypeEnum.GENERATE_LEADS:
+        contribution["generated_leads"] = _result_int(result, "generated_leads")
+        contribution["generate_leads_rejected_count"] = _result_int(result, "rejected_count")
+    return contribution
+
+
+def _conversations_snapshot(target):
+    """Returns the conversations count if the execution is a DONE CHECK_CONVERSATIONS with a result."""
+    execution_type = target.type
+    status = target.status
+    if isinstance(execution_type, str):
+        execution_type = ExecutionTypeEnum(execution_type)
+    if isinstance(status, str):
+        status = StatusEnum(status)
+    if execution_type != ExecutionTypeEnum.CHECK_CONVERSATIONS or status != StatusEnum.DONE:
+        return None
+    if not target.result or "conversations" not in target.result:
+        return None
+    return _result_int(target.result, "conversations")
+
+
+def _apply_rollup_delta(connection, snapchat_account_id, deltas: dict, execution_id=None, conversations=None):
+    """Adds the given deltas to the account's rollup row, creating the row if needed."""
+    table = SnapchatAccountExecutionRollup.__table__
+    values = {"snapchat_account_id": snapchat_account_id, **dict.fromkeys(ROLLUP_COUNTERS, 0), **deltas,
+              "last_conversations": 0, "last_conversations_execution_id": None}
+    if conversations is not None:
+        values["last_conversations"] = conversations
+        values["last_conversations_execution_id"] = execution_id
+
+    stmt = pg_insert(table).values(**values)
+    set_ = {name: table.c[name] + stmt.excluded[name] for name in deltas}
+    if conversations is not None:
+        # Only the most recent CHECK_CONVERSATIONS execution (highest id) wins.
+        is_newer = func.coalesce(table.c.last_conversations_execution_id, 0) <= stmt.excluded.last_conversations_execution_id
+        set_["last_conversations"] = case((is_newer, stmt.excluded.last_conversations), else_=table.c.last_conversations)
+        set_["last_conversations_execution_id"] = case(
+            (is_newer, stmt.excluded.last_conversations_execution_id),
+            else_=table.c.last_conversations_execution_id,
+        )
+    if not set_:
+        return
+    connection.execute(stmt.on_conflict_do_update(index_elements=[table.c.snapchat_account_id], set_=set_))
+
+
+@listens_for(AccountExecution, 'after_insert')
+def rollup_execution_insert(mapper, connection, target):
+    """Counts a new account execution in its account's rollup row."""
+    deltas = execution_rollup_contribution(target.type, target.status, target.result)
+    deltas["total_executions"] = 1
+    _apply_rollup_delta(connection, target.snap_account_id, deltas, target.id, _conversations_snapshot(target))
+
+
+@listens_for(AccountExecution, 'after_update')
+def rollup_execution_update(mapper, connection, target):
+    """Applies the difference between the previous and the new status/result to the rollup row."""
+    status_history = get_history(target, 'status')
+    result_history = get_history(target, 'result')
+    if not status_history.has_changes() and not result_history.has_changes():
+        return
+
+    old = execution_rollup_contribution(target.type, _previous_value(status_history), _previous_value(result_history))
+    new = execution_rollup_contribution(target.type, target.status, target.result)
+    deltas = {name: new[name] - old[name] for name in ROLLUP_COUNTERS if new[name] != old[name]}
+    conversations = _conversations_snapshot(target)
+    if not deltas and conversations is None:
+        return
+    _apply_rollup_delta(connection, target.snap_account_id, deltas, target.id, conversations)
+
+
+@listens_for(AccountExecution, 'after_delete')
+def rollup_execution_delete(mapper, connection, target):
+    """Removes a deleted account execution from its account's rollup row."""
+    contribution = execution_rollup_contribution(target.type, target.status, target.result)
+    deltas = {name: -value for name, value in contribution.items() if value}
+    deltas["total_executions"] = -1
+    _apply_rollup_delta(connection, target.snap_account_id, deltas)
+
+
+def apply_execution_rollup_deltas(connection, deltas_by_account: dict):
+    """
+    Applies counter deltas for many accounts with one multi-row INSERT ... ON CONFLICT.
+
+    Used by code paths that write account_execution rows with Core statements, which
+    bypass the mapper listeners above.
+    """
+    if not deltas_by_account:
+        return
+    table = SnapchatAccountExecutionRollup.__table__
+    stmt = pg_insert(table).values([
+        {"snapchat_account_id": account_id, **dict.fromkeys(ROLLUP_COUNTERS, 0), **deltas,
+         "last_conversations": 0, "last_conversations_execution_id": None}
+        for account_id, deltas in deltas_by_account.items()
+    ])
+    connection.execute(stmt.on_conflict_do_update(
+        index_elements=[table.c.snapchat_account_id],
+        set_={name: table.c[name] + stmt.excluded[name] for name in ROLLUP_COUNTERS}
+    ))
+
+
+def _execution_day(start_time):
+    return (start_time or datetime.utcnow()).date()
+
+
+def _upsert_daily_activity(connection, deltas_by_key: dict):
+    """Adds counter deltas to agency_daily_activity rows keyed by (agency_id, day, execution_type)."""
+    rows = [
+        {"agency_id": agency_id, "day": day, "execution_type": execution_type,
+         "executions": 0, "accounts_ran": 0, "total_sent_requests": 0, **deltas}
+        for (agency_id, day, execution_type), deltas in deltas_by_key.items()
+        if any(deltas.values())
+    ]
+    if not rows:
+        return
+    table = AgencyDailyActivity.__table__
+    stmt = pg_insert(table).values(rows)
+    connection.execute(stmt.on_conflict_do_update(
+        index_elements=[table.c.agency_id, table.c.day, table.c.execution_type],
+        set_={name: table.c[name] + stmt.excluded[name] for name in DAILY_ACTIVITY_COUNTERS}
+    ))
+
+
+def apply_daily_activity_deltas(connection, entries):
+    """
+    Records new or changed account executions in the daily activity rollup.
+
+    :param connection: The connection of the current flush or session.
+    :param entries: Iterable of (snapchat_account_id, execution_type, day, executions, total_sent_requests)
+                    deltas. Entries adding executions also mark the account as active on that day.
+    """
+    deltas_by_account = defaultdict(lambda: {"executions": 0, "total_sent_requests": 0})
+    for snapchat_account_id, execution_type, day, executions, total_sent_requests in entries:
+        if isinstance(execution_type, str):
+            execution_type = ExecutionTypeEnum(execution_type)
+        deltas = deltas_by_account[(snapchat_account_id, day, execution_type)]
+        deltas["executions"] += executions
+        deltas["total_sent_requests"] += total_sent_requests
+    if not deltas_by_account:
+        return
+
+    account_table = SnapchatAccount.__table__
+    agency_by_account = dict(connection.execute(
+        select(account_table.c.id, account_table.c.agency_id)
+        .where(account_table.c.id.in_({account_id for account_id, _, _ in deltas_by_account}))
+    ).all())
+
+    markers = [
+        {"snapchat_account_id": account_id, "day": day, "execution_type": execution_type,
+         "agency_id": agency_by_account[account_id]}
+        for (account_id, day, execution_type), deltas in deltas_by_account.items()
+        if deltas["executions"] > 0 and account_id in agency_by_account
+    ]
+    newly_active = set()
+    if markers:
+        marker_table = SnapchatAccountDailyActivity.__table__
+        newly_active = set(connection.execute(
+            pg_insert(marker_table).values(markers).on_conflict_do_nothing().returning(
+                marker_table.c.snapchat_account_id, marker_table.c.day, marker_table.c.execution_type
             )
+        ).all())
+
+    deltas_by_key = defaultdict(lambda: dict.fromkeys(DAILY_ACTIVITY_COUNTERS, 0))
+    for (account_id, day, execution_type), deltas in deltas_by_account.items():
+        if account_id not in agency_by_account:
+            continue
+        key = (agency_by_account[account_id], day, execution_type)
+        deltas_by_key[key]["executions"] += deltas["executions"]
+        deltas_by_key[key]["total_sent_requests"] += deltas["total_sent_requests"]
+        if (account_id, day, execution_type) in newly_active:
+            deltas_by_key[key]["accounts_ran"] += 1
+    _upsert_daily_activity(connection, deltas_by_key)
+
+
+@listens_for(AccountExecution, 'after_insert')
+def daily_activity_execution_insert(mapper, connection, target):
+    """Counts a new account execution in its agency's daily activity."""
+    apply_daily_activity_deltas(connection, [(
+        target.snap_account_id, target.type, _execution_day(target.start_time),
+        1, _result_int(target.result or {}, "total_sent_requests")
+    )])
+
+
+@listens_for(AccountExecution, 'after_update')
+def daily_activity_execution_update(mapper, connection, target):
+    """Applies a changed result's sent requests to its agency's daily activity."""
+    result_history = get_history(target, 'result')
+    if not result_history.has_changes():
+        return
+    previous = _result_int(_previous_value(result_history) or {}, "total_sent_requests")
+    current = _result_int(target.result or {}, "total_sent_requests")
+    if previous == current:
+        return
+    apply_daily_activity_deltas(connection, [(
+        target.snap_account_id, target.type, _execution_day(target.start_time), 0, current - previous
+    )])
+
+
+@listens_for(AccountExecution, 'after_delete')
+def daily_activity_execution_delete(mapper, connection, target):
+    """Removes a deleted account execution from its agency's daily activity."""
+    execution_type = target.type
+    if isinstance(execution_type, str):
+        execution_type = ExecutionTypeEnum(execution_type)
+    day = _execution_day(target.start_time)
+
+    # Drop the account's marker for the day once its last execution of this type is gone.
+    execution_table = AccountExecution.__table__
+    marker_table = SnapchatAccountDailyActivity.__table__
+    day_start = datetime.combine(day, datetime.min.time())
+    remaining = select(execution_table.c.id).where(
+        execution_table.c.snap_account_id == target.snap_account_id,
+        execution_table.c.type == execution_type,
+        execution_table.c.start_time >= day_start,
+        execution_table.c.start_time < day_start + timedelta(days=1),
+    )
+    marker = connection.execute(
+        marker_table.delete()
+        .where(
+            marker_table.c.snapchat_account_id == target.snap_account_id,
+            marker_table.c.day == day,
+            marker_table.c.execution_type == execution_type,
+            ~exists(remaining),
+        )
+        .returning(marker_table.c.agency_id)
+    ).first()
+
+    agency_id = marker.agency_id if marker else connection.execute(
+        select(SnapchatAccount.__table__.c.agency_id).where(SnapchatAccount.__table__.c.id == target.snap_account_id)
+    ).scalar()
+    if agency_id is None:
+        return
+    _upsert_daily_activity(connection, {(agency_id, day, execution_type): {
+        "executions": -1,
+        "accounts_ran": -1 if marker else 0,
+        "total_sent_requests": -_result_int(target.result or {}, "total_sent_requests"),
+    }})
+
+
+STALE_STATISTICS_AGENCIES = "stale_statistics_agencies"
+
+
+@listens_for(Session, 'after_flush')
+def collect_stale_statistics_agencies(session, flush_context):
+    """
+    Remembers which agencies' cached overview statistics are affected by this flush:
+    accounts that were deleted, moved between agencies or reassigned to another model,
+    and models that were renamed or deleted.
+    """
+    agencies = session.info.setdefault(STALE_STATISTICS_AGENCIES, set())
+    for obj in session.deleted:
+        if isinstance(obj, (SnapchatAccount, Model)):
+            agencies.add(obj.agency_id)
+    for obj in session.dirty:
+        if isinstance(obj, SnapchatAccount):
+            for attribute in ('model_id', 'agency_id'):
+                history = get_history(obj, attribute)
+                agencies.update(value for value in (*history.deleted, *history.added) if value is not None)
+        elif isinstance(obj, Model) and get_history(obj, 'name').has_changes():
+            agencies.add(obj.agency_id)
+
+
+@listens_for(Session, 'after_commit')
+def invalidate_stale_statistics(session):
+    agencies = session.info.pop(STALE_STATISTICS_AGENCIES, None)
+    if agencies:
+        StatisticsCache.invalidate(agencies)
+
+
+@listens_for(Session, 'after_soft_rollback')
+def discard_stale_statistics(session, previous_transaction):
+    session.info.pop(STALE_STATISTICS_AGENCIES, None)
@@ -20,11 +20,13 @@ from app.routers import statistic_router
 from app.routers import agency_router
 from app.routers import subscription_router
 from app.services.job_scheduler_manager import SchedulerManager
+from app.services.partition_service import PartitionService
 from app.utils.database_resource_creator import create_default_admin, associate_accounts_with_model, \
     associate_accounts_with_chatbot, create_global_admin
-from app.event_listeners import log_status_change
+from app.event_listeners import log_status_changes
 from app.database import engine, Base
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from app.schemas import *
 from app.database import SessionLocal
 
@@ -41,7 +43,10 @@ setup_logging()
 logger = logging.getLogger(__name__)
 
 Base.metadata.create_all(bind=engine)
-app = FastAPI(debug=True)
+# Partitioned tables need their current and upcoming partitions before the first insert.
+with SessionLocal() as partition_db:
+    PartitionService.ensure_partitions(partition_db)
+app = FastAPI(debug=True, default_response_class=ORJSONResponse)
 origins = [
     "http://localhost:5173",  # React development server
     "http://127.0.0.1:3000",  # Alternate localhost
@@ -77,6 +82,12 @@ async def startup_event():
         scheduler_manager.initialize_unlock_accounts_job()
         logger.info("Scheduled daily unlock accounts job at 2 AM.")
 
+        scheduler_manager.initialize_partition_maintenance_job()
+        logger.info("Scheduled daily partition maintenance job at 3 AM.")
+
+        scheduler_manager.initialize_subscription_expiry_job()
+        logger.info("Scheduled subscription expiry job every minute.")
+
         active_jobs = db.query(Job).filter(Job.status == JobStatusEnum.ACTIVE).all()
         scheduler_manager.initialize_scheduler(active_jobs)
         logger.info(f"Initialized scheduler with {len(active_jobs)} active jobs.")
@@ -2,10 +2,12 @@ from fastapi import APIRouter, Depends, HTTPException, Query, Body
 from typing import Optional, List
 from app.dtos.update_user_request import UpdateUserRequest
 from app.dtos.user_response import UserResponse
+from app.utils.auth_cache import AuthCache
 from app.utils.controller_utils import str_to_bool
-from app.utils.security import get_admin_user, get_agency_id
+from app.utils.pool_metrics import PoolMetrics
+from app.utils.security import get_admin_user, get_agency_id, get_global_admin
 from sqlalchemy.orm import Session
-from app.database import engine
+from app.database import engine, DB_PROCESS_ROLE
 from app.schemas.user import User, UserRole
 
 router = APIRouter(
@@ -80,6 +82,7 @@ def update_user(
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    previous_username = user.username
 
     # Apply updates to the user
     if updates.username:
@@ -94,6 +97,7 @@ def update_user(
     # Commit changes to the database
     db.commit()
     db.refresh(user)  # Refresh the user object with updated values
+    AuthCache.invalidate(AuthCache.USERS, {previous_username, user.username})
 
     return user
 
@@ -117,6 +121,7 @@ def patch_user(
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    previous_username = user.username
 
     # Apply updates to the user only for fields provided
     if updates.username is not None:
@@ -131,6 +136,7 @@ def patch_user(
     # Commit the changes
     db.commit()
     db.refresh(user)  # Refresh the user object with updated values
+    AuthCache.invalidate(AuthCache.USERS, {previous_username, user.username})
 
     return user
 
@@ -157,8 +163,22 @@ def delete_user(
         raise HTTPException(status_code=404, detail="User not found")
 
     # Delete the user and commit the transaction
+    username = user.username
     db.delete(user)
     db.commit()
     db.close()
+    AuthCache.invalidate(AuthCache.USERS, [username])
 
     return {"message": f"User {user.username} has been deleted successfully"}
+
+
+@router.get("/db-pool-metrics", response_model=dict)
+def get_db_pool_metrics(current_user: dict = Depends(get_global_admin)):
+    """
+    Connection pool profile, current pool state and checkout wait times of this process.
+    """
+    return {
+        "role": DB_PROCESS_ROLE,
+        "pool": engine.pool.status(),
+        "checkout_waits": PoolMetrics.snapshot(),
+    }
@@ -4,6 +4,7 @@ from app.database import get_db
 from app.dtos.create_api_key_request import CreateAPIKeyRequest
 from app.schemas.api_key import APIKey
 from app.utils.api_key_utils import APIKeyUtils
+from app.utils.auth_cache import AuthCache
 from app.utils.security import get_admin_user
 
 router = APIRouter(
@@ -53,4 +54,5 @@ def deactivate_api_key(key_id: int, db: Session = Depends(get_db), current_user:
 
     api_key.is_active = False
     db.commit()
+    AuthCache.invalidate(AuthCache.API_KEYS, [AuthCache.api_key_hash(api_key.key)])
     return {"message": "API key deactivated successfully"}
\ No newline at end of file
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
@@ -9,9 +10,10 @@ from app.dtos.execution_result_response import ExecutionResultResponse
 from app.models.execution_type_enum import ExecutionTypeEnum
 from app.models.status_enum import StatusEnum
 from app.schemas.executions.execution import Execution
-from app.database import get_db
+from app.database import get_db, get_read_db, get_async_read_db
 from app.services.job_executor_service import JobExecutorService
-from app.utils.security import get_current_user, get_agency_id, check_subscription_available
+from app.utils.serialization import ListSerializer
+from app.utils.security import get_current_user, get_agency_id, get_agency_id_async, check_subscription_available
 from fastapi import Query
 
 router = APIRouter(
@@ -53,10 +55,10 @@ def create_execution(execution: ExecutionCreateRequest,
 
 
 @router.get("/", response_model=List[ExecutionResultResponse])
-def get_all_executions(
-        db: Session = Depends(get_db),
+async def get_all_executions(
+        db: AsyncSession = Depends(get_async_read_db),
         current_user: dict = Depends(get_current_user),
-        agency_id: int = Depends(get_agency_id),
+        agency_id: int = Depends(get_agency_id_async),
         limit: int = Query(20, ge=1, le=100, description="Number of records to retrieve"),
         offset: int = Query(0, ge=0, description="Offset for pagination"),
         username: Optional[str] = Query(None, description="Filter by Snapchat account username"),
@@ -69,7 +71,7 @@ def get_all_executions(
       Supports pagination.
       """
     # Delegate to the service layer
-    executions = JobExecutorService.get_executionsV3(
+    executions = await JobExecutorService.get_executionsV3_async(
         db=db,
         agency_id=agency_id,
         limit=limit,
@@ -79,7 +81,7 @@ def get_all_executions(
         execution_type=execution_type,
         job_id=job_id
     )
-    return executions
+    return ListSerializer.response(ExecutionResultResponse, executions)
 
 
 @router.get("/{execution_id}", response_model=ExecutionResponse)
@@ -98,7 +100,7 @@ def get_execution_by_id(execution_id: int, db: Session = Depends(get_db),
 @router.get("/by_snapchat_account/{snapchat_account_id}", response_model=List[ExecutionResponse])
 def get_executions_by_snapchat_account(
         snapchat_account_id: int,
-        db: Session = Depends(get_db),
+        db: Session = Depends(get_read_db),
         current_user: dict = Depends(get_current_user),
         agency_id: int = Depends(get_agency_id),
         limit: int = Query(20, ge=1, le=100, description="Number of records to retrieve"),
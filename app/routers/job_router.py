@@ -1,10 +1,11 @@
 # app/routers/jobs.py
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from fastapi import Query
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.dtos.job_dtos.job_create_request import JobCreateRequest
 from app.dtos.job_dtos.job_response import JobResponse
 from app.dtos.job_dtos.job_simplified_response import JobSimplifiedResponse
@@ -13,7 +14,8 @@ from app.dtos.job_status_update_request import JobStatusUpdateRequest
 from app.dtos.snapchat_account_simple_response import SnapchatAccountSimpleResponse
 from app.models.job_status_enum import JobStatusEnum
 from app.services.job_service import JobsService
-from app.utils.security import get_agency_id, check_subscription_available
+from app.utils.security import get_agency_id, get_agency_id_async, check_subscription_available
+from app.utils.serialization import ListSerializer
 
 router = APIRouter(
     prefix="/jobs",
@@ -33,34 +35,35 @@ def create_new_job(job_create: JobCreateRequest, db: Session = Depends(get_db),
 
 
 @router.get("/", response_model=List[JobResponse])
-def read_jobs(status_filters: Optional[List[JobStatusEnum]] = Query(None),
-              db: Session = Depends(get_db),
-              agency_id: int = Depends(get_agency_id)):
+async def read_jobs(status_filters: Optional[List[JobStatusEnum]] = Query(None),
+                    db: AsyncSession = Depends(get_async_db),
+                    agency_id: int = Depends(get_agency_id_async)):
     """
     Endpoint to retrieve a list of jobs, optionally filtered by status.
     """
-    return JobsService.list_jobs(db, agency_id, status_filters)
+    jobs = await JobsService.list_jobs_async(db, agency_id, status_filters)
+    return ListSerializer.response(JobResponse, ListSerializer.validate(JobResponse, jobs))
 
 
 @router.get("/simplified", response_model=List[JobSimplifiedResponse])
-def read_jobs_simplified(
-        db: Session = Depends(get_db),
-        agency_id: int = Depends(get_agency_id),
+async def read_jobs_simplified(
+        db: AsyncSession = Depends(get_async_db),
+        agency_id: int = Depends(get_agency_id_async),
 ):
     """
     Endpoint to retrieve a simplified list of jobs (id and name only).
     """
-    jobs = JobsService.list_jobs_simplified(db, agency_id)
+    jobs = await JobsService.list_jobs_simplified_async(db, agency_id)
     return jobs
 
 
 @router.get("/{job_id}", response_model=JobResponse)
-def read_job(job_id: int, db: Session = Depends(get_db),
-             agency_id: int = Depends(get_agency_id), ):
+async def read_job(job_id: int, db: AsyncSession = Depends(get_async_db),
+                   agency_id: int = Depends(get_agency_id_async), ):
     """
     Endpoint to retrieve a specific job by its ID.
     """
-    return JobsService.get_job(db, job_id)
+    return await JobsService.get_job_async(db, job_id)
 
 
 @router.put("/{job_id}", response_model=JobResponse)
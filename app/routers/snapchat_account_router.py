@@ -1,30 +1,35 @@
+import json
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, Query, Body, Header
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional, Union
 
 from app.dtos.bulk_update_payload import BulkUpdatePayload
 from app.dtos.snapchat_account_edit_response import SnapchatAccountEditResponse
-from app.dtos.snapchat_account_response import SnapchatAccountResponse, SnapchatAccountResponseV2
+from app.dtos.snapchat_account_response import SnapchatAccountResponse, SnapchatAccountResponseV2, \
+    SnapchatAccountListItemResponse
 from app.dtos.snapchat_account_simple_response import SnapchatAccountSimpleResponse
 from app.dtos.statistics.snapchat_account_stats_response import SnapchatAccountStatsDTO, SnapchatAccountTimelineStatisticsDTO
 from app.models.account_status_enum import AccountStatusEnum
-from app.database import get_db
+from app.database import get_db, get_read_db, get_async_read_db, new_read_session
 from app.services.snapchat_account_service import SnapchatAccountService
 from app.services.snapchat_account_statistics_service import SnapchatAccountStatisticsService
+from app.utils.serialization import ListSerializer
 from app.utils.security import get_current_user, authenticate_user_or_api_key, get_agency_id, \
-    check_subscription_available
+    check_subscription_available, get_agency_id_async, authenticate_user_or_api_key_async
 
 router = APIRouter(
     prefix="/accounts",
     tags=["accounts"]
 )
 
-@router.get("/", response_model=Union[List[SnapchatAccountResponse], List[SnapchatAccountResponseV2]])
-def get_all_accounts(
-        agency_id: int = Depends(get_agency_id),
-        db: Session = Depends(get_db),
-        auth: str = Depends(authenticate_user_or_api_key),
+@router.get("/", response_model=List[SnapchatAccountListItemResponse], response_model_exclude_unset=True)
+async def get_all_accounts(
+        agency_id: int = Depends(get_agency_id_async),
+        db: AsyncSession = Depends(get_async_read_db),
+        auth: str = Depends(authenticate_user_or_api_key_async),
         x_api_key: Optional[str] = Header(None),
         username: Optional[str] = Query(None, description="Filter by username"),
         creation_date_from: Optional[datetime] = Query(None, description="Filter accounts created after this date"),
@@ -35,38 +40,43 @@ def get_all_accounts(
         statuses: Optional[List[AccountStatusEnum]] = Query(None, description="Filter accounts by multiple statuses"),
         include_executions: bool = Query(False, description="Include account_executions or not?"),
         has_quick_adds: bool = Query(False, description="Include uick_adds or not?"),
-        page: Optional[int] = Query(None, description="Page number for pagination (optional, default: None)"),
-        page_size: Optional[int] = Query(None, description="Page size for pagination (optional, default: None)"),
+        fields: Optional[str] = Query(None, description="Comma separated fields to return (default: all but account_executions)"),
+        cursor: Optional[str] = Query(None, description="X-Next-Cursor header returned with the previous page"),
+        page: Optional[int] = Query(None, ge=1, description="Page number, uses OFFSET pagination (prefer cursor)"),
+        page_size: Optional[int] = Query(None, ge=1, le=SnapchatAccountService.MAX_LIST_PAGE_SIZE,
+                                         description=f"Accounts per page (default: {SnapchatAccountService.LIST_PAGE_SIZE})"),
 ):
-    snapchat_accounts = SnapchatAccountService.get_all_accountsV2(
-        db=db,
-        agency_id=agency_id,
-        username=username,
-        creation_date_from=creation_date_from,
-        creation_date_to=creation_date_to,
-        has_proxy=has_proxy,
-        has_device=has_device,
-        has_cookies=has_cookies,
-        statuses=statuses,
-        page = page,
-        page_size = page_size,
-        include_executions = include_executions,
-        has_quick_adds= has_quick_adds
-    )
-    if not include_executions:
-        # We'll produce a list of SnapchatAccountLiteResponse
-        lite_response = []
-        for acct in snapchat_accounts:
-            # Fill fields as needed
-            lite_response.append(SnapchatAccountResponseV2.from_orm(acct))
-        return lite_response
-    else:
-        # We'll produce a list of SnapchatAccountFullResponse
-        full_response = []
-        for acct in snapchat_accounts:
-            # Make sure `account_executions` is actually loaded or set
-            full_response.append(SnapchatAccountResponse.from_orm(acct))
-        return full_response
+    """
+    Lists the agency's accounts ordered by id, one page at a time. When the page is full,
+    the X-Next-Cursor response header holds the cursor of the next one.
+    """
+    try:
+        after_id = SnapchatAccountService.decode_list_cursor(cursor) if cursor is not None else None
+        snapchat_accounts = await SnapchatAccountService.get_all_accountsV2_async(
+            db=db,
+            agency_id=agency_id,
+            username=username,
+            creation_date_from=creation_date_from,
+            creation_date_to=creation_date_to,
+            has_proxy=has_proxy,
+            has_device=has_device,
+            has_cookies=has_cookies,
+            statuses=statuses,
+            page = page,
+            page_size = page_size,
+            include_executions = include_executions,
+            has_quick_adds= has_quick_adds,
+            fields=[field.strip() for field in fields.split(",") if field.strip()] if fields is not None else None,
+            after_id=after_id,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    headers = {}
+    if page is None and len(snapchat_accounts) == (page_size or SnapchatAccountService.LIST_PAGE_SIZE):
+        headers["X-Next-Cursor"] = SnapchatAccountService.encode_list_cursor(snapchat_accounts[-1].id)
+    return ListSerializer.response(SnapchatAccountListItemResponse, snapchat_accounts, exclude_unset=True,
+                                   headers=headers)
 
 @router.get("/candidates-for-termination", response_model=List[SnapchatAccountSimpleResponse])
 def get_accounts_for_termination(
@@ -306,21 +316,21 @@ def get_account_edit_data(
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
 
 @router.get("/statuses/list", response_model=list[str])
-def retrieve_snapchat_account_statuses(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user),agency_id: int = Depends(get_agency_id),):
+def retrieve_snapchat_account_statuses(db: Session = Depends(get_read_db), current_user: dict = Depends(get_current_user),agency_id: int = Depends(get_agency_id),):
     """
     Endpoint to retrieve all unique statuses from the SnapchatAccount table.
     """
     return SnapchatAccountService.get_snapchat_account_statuses(db)
 
 @router.get("/sources/list", response_model=list[str])
-def retrieve_snapchat_account_sources(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user), agency_id: int = Depends(get_agency_id),):
+def retrieve_snapchat_account_sources(db: Session = Depends(get_read_db), current_user: dict = Depends(get_current_user), agency_id: int = Depends(get_agency_id),):
     """
     Endpoint to retrieve all unique statuses from the SnapchatAccount table.
     """
     return SnapchatAccountService.get_snapchat_account_sources(db, agency_id)
 
 @router.get("/{account_id}/statistics", response_model=SnapchatAccountStatsDTO)
-def get_user_statistics(account_id: int, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user), agency_id: int = Depends(get_agency_id),):
+def get_user_statistics(account_id: int, db: Session = Depends(get_read_db), current_user: dict = Depends(get_current_user), agency_id: int = Depends(get_agency_id),):
     """
     Endpoint to retrieve user statistics.
 
@@ -333,13 +343,49 @@ def get_user_statistics(account_id: int, db: Session = Depends(get_db), current_
     return statistics_dto
 
 @router.get("/{account_id}/timeline-statistics", response_model=SnapchatAccountTimelineStatisticsDTO)
-def get_user_timeline_statistics(account_id: int, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user), agency_id: int = Depends(get_agency_id),):
+def get_user_timeline_statistics(account_id: int, db: Session = Depends(get_read_db), current_user: dict = Depends(get_current_user), agency_id: int = Depends(get_agency_id),
+                                 limit: Optional[int] = Query(None, ge=1, le=1000, description="Account executions per page; omit for the whole timeline"),
+                                 cursor: Optional[str] = Query(None, description="next_cursor returned by the previous page")):
     """
     Endpoint to retrieve user timeline statistics.
 
-    :param user_id: The ID of the user.
+    :param account_id: The ID of the Snapchat account.
+    :param limit: Optional page size, enables pagination.
+    :param cursor: Cursor of the page to fetch.
     :param db: The database session.
-    :return: SnapchatAccountStatsDTO containing the user's statistics.
+    :return: SnapchatAccountTimelineStatisticsDTO containing the account's timeline.
     """
-    statistics_dto = SnapchatAccountStatisticsService.get_user_timeline_statistics(db, account_id)
-    return statistics_dto
\ No newline at end of file
+    try:
+        after = SnapchatAccountStatisticsService.decode_timeline_cursor(cursor) if cursor is not None else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    try:
+        statistics_dto = SnapchatAccountStatisticsService.get_user_timeline_statistics(
+            db, account_id, agency_id=agency_id, limit=limit, after=after
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return statistics_dto
+
+
+@router.get("/{account_id}/timeline-statistics/stream")
+def stream_user_timeline_statistics(account_id: int, db: Session = Depends(get_read_db), current_user: dict = Depends(get_current_user), agency_id: int = Depends(get_agency_id)):
+    """
+    Streams the account timeline as NDJSON: an "account" line followed by the account
+    executions and status changes in chronological order.
+    """
+    try:
+        SnapchatAccountStatisticsService.get_timeline_account(db, account_id, agency_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    def generate_lines():
+        # The request session is closed before the body is streamed, so use a dedicated one.
+        stream_db = new_read_session()
+        try:
+            for event in SnapchatAccountStatisticsService.iter_user_timeline_events(stream_db, account_id, agency_id):
+                yield json.dumps(event) + "\n"
+        finally:
+            stream_db.close()
+
+    return StreamingResponse(generate_lines(), media_type="application/x-ndjson")
@@ -1,15 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException
+import tempfile
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db  # Replace with your actual database dependency
+from typing import List, Optional
+from app.database import get_read_db, get_async_read_db
 from app.dtos.snapchat_account_response import SnapchatAccountResponse, SnapchatAccountResponseV2
 from app.dtos.statistics.daily_account_stats_dto import DailyAccountStatsDTO
 from app.dtos.statistics.snapchat_account_score_dto import SnapchatAccountScoreDTO
 from app.dtos.statistics.snapchat_account_stats_response import SnapchatAccountStatsDTO, ModelSnapchatAccountStatsDTO
 from app.services.snapchat_account_statistics_service import SnapchatAccountStatisticsService
-from app.utils.security import get_current_user, get_agency_id
+from app.services.statistics_export_service import StatisticsExportService
+from app.utils.security import get_current_user, get_agency_id, get_agency_id_async
+from app.utils.serialization import ListSerializer
 from typing import Dict
-from datetime import timedelta
+from datetime import timedelta, datetime
+
+# Exports are spooled in memory up to this size before spilling to a temporary file
+EXPORT_SPOOL_MAX_SIZE = 32 * 1024 * 1024
+EXPORT_STREAM_CHUNK_SIZE = 1024 * 1024
 
 router = APIRouter(
     prefix="/statistics",
@@ -18,8 +27,8 @@ router = APIRouter(
 
 
 @router.get("/", response_model=SnapchatAccountStatsDTO)
-def get_user_statistics(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user),
-                        agency_id: int = Depends(get_agency_id)):
+async def get_user_statistics(db: AsyncSession = Depends(get_async_read_db), current_user: dict = Depends(get_current_user),
+                              agency_id: int = Depends(get_agency_id_async)):
     """
     Endpoint to retrieve user statistics.
 
@@ -27,28 +36,28 @@ def get_user_statistics(db: Session = Depends(get_db), current_user: dict = Depe
     :param db: The database session.
     :return: SnapchatAccountStatsDTO containing the user's statistics.
     """
-    statistics_dto = SnapchatAccountStatisticsService.get_overall_statistics(db, agency_id)
+    statistics_dto = await SnapchatAccountStatisticsService.get_overall_statistics_async(db, agency_id)
 
     return statistics_dto
 
 
 @router.get("/grouped-by-model", response_model=Dict[int, ModelSnapchatAccountStatsDTO])
-def get_statistics_grouped_by_model(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user),
-                                    agency_id: int = Depends(get_agency_id)):
+async def get_statistics_grouped_by_model(db: AsyncSession = Depends(get_async_read_db), current_user: dict = Depends(get_current_user),
+                                          agency_id: int = Depends(get_agency_id_async)):
     """
     Endpoint to retrieve overall statistics grouped by model.
 
     :param db: The database session.
     :return: A dictionary where keys are model IDs, and values contain model name and statistics.
     """
-    statistics_by_model = SnapchatAccountStatisticsService.get_overall_statistics_grouped_by_model(db, agency_id)
+    statistics_by_model = await SnapchatAccountStatisticsService.get_overall_statistics_grouped_by_model_async(db, agency_id)
 
     return statistics_by_model
 
 
 @router.get("/statuses")
-def get_user_statistics(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user),
-                        agency_id: int = Depends(get_agency_id)):
+async def get_user_statistics(db: AsyncSession = Depends(get_async_read_db), current_user: dict = Depends(get_current_user),
+                              agency_id: int = Depends(get_agency_id_async)):
     """
     Endpoint to retrieve user statistics.
 
@@ -56,20 +65,22 @@ def get_user_statistics(db: Session = Depends(get_db), current_user: dict = Depe
     :param db: The database session.
     :return: SnapchatAccountStatsDTO containing the user's statistics.
     """
-    statistics_dto = SnapchatAccountStatisticsService.get_average_time_for_all_statuses(db, agency_id)
+    statistics_dto = await SnapchatAccountStatisticsService.get_average_time_for_all_statuses_async(db, agency_id)
 
     return statistics_dto
 
 
 @router.get("/average-times-by-source", response_model=Dict[str, str])
-def average_times_by_source_exit(db: Session = Depends(get_db), agency_id: int = Depends(get_agency_id)):
+async def average_times_by_source_exit(db: AsyncSession = Depends(get_async_read_db),
+                                       agency_id: int = Depends(get_agency_id_async)):
     """
     Endpoint to retrieve average time spent in RECENTLY_INGESTED and GOOD_STANDING
     statuses by account source until leaving those statuses.
     """
     try:
-        avg_times: Dict[
-            str, Dict[str, timedelta]] = SnapchatAccountStatisticsService.get_average_time_by_source_for_status_exit(db, agency_id)
+        avg_times: Dict[str, Dict[str, timedelta]] = await SnapchatAccountStatisticsService.get_average_time_by_source_for_status_exit_async(
+            db, agency_id
+        )
         # Convert timedelta values to strings for JSON serialization
         formatted = {source: str(duration) for source, duration in avg_times.items() if duration is not None}
         return formatted
@@ -78,32 +89,35 @@ def average_times_by_source_exit(db: Session = Depends(get_db), agency_id: int =
 
 
 @router.get("/execution-counts-by-source", response_model=Dict[str, int])
-def execution_counts_by_source(db: Session = Depends(get_db), agency_id: int = Depends(get_agency_id)):
+async def execution_counts_by_source(db: AsyncSession = Depends(get_async_read_db),
+                                     agency_id: int = Depends(get_agency_id_async)):
     """
     Endpoint to retrieve the number of executions by account source
     until leaving RECENTLY_INGESTED or GOOD_STANDING.
     """
     try:
-        counts = SnapchatAccountStatisticsService.get_execution_counts_by_source_until_status_change(db, agency_id)
+        counts = await SnapchatAccountStatisticsService.get_execution_counts_by_source_until_status_change_async(
+            db, agency_id
+        )
         return counts
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/top-snapchat-accounts", response_model=List[SnapchatAccountResponseV2])
-def get_top_snapchat_accounts(
+async def get_top_snapchat_accounts(
         n: int = 10,
         weight_rejecting_rate: float = 0.3,
         weight_conversation_rate: float = 0.4,
         weight_conversion_rate: float = 0.3,
-        session: Session = Depends(get_db),
-        agency_id: int = Depends(get_agency_id)
+        session: AsyncSession = Depends(get_async_read_db),
+        agency_id: int = Depends(get_agency_id_async)
 ):
     """
     Retrieve top n Snapchat accounts based on weighted metrics.
     """
     # Call the selection algorithm with provided parameters
-    top_accounts = SnapchatAccountStatisticsService.select_top_n_snapchat_accounts_optimized(
+    top_accounts = await SnapchatAccountStatisticsService.select_top_n_snapchat_accounts_optimized_async(
         session=session,
         agency_id=agency_id,
         n=n,
@@ -111,26 +125,25 @@ def get_top_snapchat_accounts(
         weight_conversation_rate=weight_conversation_rate,
         weight_conversion_rate=weight_conversion_rate
     )
-
-    # Convert ORM objects to response schema if necessary
-    # Assuming SnapchatAccountResponse can be constructed from SnapchatAccount
-    return top_accounts
+    return ListSerializer.response(
+        SnapchatAccountResponseV2, ListSerializer.validate(SnapchatAccountResponseV2, top_accounts)
+    )
 
 
 @router.get("/accounts_with_score", response_model=List[SnapchatAccountScoreDTO])
-def get_top_snapchat_accounts(
+async def get_top_snapchat_accounts(
         weight_rejecting_rate: float = 0.3,
         weight_conversation_rate: float = 0.4,
         weight_conversion_rate: float = 0.3,
-        session: Session = Depends(get_db),
-        agency_id: int = Depends(get_agency_id)
+        session: AsyncSession = Depends(get_async_read_db),
+        agency_id: int = Depends(get_agency_id_async)
 ):
     """
     Retrieve top n Snapchat accounts based on weighted metrics.
     """
     # Call the selection algorithm with provided parameters
-    accounts_with_score = SnapchatAccountStatisticsService.get_all_snapchat_accounts_with_scores(
-        session=session,
+    accounts_with_score = await SnapchatAccountStatisticsService.get_all_snapchat_accounts_with_scores_async(
+        session,
         agency_id=agency_id,
         weight_rejecting_rate=weight_rejecting_rate,
         weight_conversation_rate=weight_conversation_rate,
@@ -141,17 +154,17 @@ def get_top_snapchat_accounts(
 
 
 @router.get("/daily-stats", response_model=List[DailyAccountStatsDTO])
-def get_daily_account_stats(
+async def get_daily_account_stats(
         days: int = 7,
-        session: Session = Depends(get_db),
-        agency_id: int = Depends(get_agency_id)
+        session: AsyncSession = Depends(get_async_read_db),
+        agency_id: int = Depends(get_agency_id_async)
 ):
     """
     Retrieve top n Snapchat accounts based on weighted metrics.
     """
     # Call the selection algorithm with provided parameters
-    accounts_with_score = SnapchatAccountStatisticsService.get_daily_account_stats(
-        session=session,
+    accounts_with_score = await SnapchatAccountStatisticsService.get_daily_account_stats_async(
+        session,
         agency_id=agency_id,
         days=days
     )
@@ -160,17 +173,75 @@ def get_daily_account_stats(
 
 
 @router.get("/daily-chatbot-runs", response_model=int)
-def get_daily_account_stats(
-        session: Session = Depends(get_db),
-        agency_id: int = Depends(get_agency_id)
+async def get_daily_account_stats(
+        session: AsyncSession = Depends(get_async_read_db),
+        agency_id: int = Depends(get_agency_id_async)
 ):
     """
     Retrieve top n Snapchat accounts based on weighted metrics.
     """
     # Call the selection algorithm with provided parameters
-    accounts_with_score = SnapchatAccountStatisticsService.count_daily_chatbot_run_accounts(
-        db=session,
+    accounts_with_score = await SnapchatAccountStatisticsService.count_daily_chatbot_run_accounts_async(
+        session,
         agency_id=agency_id
     )
 
     return accounts_with_score
+
+
+
+@router.get("/accounts-by-status", response_model=dict)
+async def get_accounts_by_status(
+        session: AsyncSession = Depends(get_async_read_db),
+        agency_id: int = Depends(get_agency_id_async)
+):
+    """
+    Retrieve the agency's account count per status.
+    """
+    return await SnapchatAccountStatisticsService.get_accounts_by_status_async(session, agency_id=agency_id)
+
+@router.get("/export/{dataset}")
+def export_statistics(
+        dataset: str,
+        file_format: str = Query("parquet", alias="format", description="parquet or arrow (Arrow IPC stream)"),
+        columns: Optional[str] = Query(None, description="Comma separated subset of the dataset's columns"),
+        date_from: Optional[datetime] = Query(None, description="Inclusive lower bound on the dataset's time column"),
+        date_to: Optional[datetime] = Query(None, description="Exclusive upper bound on the dataset's time column"),
+        session: Session = Depends(get_read_db),
+        agency_id: int = Depends(get_agency_id)
+):
+    """
+    Exports account_stats, account_executions or status_intervals of the agency as a
+    columnar file.
+    """
+    sink = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_SIZE)
+    try:
+        StatisticsExportService.export(
+            db=session,
+            agency_id=agency_id,
+            dataset_name=dataset,
+            sink=sink,
+            file_format=file_format,
+            columns=[column.strip() for column in columns.split(",") if column.strip()] if columns else None,
+            date_from=date_from,
+            date_to=date_to,
+        )
+    except ValueError as e:
+        sink.close()
+        raise HTTPException(status_code=400, detail=str(e))
+    sink.seek(0)
+
+    def iter_file():
+        try:
+            while chunk := sink.read(EXPORT_STREAM_CHUNK_SIZE):
+                yield chunk
+        finally:
+            sink.close()
+
+    extension, media_type = ("parquet", "application/vnd.apache.parquet") if file_format == "parquet" \
+        else ("arrows", "application/vnd.apache.arrow.stream")
+    return StreamingResponse(
+        iter_file(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{dataset}.{extension}"'}
+    )
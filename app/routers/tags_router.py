@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List
-from app.database import get_db  # Replace with your actual database dependency
+from app.database import get_read_db
 from app.services.snapchat_account_service import SnapchatAccountService
 from app.utils.security import get_current_user, get_agency_id
 
@@ -11,7 +11,7 @@ router = APIRouter(
 )
 
 @router.get("/", response_model=List[str])
-def get_all_tags(db: Session = Depends(get_db),
+def get_all_tags(db: Session = Depends(get_read_db),
                  current_user: dict = Depends(get_current_user),
                  agency_id: int = Depends(get_agency_id)):
     """
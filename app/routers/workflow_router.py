@@ -1,12 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.dtos.workflow_dtos import WorkflowResponse, WorkflowCreateRequest, WorkflowSimplifiedResponse, \
     WorkflowUpdateRequest, WorkflowStatusUpdateRequest, WorkflowSimplifiedNameResponse
 from app.dtos.workflow_snapchat_account_response import WorkflowSnapchatAccountResponse
 from app.services.workflow_service import WorkflowsService
-from app.utils.security import get_agency_id, check_subscription_available
+from app.utils.security import get_agency_id, get_agency_id_async, check_subscription_available
+from app.utils.serialization import ListSerializer
 
 router = APIRouter(
     prefix="/workflows",
@@ -30,38 +32,39 @@ def create_workflow(
 
 
 @router.get("/", response_model=List[WorkflowResponse])
-def read_workflows(
+async def read_workflows(
         name_filter: Optional[str] = Query(None, description="Filter workflows by name"),
-        db: Session = Depends(get_db),
-        agency_id: int = Depends(get_agency_id)
+        db: AsyncSession = Depends(get_async_db),
+        agency_id: int = Depends(get_agency_id_async)
 ):
     """
     Endpoint to retrieve a list of workflows, optionally filtered by name.
     """
-    return WorkflowsService.list_workflows(db, agency_id, name_filter)
+    workflows = await WorkflowsService.list_workflows_async(db, agency_id, name_filter)
+    return ListSerializer.response(WorkflowResponse, ListSerializer.validate(WorkflowResponse, workflows))
 
 
 @router.get("/simplified", response_model=List[WorkflowSimplifiedNameResponse])
-def read_workflows_simplified(
-        db: Session = Depends(get_db),
-        agency_id: int = Depends(get_agency_id)
+async def read_workflows_simplified(
+        db: AsyncSession = Depends(get_async_db),
+        agency_id: int = Depends(get_agency_id_async)
 ):
     """
     Endpoint to retrieve a simplified list of workflows (id and name only).
     """
-    return WorkflowsService.list_workflows_simplified(db, agency_id)
+    return await WorkflowsService.list_workflows_simplified_async(db, agency_id)
 
 
 @router.get("/{workflow_id}", response_model=WorkflowResponse)
-def read_workflow(
+async def read_workflow(
         workflow_id: int,
-        db: Session = Depends(get_db),
-        agency_id: int = Depends(get_agency_id)
+        db: AsyncSession = Depends(get_async_db),
+        agency_id: int = Depends(get_agency_id_async)
 ):
     """
     Endpoint to retrieve a specific workflow by its ID.
     """
-    return WorkflowsService.get_workflow(db, workflow_id)
+    return await WorkflowsService.get_workflow_async(db, workflow_id)
 
 
 @router.put("/{workflow_id}", response_model=WorkflowResponse)
@@ -17,4 +17,10 @@ from app.schemas.workflow.workflow_step import WorkflowStep
 from app.schemas.workflow.workflow import Workflow
 from app.schemas.snapchat_checked_accounts.snapchat_allowed_user import SnapchatAllowedUser
 from app.schemas.snapchat_checked_accounts.snapchat_rejected_user import SnapchatRejectedUser
-from app.schemas.agency import Agency
\ No newline at end of file
+from app.schemas.agency import Agency
+from app.schemas.snapchat_account_execution_rollup import SnapchatAccountExecutionRollup
+from app.schemas.snapchat_account_status_interval import SnapchatAccountStatusInterval
+from app.schemas.agency_daily_activity import AgencyDailyActivity
+from app.schemas.snapchat_account_daily_activity import SnapchatAccountDailyActivity
+from app.schemas.agency_account_status_count import AgencyAccountStatusCount
+from app.schemas.execution_archive_month import ExecutionArchiveMonth
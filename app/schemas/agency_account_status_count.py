@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, ForeignKey, Enum, UniqueConstraint
+from app.database import Base
+from app.models.account_status_enum import AccountStatusEnum
+
+
+class AgencyAccountStatusCount(Base):
+    """
+    Number of accounts per (agency, status), maintained by the SnapchatAccount listeners
+    in app/event_listeners.py so the dashboard counters are single-row reads.
+    """
+    __tablename__ = 'agency_account_status_count'
+
+    id = Column(Integer, primary_key=True)
+    agency_id = Column(Integer, ForeignKey('agencies.id', ondelete="CASCADE"), nullable=False)
+    status = Column(Enum(AccountStatusEnum, name="account_status_enum"), nullable=False)
+    accounts = Column(Integer, default=0, nullable=False)
+    # Accounts in this status that have completed a QUICK_ADDS run
+    completed_quick_add_accounts = Column(Integer, default=0, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint('agency_id', 'status', name='uq_agency_account_status_count'),
+    )
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, ForeignKey, Date, Enum, UniqueConstraint
+from app.database import Base
+from app.models.execution_type_enum import ExecutionTypeEnum
+
+
+class AgencyDailyActivity(Base):
+    """
+    Per-agency daily counters over account executions, keyed by the day the execution started.
+
+    Rows are maintained by the AccountExecution listeners in app/event_listeners.py and can
+    be rebuilt with `python -m scripts.backfill_daily_activity`.
+    """
+    __tablename__ = 'agency_daily_activity'
+
+    id = Column(Integer, primary_key=True)
+    agency_id = Column(Integer, ForeignKey('agencies.id', ondelete="CASCADE"), nullable=False)
+    day = Column(Date, nullable=False)
+    execution_type = Column(Enum(ExecutionTypeEnum), nullable=False)
+
+    executions = Column(Integer, default=0, nullable=False)
+    # Distinct accounts with at least one execution of this type on this day
+    accounts_ran = Column(Integer, default=0, nullable=False)
+    # Sum of result->>'total_sent_requests' over the day's executions of this type
+    total_sent_requests = Column(Integer, default=0, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint('agency_id', 'day', 'execution_type', name='uq_agency_daily_activity'),
+    )
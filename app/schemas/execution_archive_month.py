@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, Date, DateTime
+from app.database import Base
+
+
+class ExecutionArchiveMonth(Base):
+    """
+    A month of account executions moved out of Postgres into a Parquet file by
+    ExecutionArchiveService. The month's partition no longer exists once a row is here.
+    """
+    __tablename__ = 'execution_archive_month'
+
+    # First day of the archived month
+    month = Column(Date, primary_key=True)
+    uri = Column(String, nullable=False)
+    rows = Column(Integer, nullable=False)
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -1,32 +1,63 @@
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, column_property
 from datetime import datetime
 from app.database import Base
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, JSON, Enum, Integer
+from sqlalchemy.dialects.postgresql import JSONB
 
 from app.models.execution_type_enum import ExecutionTypeEnum
 from app.models.status_enum import StatusEnum
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, JSON, Enum, Integer, Index
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, Index, Computed
+
+# Result counters aggregated by the statistics queries, extracted into generated columns.
+RESULT_COUNTERS = ("total_sent_requests", "rejected_count", "generated_leads", "conversations")
+
+
+def result_counter(key: str) -> Computed:
+    """Stored generated column holding result->key as an integer (NULL when missing or not a number)."""
+    return Computed(
+        f"CASE WHEN jsonb_typeof(result -> '{key}') = 'number' THEN (result ->> '{key}')::numeric::integer END",
+        persisted=True
+    )
+
 
 class AccountExecution(Base):
     __tablename__ = 'account_execution'
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     type = Column(Enum(ExecutionTypeEnum), nullable=False)
     execution_id = Column(Integer, ForeignKey("execution.id"), nullable=False)
     snap_account_id = Column(Integer, ForeignKey("snapchat_account.id"), nullable=False)
-    status = Column(Enum(StatusEnum), nullable=False)
-    result = Column(JSON, default=None, nullable=True)
+    # active_history keeps the previous value available to the rollup listeners
+    # even when the attribute was expired by a commit before being reassigned.
+    status = column_property(Column(Enum(StatusEnum), nullable=False), active_history=True)
+    result = column_property(Column(JSONB, default=None, nullable=True), active_history=True)
     message = Column(String, nullable=True)
 
+    # Read-only, computed by Postgres from result
+    total_sent_requests = Column(Integer, result_counter("total_sent_requests"))
+    rejected_count = Column(Integer, result_counter("rejected_count"))
+    generated_leads = Column(Integer, result_counter("generated_leads"))
+    conversations = Column(Integer, result_counter("conversations"))
+
     # Relationships
     execution = relationship("Execution", back_populates="account_executions")
     snapchat_account = relationship("SnapchatAccount", back_populates="account_executions")
-    start_time = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Part of the table's primary key because the table is range partitioned on it
+    start_time = Column(DateTime, default=datetime.utcnow, primary_key=True, nullable=False)
     end_time = Column(DateTime, nullable=True)
 
     __table_args__ = (
         Index('idx_account_execution_type', 'type'),
+        # Keyset pagination of an account's timeline on (start_time, id)
+        Index('ix_account_execution_account_start_time', 'snap_account_id', 'start_time', 'id'),
+        # Per-account aggregates filtered by type and status
+        Index('ix_account_execution_account_type_status', 'snap_account_id', 'type', 'status'),
+        # Loading an execution's account executions
+        Index('ix_account_execution_execution', 'execution_id'),
+        # Monthly partitions are managed by PartitionService
+        {'postgresql_partition_by': 'RANGE (start_time)'},
     )
+    # ids stay unique on their own (sequence), so the ORM identity remains the id
+    __mapper_args__ = {'primary_key': [id]}
 
     @property
     def snapchat_account_username(self):
@@ -1,6 +1,7 @@
 from datetime import datetime
 
 from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, JSON, Enum, Integer, Index
+from sqlalchemy import text
 from sqlalchemy.orm import relationship
 from app.database import Base
 from app.models.execution_type_enum import ExecutionTypeEnum
@@ -32,4 +33,7 @@ class Execution(Base):
 
     __table_args__ = (
         Index('idx_execution_type', 'type'),
+        # Agency execution history, newest first
+        Index('ix_execution_agency_start_time', 'agency_id', 'start_time'),
+        Index('ix_execution_job', 'job_id', postgresql_where=text('job_id IS NOT NULL')),
     )
\ No newline at end of file
@@ -1,10 +1,10 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Index
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Index, Boolean
 from datetime import datetime
 from sqlalchemy.ext.mutable import MutableList
 from app.database import Base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, column_property
 from sqlalchemy.dialects.postgresql import ARRAY
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 
 from app.models.account_status_enum import AccountStatusEnum
 
@@ -12,7 +12,9 @@ class SnapchatAccount(Base):
     __tablename__ = 'snapchat_account'
     
     id = Column(Integer, primary_key=True)
-    agency_id = Column(Integer, ForeignKey("agencies.id"), nullable=False)
+    # active_history keeps the previous agency/status/flag available to the status counter
+    # listeners even when the attribute was expired by a commit before being reassigned.
+    agency_id = column_property(Column(Integer, ForeignKey("agencies.id"), nullable=False), active_history=True)
     snapchat_id = Column(String, unique=True, nullable=True)
     username = Column(String, unique=True, nullable=False)
     password = Column(String, nullable=False)
@@ -23,10 +25,14 @@ class SnapchatAccount(Base):
     creation_date = Column(DateTime, default=func.now(), nullable=False)
     # Set added_to_system_date to default on creation but allow explicit updates
     added_to_system_date = Column(DateTime, default=func.now(), nullable=False)
-    status = Column(
+    status = column_property(Column(
         Enum(AccountStatusEnum, name="account_status_enum"),  # Use the SQLAlchemy Enum type
         default=AccountStatusEnum.RECENTLY_INGESTED,
         nullable=False
+    ), active_history=True)
+    # Set once the account finished a QUICK_ADDS execution successfully
+    has_completed_quick_add = column_property(
+        Column(Boolean, default=False, server_default="false", nullable=False), active_history=True
     )
     tags = Column(MutableList.as_mutable(ARRAY(String)), nullable=True)
     account_source = Column(String, nullable=False)
@@ -70,4 +76,12 @@ class SnapchatAccount(Base):
 
     __table_args__ = (
         Index('idx_snapchat_account_status', 'status'),
+        # Agency-scoped listings and statistics filtered or grouped by status / model
+        Index('ix_snapchat_account_agency_status', 'agency_id', 'status'),
+        Index('ix_snapchat_account_agency_model', 'agency_id', 'model_id'),
+        # Keyset pagination of the account list
+        Index('ix_snapchat_account_agency_id', 'agency_id', 'id'),
+        # Workflow runs and proxy reassignment; most accounts have neither, hence partial
+        Index('ix_snapchat_account_workflow', 'workflow_id', postgresql_where=text('workflow_id IS NOT NULL')),
+        Index('ix_snapchat_account_proxy', 'proxy_id', postgresql_where=text('proxy_id IS NOT NULL')),
     )
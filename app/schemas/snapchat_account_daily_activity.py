@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, ForeignKey, Date, Enum, Index
+from app.database import Base
+from app.models.execution_type_enum import ExecutionTypeEnum
+
+
+class SnapchatAccountDailyActivity(Base):
+    """
+    Marks that an account had at least one execution of a type on a given day.
+
+    Backs the distinct-account counts of AgencyDailyActivity: a marker is inserted with the
+    account's first execution of the day, so accounts_ran is only incremented once.
+    """
+    __tablename__ = 'snapchat_account_daily_activity'
+
+    snapchat_account_id = Column(Integer, ForeignKey('snapchat_account.id', ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    execution_type = Column(Enum(ExecutionTypeEnum), primary_key=True)
+    agency_id = Column(Integer, ForeignKey('agencies.id', ondelete="CASCADE"), nullable=False)
+
+    __table_args__ = (
+        Index('ix_snapchat_account_daily_activity_agency_day', 'agency_id', 'day'),
+    )
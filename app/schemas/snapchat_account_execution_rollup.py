@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, ForeignKey
+from app.database import Base
+
+
+class SnapchatAccountExecutionRollup(Base):
+    """
+    Running per-account counters over account executions.
+
+    Rows are maintained incrementally by the AccountExecution listeners in
+    app/event_listeners.py, so compute_statistics reads a single row instead of
+    re-aggregating the whole execution history of an account.
+    """
+    __tablename__ = 'snapchat_account_execution_rollup'
+
+    id = Column(Integer, primary_key=True)
+    snapchat_account_id = Column(Integer, ForeignKey('snapchat_account.id', ondelete="CASCADE"), unique=True, nullable=False)
+
+    # Execution counters (any status / DONE only)
+    total_executions = Column(Integer, default=0, nullable=False)
+    successful_executions = Column(Integer, default=0, nullable=False)
+
+    # Sums over the results of DONE executions
+    quick_adds_sent_requests = Column(Integer, default=0, nullable=False)
+    quick_adds_rejected_count = Column(Integer, default=0, nullable=False)
+    consume_leads_sent_requests = Column(Integer, default=0, nullable=False)
+    generated_leads = Column(Integer, default=0, nullable=False)
+    generate_leads_rejected_count = Column(Integer, default=0, nullable=False)
+
+    # Snapshot of the most recent DONE CHECK_CONVERSATIONS execution
+    last_conversations = Column(Integer, default=0, nullable=False)
+    last_conversations_execution_id = Column(Integer, nullable=True)
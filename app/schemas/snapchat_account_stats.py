@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy import Column, Integer, ForeignKey, Float
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -21,6 +21,11 @@ class SnapchatAccountStats(Base):
     successful_executions = Column(Integer, default=0, nullable=False)
     rejected_total = Column(Integer, default=0, nullable=False)
     generated_leads = Column(Integer, default=0, nullable=False)
+
+    # Score metrics, refreshed together with the counters above
+    rejecting_rate = Column(Float, default=0, nullable=False)
+    conversation_rate = Column(Float, default=0, nullable=False)
+    conversion_rate = Column(Float, default=0, nullable=False)
     # Relationship back to SnapchatAccount
     snapchat_account = relationship("SnapchatAccount", back_populates="stats", uselist=False)
 
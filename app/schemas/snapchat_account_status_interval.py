@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Enum, Boolean, Index
+from app.database import Base
+from app.models.account_status_enum import AccountStatusEnum
+
+
+class SnapchatAccountStatusInterval(Base):
+    """
+    One row per period an account spent in a status, derived from the status log.
+
+    The open interval of an account has exited_at = NULL. Rows are maintained by the
+    log_status_changes listener in app/event_listeners.py, so the time-in-status
+    statistics are grouped reads instead of window functions over the whole log.
+    """
+    __tablename__ = 'snapchat_account_status_interval'
+
+    id = Column(Integer, primary_key=True)
+    snapchat_account_id = Column(Integer, ForeignKey('snapchat_account.id', ondelete="CASCADE"), nullable=False)
+    status = Column(Enum(AccountStatusEnum, name="account_status_enum"), nullable=True)
+    entered_at = Column(DateTime, nullable=False)
+    exited_at = Column(DateTime, nullable=True)
+    # Set on the first interval that left RECENTLY_INGESTED/GOOD_STANDING after the account was added.
+    is_first_exit = Column(Boolean, default=False, nullable=False)
+
+    __table_args__ = (
+        Index('ix_snapchat_account_status_interval_account_open', 'snapchat_account_id', 'exited_at'),
+        Index('ix_snapchat_account_status_interval_first_exit', 'snapchat_account_id',
+              postgresql_where=is_first_exit.is_(True), unique=True),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -15,3 +15,7 @@ class SnapchatAccountStatusLog(Base):
     changed_at = Column(DateTime, default=datetime.utcnow)
 
     snapchat_account = relationship("SnapchatAccount", back_populates="status_logs")
+
+    __table_args__ = (
+        Index('ix_snapchat_account_status_log_account_changed_at', 'snapchat_account_id', 'changed_at', 'id'),
+    )
@@ -13,4 +13,9 @@ class SnapkatRequestLog(Base):
     params = Column(JSON, nullable=True)
     response_status = Column(Integer, nullable=False)
     response_body = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
\ No newline at end of file
+    # Part of the table's primary key because the table is range partitioned on it
+    created_at = Column(DateTime, default=datetime.utcnow, primary_key=True, nullable=False)
+
+    # Monthly partitions are managed by PartitionService
+    __table_args__ = {'postgresql_partition_by': 'RANGE (created_at)'}
+    __mapper_args__ = {'primary_key': [id]}
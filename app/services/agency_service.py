@@ -7,6 +7,7 @@ from app.schemas import Agency, User
 from app.schemas.invitation_token import InvitationToken
 from app.schemas.subscription import Subscription, SubscriptionStatus
 from app.schemas.user import UserRole
+from app.services.subscription_service import SubscriptionService
 from app.utils.security import hash_password, generate_random_password
 import uuid
 from fastapi_mail import MessageSchema, FastMail
@@ -99,6 +100,7 @@ class AgencyService:
         db.add(subscription)
         db.commit()
         db.refresh(subscription)
+        SubscriptionService.publish_subscription_states(db, [subscription.agency_id])
 
         # Mark the token as used.
         token_entry.used = True
@@ -130,6 +132,7 @@ class AgencyService:
         db.add(subscription)
         db.commit()
         db.refresh(subscription)
+        SubscriptionService.publish_subscription_states(db, [subscription.agency_id])
 
         # Generate an invitation token (includes agency_id, admin_email, and role)
         token = AgencyService.generate_invite_token(agency, agency_data.agency_email, agency_data.admin_role)
@@ -1,7 +1,10 @@
 from fastapi import Header, HTTPException, Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.schemas.api_key import APIKey
+from app.utils.auth_cache import AuthCache
 
 class APIKeyService:
     """
@@ -23,9 +26,34 @@ class APIKeyService:
         Raises:
             HTTPException: If the API key is invalid or inactive.
         """
+        key_hash = AuthCache.api_key_hash(x_api_key)
+        cached = AuthCache.get(AuthCache.API_KEYS, key_hash)
+        if cached is not None:
+            return cached["service_name"]
+
         api_key = db.query(APIKey).filter(APIKey.key == x_api_key, APIKey.is_active == True).first()
 
         if not api_key:
             raise HTTPException(status_code=401, detail="Invalid or inactive API key")
 
+        AuthCache.set(AuthCache.API_KEYS, key_hash, {"service_name": api_key.service_name})
+        return api_key.service_name
+
+    @staticmethod
+    async def validate_api_key_async(x_api_key: str, db: AsyncSession) -> str:
+        """
+        Async variant of validate_api_key for AsyncSession callers.
+        """
+        key_hash = AuthCache.api_key_hash(x_api_key)
+        cached = await AuthCache.get_async(AuthCache.API_KEYS, key_hash)
+        if cached is not None:
+            return cached["service_name"]
+
+        result = await db.execute(select(APIKey).where(APIKey.key == x_api_key, APIKey.is_active == True))
+        api_key = result.scalars().first()
+
+        if not api_key:
+            raise HTTPException(status_code=401, detail="Invalid or inactive API key")
+
+        await AuthCache.set_async(AuthCache.API_KEYS, key_hash, {"service_name": api_key.service_name})
         return api_key.service_name
@@ -0,0 +1,206 @@
+import json
+import logging
+import os
+from datetime import date, datetime, time
+from typing import Dict, Iterable, List, Optional
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.models.execution_type_enum import ExecutionTypeEnum
+from app.models.status_enum import StatusEnum
+from app.schemas.execution_archive_month import ExecutionArchiveMonth
+from app.services.partition_service import PartitionService
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutionArchiveService:
+    """
+    Moves months of account executions out of Postgres into compressed Parquet files and
+    reads them back for requests that reach into archived ranges.
+
+    A month is archived once it is entirely older than ARCHIVE_AFTER_MONTHS (0 disables
+    archiving). Its partition is written to `<ARCHIVE_URI>/account_execution_pYYYYMM.parquet`,
+    recorded in execution_archive_month, then detached and dropped in the same transaction.
+    ARCHIVE_URI is a local directory or any URI pyarrow.fs understands (s3://, gs://, ...).
+
+    Rows leave without going through the ORM, so the execution rollups, daily activity and
+    statistics keep counting them. Rebuilds and exports only read what is still in Postgres
+    and refuse ranges that reach into archived months (see check_hot_range).
+    Files are sorted by (snap_account_id, start_time, id), so per-account reads only touch
+    the row groups of that account.
+    """
+    ARCHIVE_URI = os.getenv("EXECUTION_ARCHIVE_URI", "data/execution_archive")
+    ARCHIVE_AFTER_MONTHS = int(os.getenv("EXECUTION_ARCHIVE_AFTER_MONTHS", "0"))
+    TABLE = "account_execution"
+    CHUNK_SIZE = 50000
+    ROW_GROUP_SIZE = 100000
+
+    SCHEMA = pa.schema([
+        ("id", pa.int64()),
+        ("execution_id", pa.int64()),
+        ("snap_account_id", pa.int64()),
+        ("type", pa.string()),
+        ("status", pa.string()),
+        ("result", pa.string()),
+        ("message", pa.string()),
+        ("start_time", pa.timestamp("us")),
+        ("end_time", pa.timestamp("us")),
+    ])
+
+    @staticmethod
+    def _resolve(uri: str):
+        """Returns the (filesystem, path) of a file URI; plain paths are local files."""
+        return pafs.FileSystem.from_uri(uri if "://" in uri else os.path.abspath(uri))
+
+    @staticmethod
+    def archived_months(db: Session) -> Dict[date, str]:
+        """Returns {first day of month: file URI} for every archived month."""
+        return {row.month: row.uri for row in db.query(ExecutionArchiveMonth).all()}
+
+    @staticmethod
+    def archive_boundary(db: Session) -> Optional[datetime]:
+        """
+        Returns the start of the first month that is not archived, i.e. every archived
+        execution started before it. None if nothing is archived.
+        """
+        months = ExecutionArchiveService.archived_months(db)
+        if not months:
+            return None
+        first_hot_month = PartitionService.add_months(max(months), 1)
+        return datetime(first_hot_month.year, first_hot_month.month, 1)
+
+    @staticmethod
+    def check_hot_range(db: Session, since: Optional[date], what: str) -> None:
+        """
+        Guards readers of the account_execution table against silently missing archived rows.
+
+        :param db: Database session.
+        :param since: Start of the range to read; None reads all history.
+        :param what: What reads the range, for the error message.
+        :raises ValueError: If the range starts before the archive boundary.
+        """
+        boundary = ExecutionArchiveService.archive_boundary(db)
+        if boundary is None:
+            return
+        if since is not None and not isinstance(since, datetime):
+            since = datetime.combine(since, time.min)
+        if since is None or since < boundary:
+            raise ValueError(f"{what} only reads account executions still in Postgres; months before "
+                             f"{boundary:%Y-%m} are archived, so start at or after {boundary:%Y-%m-%d}.")
+
+    @staticmethod
+    def archive_month(db: Session, month: date) -> int:
+        """
+        Writes the month's account executions to Parquet, then detaches and drops its partition.
+
+        :param db: Database session.
+        :param month: First day of the month to archive.
+        :return: The number of archived rows.
+        :raises ValueError: If the month has no attached partition.
+        """
+        partition = PartitionService.list_partitions(db, ExecutionArchiveService.TABLE).get(month)
+        if partition is None:
+            raise ValueError(f"No {ExecutionArchiveService.TABLE} partition for {month:%Y-%m}.")
+
+        uri = f"{ExecutionArchiveService.ARCHIVE_URI.rstrip('/')}/{partition}.parquet"
+        filesystem, path = ExecutionArchiveService._resolve(uri)
+        filesystem.create_dir(path.rsplit("/", 1)[0], recursive=True)
+
+        schema = ExecutionArchiveService.SCHEMA
+        result = db.execute(
+            text(f"""
+                SELECT id, execution_id, snap_account_id, type::text, status::text, result::text, message,
+                       start_time, end_time
+                FROM {partition}
+                ORDER BY snap_account_id, start_time, id
+            """).execution_options(yield_per=ExecutionArchiveService.CHUNK_SIZE)
+        )
+        rows = 0
+        with filesystem.open_output_stream(path) as sink:
+            with pq.ParquetWriter(sink, schema, compression="zstd") as writer:
+                for chunk in result.partitions():
+                    columns = [pa.array(values, type=schema.field(index).type)
+                               for index, values in enumerate(zip(*chunk))]
+                    writer.write_table(pa.Table.from_arrays(columns, schema=schema),
+                                       row_group_size=ExecutionArchiveService.ROW_GROUP_SIZE)
+                    rows += len(chunk)
+
+        db.add(ExecutionArchiveMonth(month=month, uri=uri, rows=rows))
+        db.execute(text(f"ALTER TABLE {ExecutionArchiveService.TABLE} DETACH PARTITION {partition}"))
+        db.execute(text(f"DROP TABLE {partition}"))
+        db.commit()
+
+        logger.info(f"Archived {rows} account executions of {month:%Y-%m} to {uri}.")
+        return rows
+
+    @staticmethod
+    def archive_expired(db: Session) -> List[date]:
+        """
+        Archives every attached month entirely older than ARCHIVE_AFTER_MONTHS.
+
+        :return: The archived months.
+        """
+        if ExecutionArchiveService.ARCHIVE_AFTER_MONTHS <= 0:
+            return []
+        cutoff = PartitionService.add_months(
+            PartitionService.month_start(datetime.utcnow().date()), -ExecutionArchiveService.ARCHIVE_AFTER_MONTHS
+        )
+        months = sorted(
+            month for month in PartitionService.list_partitions(db, ExecutionArchiveService.TABLE)
+            if PartitionService.add_months(month, 1) <= cutoff
+        )
+        for month in months:
+            ExecutionArchiveService.archive_month(db, month)
+        return months
+
+    @staticmethod
+    def read_account_executions(
+            db: Session,
+            snapchat_account_id: int,
+            execution_ids: Optional[Iterable[int]] = None,
+            excluded_types: Optional[Iterable[str]] = None,
+            after: Optional[tuple] = None,
+    ) -> List[dict]:
+        """
+        Reads an account's archived executions, ordered by (start_time, id).
+
+        :param db: Database session (used to look up the archived files).
+        :param snapchat_account_id: ID of the Snapchat account.
+        :param execution_ids: Optional execution IDs to restrict to.
+        :param excluded_types: Optional execution type names to leave out.
+        :param after: Optional (start_time, id) keyset; only later rows are returned.
+        :return: Dicts with the AccountExecution columns, enums and result restored.
+        """
+        uris = list(ExecutionArchiveService.archived_months(db).values())
+        if not uris:
+            return []
+        if after is not None and after[0] >= ExecutionArchiveService.archive_boundary(db):
+            return []
+
+        resolved = [ExecutionArchiveService._resolve(uri) for uri in uris]
+        dataset = ds.dataset([path for _, path in resolved], filesystem=resolved[0][0], format="parquet")
+
+        condition = ds.field("snap_account_id") == snapchat_account_id
+        if execution_ids is not None:
+            condition = condition & ds.field("execution_id").isin(list(execution_ids))
+        if excluded_types:
+            condition = condition & ~ds.field("type").isin(list(excluded_types))
+        if after is not None:
+            condition = condition & (ds.field("start_time") >= pa.scalar(after[0], type=pa.timestamp("us")))
+
+        rows = dataset.to_table(filter=condition).to_pylist()
+        if after is not None:
+            rows = [row for row in rows if (row["start_time"], row["id"]) > tuple(after)]
+        rows.sort(key=lambda row: (row["start_time"], row["id"]))
+
+        for row in rows:
+            row["type"] = ExecutionTypeEnum[row["type"]]
+            row["status"] = StatusEnum[row["status"]]
+            row["result"] = json.loads(row["result"]) if row["result"] is not None else None
+        return rows
@@ -1,10 +1,14 @@
-from typing import Optional, List, Any, Dict
+from typing import Optional, List, Any, Dict, Union
 from sqlalchemy.orm import aliased
-from sqlalchemy import select, func
+from sqlalchemy import select, func, insert, update
+from collections import Counter, defaultdict
+from datetime import datetime
+from app.dtos.account_execution_response import AccountExecutionResponse
 from app.dtos.execution_create_request import ExecutionCreateRequest
+from app.dtos.execution_response import ExecutionResponse
 from app.dtos.execution_result_response import ExecutionResultResponse
-from app.dtos.execution_simple_response import ExecutionSimpleResponse
 from app.models.account_status_enum import AccountStatusEnum
+from app.models.operation_models.compute_statistics_result import ComputeStatisticsResult
 from app.models.operation_models.consume_leads_config import ConsumeLeadsConfig
 from app.models.execution_type_enum import ExecutionTypeEnum
 from app.models.operation_models.quick_ads_config import QuickAdsConfig
@@ -13,13 +17,17 @@ from app.schemas.executions.execution import Execution
 from app.schemas.executions.account_execution import AccountExecution  # Ensure the model is imported
 from app.schemas.executions.job import Job
 from app.schemas.snapchat_account import SnapchatAccount
+from app.services.execution_archive_service import ExecutionArchiveService
 from app.services.snapchat_account_statistics_service import SnapchatAccountStatisticsService
 from app.services.snapchat_service import SnapchatService
 from fastapi import HTTPException
 from sqlalchemy.orm import selectinload, joinedload
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.event_listeners import apply_execution_rollup_deltas, apply_daily_activity_deltas
 from app.utils.error_message_status_dict import STATUS_MAPPING_ACCOUNTS, STATUS_MAPPING_EXECUTIONS
+from app.utils.serialization import ListSerializer
 from app.utils.user_frinedly_message_utils import UserFriendlyMessageUtils
 
 
@@ -172,21 +180,65 @@ class JobExecutorService:
         Then fetch aggregated counts of AccountExecution status for each Execution.
         Return a list of ExecutionResultResponse.
         """
+        execution_ids = db.execute(JobExecutorService._executions_page_query(
+            agency_id, limit, offset, username, status, execution_type, job_id
+        )).scalars().all()
 
-        subq = db.query(Execution.id, Execution.start_time)
-        subq = subq.filter(Execution.agency_id == agency_id)
+        # If no Execution IDs, return empty
+        if not execution_ids:
+            return []
+
+        results = db.execute(JobExecutorService._execution_status_counts_query(execution_ids)).all()
+        return JobExecutorService._build_execution_results(results)
+
+    @staticmethod
+    async def get_executionsV3_async(
+            db: AsyncSession,
+            agency_id: int,
+            limit: int = 20,
+            offset: int = 0,
+            username: Optional[str] = None,
+            status: Optional[StatusEnum] = None,
+            execution_type: Optional[ExecutionTypeEnum] = None,
+            job_id: Optional[int] = None
+    ) -> List[ExecutionResultResponse]:
+        """
+        Async variant of get_executionsV3 for AsyncSession callers.
+        """
+        execution_ids = (await db.execute(JobExecutorService._executions_page_query(
+            agency_id, limit, offset, username, status, execution_type, job_id
+        ))).scalars().all()
+        if not execution_ids:
+            return []
+
+        results = (await db.execute(JobExecutorService._execution_status_counts_query(execution_ids))).all()
+        return JobExecutorService._build_execution_results(results)
+
+    @staticmethod
+    def _executions_page_query(
+            agency_id: int,
+            limit: int,
+            offset: int,
+            username: Optional[str],
+            status: Optional[StatusEnum],
+            execution_type: Optional[ExecutionTypeEnum],
+            job_id: Optional[int],
+    ):
+        """Builds the (id, start_time) SELECT of one page of the agency's filtered executions."""
+        subq = select(Execution.id, Execution.start_time)
+        subq = subq.where(Execution.agency_id == agency_id)
         # If filtering, join with AccountExecution (and possibly SnapchatAccount)
         if username or status or execution_type or job_id:
             subq = subq.join(Execution.account_executions)
             if execution_type:
-                subq = subq.filter(Execution.type == execution_type.value)
+                subq = subq.where(Execution.type == execution_type.value)
             if job_id:
-                subq = subq.filter(Execution.job_id == job_id)
+                subq = subq.where(Execution.job_id == job_id)
             if username:
                 subq = subq.join(AccountExecution.snapchat_account)
-                subq = subq.filter(SnapchatAccount.username.ilike(f"%{username}%"))
+                subq = subq.where(SnapchatAccount.username.ilike(f"%{username}%"))
             if status:
-                subq = subq.filter(AccountExecution.status == status.value)
+                subq = subq.where(AccountExecution.status == status.value)
 
         # Use distinct so that each (id, start_time) appears only once
         subq = subq.distinct()
@@ -194,18 +246,13 @@ class JobExecutorService:
         # Order by start_time desc, then offset/limit
         subq = subq.order_by(Execution.start_time.desc())
         subq = subq.offset(offset).limit(limit)
+        return subq
 
-        # Grab the IDs from the subquery
-        rows = subq.all()  # each row is (id, start_time)
-        execution_ids = [r.id for r in rows]
-
-        # If no Execution IDs, return empty
-        if not execution_ids:
-            return []
-
-        # --- Query 2: Get full Execution + aggregated status counts for those IDs ---
-        results = (
-            db.query(
+    @staticmethod
+    def _execution_status_counts_query(execution_ids: List[int]):
+        """Builds the SELECT of the given executions with their account execution status counts."""
+        return (
+            select(
                 Execution,
                 AccountExecution.status,
                 Job.name,
@@ -213,12 +260,13 @@ class JobExecutorService:
             )
                 .outerjoin(Execution.account_executions)
                 .outerjoin(Execution.job)
-                .filter(Execution.id.in_(execution_ids))
+                .where(Execution.id.in_(execution_ids))
                 .group_by(Execution.id, AccountExecution.status, Job.name)
                 .order_by(Execution.start_time.desc())
-                .all()
         )
 
+    @staticmethod
+    def _build_execution_results(results) -> List[ExecutionResultResponse]:
         # --- Transform the results into the desired structure ---
         structured_results = {}
         for execution, account_status, job_name, status_count in results:
@@ -229,16 +277,10 @@ class JobExecutorService:
             account_status_key = account_status.value if account_status else "unknown"
             structured_results[execution]["results"][account_status_key] = status_count
 
-        # --- Build the final Pydantic responses ---
-        serialized_results: List[ExecutionResultResponse] = []
-        for execution, data in structured_results.items():
-            execution_response = ExecutionSimpleResponse.from_orm(execution)
-            results_data = data["results"] if data["results"] else None
-            serialized_results.append(
-                ExecutionResultResponse(execution=execution_response, results=results_data, job_name = data["job_name"])
-            )
-
-        return serialized_results
+        # --- Build the final Pydantic responses in one validation pass ---
+        for data in structured_results.values():
+            data["results"] = data["results"] if data["results"] else None
+        return ListSerializer.validate(ExecutionResultResponse, structured_results.values())
 
     @staticmethod
     def get_execution_account(db, execution_account_id):
@@ -355,6 +397,85 @@ class JobExecutorService:
             db, account_execution, snapchat_account, check_status_result
         )
 
+    @staticmethod
+    def handle_compute_statistics_bulk(db, execution, account_ids) -> Dict[int, ComputeStatisticsResult]:
+        """
+        Runs a COMPUTE_STATISTICS execution for all accounts in one pass instead of one
+        Celery child task per account. Without explicit account IDs the whole agency is
+        recomputed.
+
+        AccountExecution rows are inserted and finalized with a handful of set-based
+        statements, so the per-account outcome is still visible in the execution results.
+        These Core writes bypass the mapper listeners, so the rollups are updated explicitly.
+        Returns the per-account results keyed by snapchat account id.
+        """
+        if account_ids is None:
+            account_ids = [
+                account_id for (account_id,) in
+                db.query(SnapchatAccount.id).filter(SnapchatAccount.agency_id == execution.agency_id).all()
+            ]
+        if not account_ids:
+            return {}
+
+        start_time = datetime.utcnow()
+        rows = db.execute(
+            insert(AccountExecution.__table__).returning(
+                AccountExecution.__table__.c.id, AccountExecution.__table__.c.snap_account_id
+            ),
+            [
+                {
+                    "execution_id": execution.id,
+                    "snap_account_id": account_id,
+                    "status": StatusEnum.IN_PROGRESS.name,
+                    "type": ExecutionTypeEnum.COMPUTE_STATISTICS.name,
+                    "start_time": start_time,
+                }
+                for account_id in account_ids
+            ]
+        ).all()
+        apply_execution_rollup_deltas(db.connection(), {
+            snap_account_id: {"total_executions": count}
+            for snap_account_id, count in Counter(row.snap_account_id for row in rows).items()
+        })
+        apply_daily_activity_deltas(db.connection(), [
+            (row.snap_account_id, ExecutionTypeEnum.COMPUTE_STATISTICS, start_time.date(), 1, 0) for row in rows
+        ])
+        db.commit()
+
+        results = SnapchatAccountStatisticsService.compute_statistics_bulk(db, execution.agency_id, account_ids)
+
+        # One UPDATE per distinct outcome; the messages are shared by most accounts.
+        end_time = datetime.utcnow()
+        ids_by_outcome = defaultdict(list)
+        for row in rows:
+            result = results.get(row.snap_account_id) or ComputeStatisticsResult(
+                success=False, message=f"Snapchat Account with id {row.snap_account_id} not found"
+            )
+            ids_by_outcome[(result.success, result.message)].append(row.id)
+
+        for (success, message), execution_account_ids in ids_by_outcome.items():
+            db.execute(
+                update(AccountExecution.__table__)
+                .where(AccountExecution.__table__.c.id.in_(execution_account_ids))
+                .values(
+                    status=(StatusEnum.DONE if success else StatusEnum.FAILURE).name,
+                    message=message,
+                    result={"success": success, "message": message},
+                    end_time=end_time,
+                )
+            )
+        successful_accounts = Counter(
+            row.snap_account_id for row in rows
+            if results.get(row.snap_account_id) and results[row.snap_account_id].success
+        )
+        apply_execution_rollup_deltas(db.connection(), {
+            snap_account_id: {"successful_executions": count}
+            for snap_account_id, count in successful_accounts.items()
+        })
+        db.commit()
+
+        return results
+
     @staticmethod
     def handle_generate_leads(db, account_execution, snapchat_account):
         configuration = account_execution.execution.configuration
@@ -444,6 +565,8 @@ class JobExecutorService:
                     account_execution.status = status
                     break
 
+        if account_execution.type == ExecutionTypeEnum.QUICK_ADDS and account_execution.status == StatusEnum.DONE:
+            snapchat_account.has_completed_quick_add = True
 
         # Clear proxy ID if the account is in a critical status
         if snapchat_account.status in (
@@ -486,11 +609,12 @@ class JobExecutorService:
             limit: int,
             offset: int,
             execution_type: Optional[ExecutionTypeEnum] = None
-    ) -> List[Execution]:
+    ) -> List[Union[Execution, ExecutionResponse]]:
         """
         Retrieve all Execution records that have at least one AccountExecution
         for the specified snapchat_account_id. Eager-load the account_executions
         and their related snapchat_account, but keep only the relevant child rows.
+        Executions past the ones still in Postgres come from the archive as ExecutionResponse DTOs.
         """
 
         # Alias for filtering related account executions
@@ -530,4 +654,71 @@ class JobExecutorService:
                 if ae.snap_account_id == snapchat_account_id
             ]
 
+        if len(executions) < limit:
+            # The page runs past the executions still in Postgres; continue into the archive.
+            executions += JobExecutorService._get_archived_executions_by_snapchat_account(
+                db, snapchat_account_id, subq, limit - len(executions), offset, execution_type
+            )
+
         return executions
+
+    @staticmethod
+    def _get_archived_executions_by_snapchat_account(
+            db: Session, snapchat_account_id: int,
+            hot_execution_ids,
+            limit: int,
+            offset: int,
+            execution_type: Optional[ExecutionTypeEnum] = None
+    ) -> List[ExecutionResponse]:
+        """
+        Continues get_executions_by_snapchat_account into executions whose account executions
+        were archived. Archived executions are older than every execution still in Postgres,
+        so they follow them in the start_time DESC order.
+
+        The archived executions are returned as ExecutionResponse DTOs built from the archived
+        rows, so nothing read back from the archive is attached to the session.
+        """
+        archived_rows = ExecutionArchiveService.read_account_executions(db, snapchat_account_id)
+        if not archived_rows:
+            return []
+
+        rows_by_execution = defaultdict(list)
+        for row in archived_rows:
+            rows_by_execution[row["execution_id"]].append(row)
+        hot_ids = set(
+            db.execute(
+                select(hot_execution_ids.c.execution_id)
+                .where(hot_execution_ids.c.execution_id.in_(list(rows_by_execution)))
+            ).scalars().all()
+        )
+        hot_count = db.query(func.count(func.distinct(hot_execution_ids.c.execution_id))).scalar()
+
+        query = db.query(Execution).filter(
+            Execution.id.in_([execution_id for execution_id in rows_by_execution if execution_id not in hot_ids])
+        )
+        if execution_type:
+            query = query.filter(Execution.type == execution_type.value)
+        executions = (
+            query.order_by(Execution.start_time.desc())
+            .offset(max(0, offset - hot_count))
+            .limit(limit)
+            .all()
+        )
+
+        username = db.scalar(select(SnapchatAccount.username).where(SnapchatAccount.id == snapchat_account_id))
+        return [
+            ExecutionResponse(
+                id=execution.id,
+                type=execution.type,
+                start_time=execution.start_time,
+                end_time=execution.end_time,
+                triggered_by=execution.triggered_by,
+                configuration=execution.configuration,
+                status=execution.status,
+                account_executions=[
+                    AccountExecutionResponse(**row, snapchat_account_username=username)
+                    for row in rows_by_execution[execution.id]
+                ],
+            )
+            for execution in executions
+        ]
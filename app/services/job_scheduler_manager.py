@@ -10,6 +10,8 @@ import logging
 
 from app.celery_tasks.executions_task import ExecutionTaskManager
 from app.celery_tasks.job_task import JobTaskManager
+from app.celery_tasks.partition_maintenance_task import PartitionMaintenanceTaskManager
+from app.celery_tasks.subscription_expiry_task import SubscriptionExpiryTaskManager
 from app.celery_tasks.unlock_accounts_job import UnlockAccountsTaskManager
 from app.celery_tasks.workflow_task import WorkflowTaskManager
 from app.schemas.executions.job import Job
@@ -117,6 +119,27 @@ class SchedulerManager:
         except Exception as e:
             logger.error(f"Error dispatching Celery Unlock Account Job: {e}")
 
+    def trigger_celery_partition_maintenance(self):
+        """
+        Dispatches the partition maintenance Celery task.
+        This function is scheduled by APScheduler.
+        """
+        try:
+            PartitionMaintenanceTaskManager.maintain_partitions.delay()
+            logger.info("Dispatched Celery Partition Maintenance Job.")
+        except Exception as e:
+            logger.error(f"Error dispatching Celery Partition Maintenance Job: {e}")
+
+    def trigger_celery_subscription_expiry(self):
+        """
+        Dispatches the subscription expiry Celery task.
+        This function is scheduled by APScheduler.
+        """
+        try:
+            SubscriptionExpiryTaskManager.expire_subscriptions.delay()
+        except Exception as e:
+            logger.error(f"Error dispatching Celery Subscription Expiry Job: {e}")
+
     def add_job_to_scheduler(self, job: Job):
         """
         Adds a job to APScheduler based on the Job model.
@@ -187,6 +210,44 @@ class SchedulerManager:
             logger.error(f"Failed to remove Job ID {job_id} from scheduler: {e}")
             raise
 
+    def initialize_partition_maintenance_job(self):
+        """
+        Schedules the `PartitionMaintenanceTaskManager.maintain_partitions` task to run daily at 3 AM.
+        """
+        try:
+            trigger = CronTrigger(hour=3, minute=0, timezone=self.scheduler.timezone)
+            self.scheduler.add_job(
+                func=self.trigger_celery_partition_maintenance,
+                trigger=trigger,
+                id="partition_maintenance",
+                replace_existing=True,
+                name="Partition Maintenance Job",
+            )
+
+            logger.info("Scheduled `PartitionMaintenanceTaskManager.maintain_partitions` to run daily at 3 AM.")
+        except Exception as e:
+            logger.error(f"Failed to schedule partition maintenance job: {e}")
+            raise
+
+    def initialize_subscription_expiry_job(self):
+        """
+        Schedules the `SubscriptionExpiryTaskManager.expire_subscriptions` task to run every minute.
+        """
+        try:
+            trigger = CronTrigger(minute="*", timezone=self.scheduler.timezone)
+            self.scheduler.add_job(
+                func=self.trigger_celery_subscription_expiry,
+                trigger=trigger,
+                id="subscription_expiry",
+                replace_existing=True,
+                name="Subscription Expiry Job",
+            )
+
+            logger.info("Scheduled `SubscriptionExpiryTaskManager.expire_subscriptions` to run every minute.")
+        except Exception as e:
+            logger.error(f"Failed to schedule subscription expiry job: {e}")
+            raise
+
     def shutdown_scheduler(self):
         """
         Shuts down the scheduler gracefully, removing all jobs first.
@@ -1,5 +1,7 @@
 # app/services/jobs_service.py
 
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from fastapi import HTTPException, status
@@ -230,6 +232,30 @@ class JobsService:
         query = query.order_by(Job.created_at.asc())
         return query.all()
 
+    @staticmethod
+    async def get_job_async(db: AsyncSession, job_id: int) -> Job:
+        """
+        Async variant of get_job for AsyncSession callers.
+        """
+        db_job = (await db.execute(select(Job).where(Job.id == job_id))).scalars().first()
+        if not db_job:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Job not found."
+            )
+        return db_job
+
+    @staticmethod
+    async def list_jobs_async(db: AsyncSession, agency_id: int, status_filters: Optional[List[JobStatusEnum]] = None) -> List[Job]:
+        """
+        Async variant of list_jobs for AsyncSession callers.
+        """
+        query = select(Job).where(Job.agency_id == agency_id)
+        if status_filters:
+            query = query.where(Job.status.in_(status_filters))
+        query = query.order_by(Job.created_at.asc())
+        return (await db.execute(query)).scalars().all()
+
     @staticmethod
     def restore_job(db: Session, job_id: int) -> Job:
         """
@@ -283,6 +309,14 @@ class JobsService:
         jobs = db.query(Job.id, Job.name).filter(Job.agency_id == agency_id).all()
         return [JobSimplifiedResponse(id=job.id, name=job.name) for job in jobs]
 
+    @staticmethod
+    async def list_jobs_simplified_async(db: AsyncSession, agency_id: int) -> List[JobSimplifiedResponse]:
+        """
+        Async variant of list_jobs_simplified for AsyncSession callers.
+        """
+        jobs = (await db.execute(select(Job.id, Job.name).where(Job.agency_id == agency_id))).all()
+        return [JobSimplifiedResponse(id=job.id, name=job.name) for job in jobs]
+
     @staticmethod
     def get_snapchat_accounts_for_job(db: Session, job_id: int) -> List[SnapchatAccount]:
         """
@@ -0,0 +1,144 @@
+import logging
+import os
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+class PartitionService:
+    """
+    Maintains the monthly range partitions of the append-only tables.
+
+    Each table is partitioned on its time column into `<table>_pYYYYMM` partitions plus a
+    `<table>_default` catch-all. Partitions are created MONTHS_AHEAD months in advance, so
+    the default partition stays empty and new months never need a row move.
+
+    Retention is configured per table in months (0 keeps everything). Expired partitions
+    are detached (kept as standalone tables, e.g. for archiving) unless
+    PARTITION_RETENTION_MODE is "drop".
+    """
+    # table -> partition key column
+    PARTITIONED_TABLES: Dict[str, str] = {
+        "account_execution": "start_time",
+        "snapkat_request_logs": "created_at",
+    }
+    RETENTION_MONTHS: Dict[str, int] = {
+        "account_execution": int(os.getenv("ACCOUNT_EXECUTION_RETENTION_MONTHS", "0")),
+        "snapkat_request_logs": int(os.getenv("SNAPKAT_REQUEST_LOG_RETENTION_MONTHS", "3")),
+    }
+    RETENTION_MODE = os.getenv("PARTITION_RETENTION_MODE", "detach")
+    MONTHS_AHEAD = 3
+
+    @staticmethod
+    def month_start(value: date) -> date:
+        return date(value.year, value.month, 1)
+
+    @staticmethod
+    def add_months(value: date, months: int) -> date:
+        """Returns the first day of the month `months` months after the month of `value`."""
+        month_index = value.year * 12 + value.month - 1 + months
+        return date(month_index // 12, month_index % 12 + 1, 1)
+
+    @staticmethod
+    def partition_name(table: str, month: date) -> str:
+        return f"{table}_p{month:%Y%m}"
+
+    @staticmethod
+    def list_partitions(db: Session, table: str) -> Dict[date, str]:
+        """
+        Returns the table's attached monthly partitions as {first day of month: partition name}.
+        The default partition is not included.
+        """
+        rows = db.execute(text("""
+            SELECT child.relname
+            FROM pg_inherits i
+            JOIN pg_class parent ON parent.oid = i.inhparent
+            JOIN pg_class child ON child.oid = i.inhrelid
+            WHERE parent.relname = :table
+        """), {"table": table}).scalars().all()
+
+        prefix = f"{table}_p"
+        partitions = {}
+        for name in rows:
+            if name.startswith(prefix) and name[len(prefix):].isdigit():
+                month = datetime.strptime(name[len(prefix):], "%Y%m").date()
+                partitions[month] = name
+        return partitions
+
+    @staticmethod
+    def ensure_partitions(db: Session, since: Optional[date] = None, months_ahead: Optional[int] = None) -> List[str]:
+        """
+        Creates the missing monthly partitions from `since` (default: the current month)
+        up to `months_ahead` months after the current month, plus the default partition.
+
+        :param db: Database session.
+        :param since: Optional first month to cover, e.g. when loading historical data.
+        :param months_ahead: Months to create ahead of the current one (default MONTHS_AHEAD).
+        :return: The names of the partitions created.
+        """
+        months_ahead = PartitionService.MONTHS_AHEAD if months_ahead is None else months_ahead
+        current_month = PartitionService.month_start(datetime.utcnow().date())
+        first_month = PartitionService.month_start(since) if since else current_month
+        last_month = PartitionService.add_months(current_month, months_ahead)
+
+        created = []
+        for table in PartitionService.PARTITIONED_TABLES:
+            existing = PartitionService.list_partitions(db, table)
+            month = first_month
+            while month <= last_month:
+                if month not in existing:
+                    name = PartitionService.partition_name(table, month)
+                    next_month = PartitionService.add_months(month, 1)
+                    db.execute(text(
+                        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+                        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')"
+                    ))
+                    created.append(name)
+                month = PartitionService.add_months(month, 1)
+            db.execute(text(f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT"))
+        db.commit()
+
+        if created:
+            logger.info(f"Created partitions: {', '.join(created)}")
+        return created
+
+    @staticmethod
+    def expired_partitions(db: Session, table: str) -> Dict[date, str]:
+        """Returns the table's attached partitions that are entirely older than its retention."""
+        retention = PartitionService.RETENTION_MONTHS.get(table, 0)
+        if retention <= 0:
+            return {}
+        cutoff = PartitionService.add_months(PartitionService.month_start(datetime.utcnow().date()), -retention)
+        return {
+            month: name
+            for month, name in PartitionService.list_partitions(db, table).items()
+            if PartitionService.add_months(month, 1) <= cutoff
+        }
+
+    @staticmethod
+    def apply_retention(db: Session) -> List[str]:
+        """
+        Detaches (or drops, with PARTITION_RETENTION_MODE=drop) the partitions past each
+        table's retention.
+
+        Rows leave the parent table without going through the ORM, so the execution
+        rollups and daily activity keep counting them.
+
+        :return: The names of the partitions detached or dropped.
+        """
+        removed = []
+        for table in PartitionService.PARTITIONED_TABLES:
+            for month, name in sorted(PartitionService.expired_partitions(db, table).items()):
+                db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+                if PartitionService.RETENTION_MODE == "drop":
+                    db.execute(text(f"DROP TABLE {name}"))
+                removed.append(name)
+        db.commit()
+
+        if removed:
+            logger.info(f"Retention ({PartitionService.RETENTION_MODE}) applied to: {', '.join(removed)}")
+        return removed
@@ -1,8 +1,9 @@
 from datetime import datetime
 from typing import List, Optional
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm import Session, selectinload, load_only
 from sqlalchemy import func, desc, asc, or_
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from collections import defaultdict
 
 from app.dtos.account_execution_simple_response import AccountExecutionSimpleResponse
@@ -10,7 +11,7 @@ from app.dtos.model_response import ModelResponse
 from app.dtos.proxy_response import ProxyResponse
 from app.dtos.chatbot_response import ChatBotResponse
 from app.dtos.proxy_simple_response import ProxySimpleResponse
-from app.dtos.snapchat_account_response import SnapchatAccountResponseV2
+from app.dtos.snapchat_account_response import SnapchatAccountResponseV2, SnapchatAccountListItemResponse
 from app.dtos.snapchat_account_edit_response import SnapchatAccountEditResponse
 from app.dtos.workflow_dtos import WorkflowSimplifiedNameResponse
 from app.models.account_status_enum import AccountStatusEnum
@@ -20,6 +21,7 @@ from app.models.workflow_step_type_enum import WorkflowStepTypeEnum
 from app.schemas import SnapchatAccountStats, Agency
 from app.schemas.chatbot import ChatBot
 from app.schemas.cookies import Cookies
+from app.schemas.device import Device
 from app.schemas.executions.account_execution import AccountExecution
 from app.schemas.executions.execution import Execution
 from app.schemas.model import Model
@@ -27,13 +29,32 @@ from app.schemas.proxy import Proxy
 from app.schemas.snapchat_account import SnapchatAccount
 from app.schemas.workflow.workflow import Workflow
 from app.schemas.workflow.workflow_step import WorkflowStep
+from app.event_listeners import STALE_STATISTICS_AGENCIES, apply_status_count_deltas, record_status_changes, status_move_deltas
+from app.utils.serialization import ListSerializer
 from app.utils.snapchat_account_utils import SnapchatAccountUtils
 from sqlalchemy.orm import joinedload
-from sqlalchemy import select, distinct, exists, and_
+from sqlalchemy import select, distinct, exists, and_, text, true, update, inspect, ColumnElement
 import re
 import logging
 logger = logging.getLogger(__name__)
 class SnapchatAccountService:
+    # Fields of the account list (SnapchatAccountListItemResponse) and what loads them
+    LIST_COLUMN_FIELDS = (
+        "username", "password", "snapchat_link", "two_fa_secret", "creation_date", "added_to_system_date",
+        "status", "tags", "account_source", "email", "email_password",
+    )
+    # field -> columns loaded for it
+    LIST_RELATIONSHIP_FIELDS = {
+        "proxy": (Proxy.id, Proxy.host, Proxy.port, Proxy.proxy_username, Proxy.proxy_password),
+        "model": (Model.id, Model.name, Model.onlyfans_url),
+        "chat_bot": (ChatBot.id, ChatBot.type, ChatBot.token),
+        "workflow": (Workflow.id, Workflow.name),
+    }
+    LIST_FLAG_FIELDS = ("has_device", "has_cookies")
+    LIST_FIELDS = ("id", *LIST_COLUMN_FIELDS, *LIST_RELATIONSHIP_FIELDS, *LIST_FLAG_FIELDS, "account_executions")
+    LIST_PAGE_SIZE = 100
+    MAX_LIST_PAGE_SIZE = 1000
+
     @staticmethod
     def get_all_accounts(
             db: Session,
@@ -84,6 +105,39 @@ class SnapchatAccountService:
 
         return snapchat_accounts
 
+    @staticmethod
+    def resolve_list_fields(fields: Optional[List[str]] = None, include_executions: bool = False) -> List[str]:
+        """
+        Validates the fields requested from the account list.
+
+        :param fields: Requested field names; None selects every field but account_executions.
+        :param include_executions: Also select account_executions.
+        :return: The selected fields, id first.
+        :raises ValueError: If a field is unknown.
+        """
+        list_fields = SnapchatAccountService.LIST_FIELDS
+        if fields is None:
+            fields = [field for field in list_fields if field != "account_executions"]
+        unknown = set(fields) - set(list_fields)
+        if unknown:
+            raise ValueError(f"Unknown account field(s): {', '.join(sorted(unknown))}")
+        if include_executions:
+            fields = [*fields, "account_executions"]
+        return list(dict.fromkeys(["id", *fields]))
+
+    @staticmethod
+    def encode_list_cursor(account_id: int) -> str:
+        return str(account_id)
+
+    @staticmethod
+    def decode_list_cursor(cursor: str) -> int:
+        """
+        Parses a cursor produced by encode_list_cursor.
+
+        :raises ValueError: If the cursor is malformed.
+        """
+        return int(cursor)
+
     @staticmethod
     def get_all_accountsV2(
             db: Session,
@@ -95,54 +149,131 @@ class SnapchatAccountService:
             has_device: Optional[bool] = None,
             has_cookies: Optional[bool] = None,
             statuses: Optional[List[AccountStatusEnum]] = None,
-            # New parameters:
             page: Optional[int] = None,
             page_size: Optional[int] = None,
             include_executions: bool = False,
-            has_quick_adds: bool = False  #
-    ) -> List[SnapchatAccount]:
+            has_quick_adds: bool = False,
+            fields: Optional[List[str]] = None,
+            after_id: Optional[int] = None,
+    ) -> List[SnapchatAccountListItemResponse]:
         """
-        Retrieves all Snapchat accounts with optional filters.
-        - If 'include_executions' is True, also load 'account_executions'
-          and slice the top 3 sorted by 'start_time' descending.
-        - If 'page' and 'page_size' are provided, apply pagination.
+        Retrieves one page of the agency's Snapchat accounts, ordered by id.
+
+        Only the columns and relationships of the requested fields are loaded; device and
+        cookie payloads never are, has_device / has_cookies report their presence.
+
+        :param fields: Fields to return (see LIST_FIELDS); None returns all but account_executions.
+        :param include_executions: Also return the 3 latest executions of each account.
+        :param page: Optional page number, switches to OFFSET pagination (kept for old clients).
+        :param page_size: Accounts per page, LIST_PAGE_SIZE by default, at most MAX_LIST_PAGE_SIZE.
+        :param after_id: Keyset cursor; only accounts with a greater id are returned.
+        :raises ValueError: If a field is unknown.
         """
+        fields = SnapchatAccountService.resolve_list_fields(fields, include_executions)
+        query = SnapchatAccountService._accounts_v2_query(
+            agency_id, username, creation_date_from, creation_date_to, has_proxy, has_device, has_cookies,
+            statuses, has_quick_adds, fields, page, page_size, after_id
+        )
+        rows = db.execute(query).all()
 
-        # Base query with joinedload for model & chat_bot
-        # If we want to include executions, use selectinload for them (one extra query, no N+1)
-        load_options = [
-            joinedload(SnapchatAccount.model),
-            joinedload(SnapchatAccount.chat_bot),
-            joinedload(SnapchatAccount.device),
-            joinedload(SnapchatAccount.cookies),
-            joinedload(SnapchatAccount.proxy),
-            joinedload(SnapchatAccount.workflow)
-        ]
+        top_executions = None
+        if "account_executions" in fields:
+            top_executions = db.execute(
+                SnapchatAccountService._top_executions_query([row[0].id for row in rows])
+            ).all() if rows else []
+        return SnapchatAccountService._account_list_items(rows, fields, top_executions)
 
-        query = db.query(SnapchatAccount).options(*load_options)
-        query = query.filter(SnapchatAccount.agency_id == agency_id)
+    @staticmethod
+    async def get_all_accountsV2_async(
+            db: AsyncSession,
+            agency_id: int,
+            username: Optional[str] = None,
+            creation_date_from: Optional[datetime] = None,
+            creation_date_to: Optional[datetime] = None,
+            has_proxy: Optional[bool] = None,
+            has_device: Optional[bool] = None,
+            has_cookies: Optional[bool] = None,
+            statuses: Optional[List[AccountStatusEnum]] = None,
+            page: Optional[int] = None,
+            page_size: Optional[int] = None,
+            include_executions: bool = False,
+            has_quick_adds: bool = False,
+            fields: Optional[List[str]] = None,
+            after_id: Optional[int] = None,
+    ) -> List[SnapchatAccountListItemResponse]:
+        """Async variant of get_all_accountsV2."""
+        fields = SnapchatAccountService.resolve_list_fields(fields, include_executions)
+        query = SnapchatAccountService._accounts_v2_query(
+            agency_id, username, creation_date_from, creation_date_to, has_proxy, has_device, has_cookies,
+            statuses, has_quick_adds, fields, page, page_size, after_id
+        )
+        rows = (await db.execute(query)).all()
+
+        top_executions = None
+        if "account_executions" in fields:
+            top_executions = (await db.execute(
+                SnapchatAccountService._top_executions_query([row[0].id for row in rows])
+            )).all() if rows else []
+        return SnapchatAccountService._account_list_items(rows, fields, top_executions)
+
+    @staticmethod
+    def _accounts_v2_query(
+            agency_id: int,
+            username: Optional[str],
+            creation_date_from: Optional[datetime],
+            creation_date_to: Optional[datetime],
+            has_proxy: Optional[bool],
+            has_device: Optional[bool],
+            has_cookies: Optional[bool],
+            statuses: Optional[List[AccountStatusEnum]],
+            has_quick_adds: bool,
+            fields: List[str],
+            page: Optional[int],
+            page_size: Optional[int],
+            after_id: Optional[int],
+    ):
+        """
+        Builds the filtered, paginated account SELECT of get_all_accountsV2: rows of
+        (SnapchatAccount, *requested flags), the account loading only the selected fields.
+        """
+        columns = [getattr(SnapchatAccount, field) for field in fields
+                   if field in SnapchatAccountService.LIST_COLUMN_FIELDS]
+        load_options = [load_only(SnapchatAccount.id, *columns)]
+        for field, related_columns in SnapchatAccountService.LIST_RELATIONSHIP_FIELDS.items():
+            if field in fields:
+                # Many-to-one, so the joins add columns but never rows.
+                load_options.append(joinedload(getattr(SnapchatAccount, field)).load_only(*related_columns))
+
+        flags = []
+        if "has_device" in fields:
+            flags.append(exists().where(Device.snapchat_account_id == SnapchatAccount.id).label("has_device"))
+        if "has_cookies" in fields:
+            flags.append(exists().where(Cookies.snapchat_account_id == SnapchatAccount.id).label("has_cookies"))
+
+        query = select(SnapchatAccount, *flags).options(*load_options)
+        query = query.where(SnapchatAccount.agency_id == agency_id)
         # --- Apply Filters ---
         if username:
-            query = query.filter(SnapchatAccount.username.ilike(f"%{username}%"))
+            query = query.where(SnapchatAccount.username.ilike(f"%{username}%"))
         if creation_date_from:
-            query = query.filter(SnapchatAccount.creation_date >= creation_date_from)
+            query = query.where(SnapchatAccount.creation_date >= creation_date_from)
         if creation_date_to:
-            query = query.filter(SnapchatAccount.creation_date <= creation_date_to)
+            query = query.where(SnapchatAccount.creation_date <= creation_date_to)
         if has_proxy is not None:
-            query = query.filter(
+            query = query.where(
                 SnapchatAccount.proxy != None if has_proxy else SnapchatAccount.proxy == None
             )
         if has_device is not None:
-            query = query.filter(
+            query = query.where(
                 SnapchatAccount.device != None if has_device else SnapchatAccount.device == None
             )
         if has_cookies is not None:
-            query = query.filter(
+            query = query.where(
                 SnapchatAccount.cookies != None if has_cookies else SnapchatAccount.cookies == None
             )
-        query = query.filter(SnapchatAccount.status != AccountStatusEnum.TERMINATED)
+        query = query.where(SnapchatAccount.status != AccountStatusEnum.TERMINATED)
         if statuses:
-            query = query.filter(SnapchatAccount.status.in_(statuses))
+            query = query.where(SnapchatAccount.status.in_(statuses))
         if has_quick_adds:
             # Condition 1: There is an associated stats record with quick_ads_sent > 40.
             stats_condition = exists().where(
@@ -173,7 +304,7 @@ class SnapchatAccountService:
 
             # Combine the conditions with OR: either the stats record qualifies,
             # or if no stats record exists then there must be at least 2 matching executions.
-            query = query.filter(
+            query = query.where(
                 or_(
                     stats_condition,
                     and_(
@@ -183,62 +314,78 @@ class SnapchatAccountService:
                 )
             )
 
-        # --- Optional Pagination ---
-        if page is not None and page_size is not None:
-            offset = (page - 1) * page_size
-            query = query.offset(offset).limit(page_size)
+        # --- Pagination: keyset on id (ix_snapchat_account_agency_id), OFFSET for page numbers ---
+        limit = min(page_size or SnapchatAccountService.LIST_PAGE_SIZE, SnapchatAccountService.MAX_LIST_PAGE_SIZE)
+        query = query.order_by(SnapchatAccount.id).limit(limit)
+        if page is not None:
+            query = query.offset((page - 1) * limit)
+        elif after_id is not None:
+            query = query.where(SnapchatAccount.id > after_id)
+        return query
 
-        # --- Execute Query ---
-        snapchat_accounts = query.all()
+    @staticmethod
+    def _top_executions_query(account_ids: List[int]):
+        """
+        Builds the SELECT of the 3 latest account executions of each given account, as rows
+        of the AccountExecutionSimpleResponse columns plus snap_account_id.
 
-        # --- If we do NOT want executions, or no accounts, just return them ---
-        if not include_executions or not snapchat_accounts:
-            return snapchat_accounts
-
-        account_ids = [acct.id for acct in snapchat_accounts]
-
-        # (b) Create a subquery with row_number() to rank each execution by start_time DESC
-        subq = (
-            db.query(
-                AccountExecution.id.label("ae_id"),
-                AccountExecution.snap_account_id.label("acct_id"),
-                func.row_number()
-                    .over(
-                    partition_by=AccountExecution.snap_account_id,
-                    order_by=AccountExecution.start_time.desc()
-                )
-                    .label("rn")
+        Each account gets its own LATERAL ... LIMIT 3, a backward scan of
+        ix_account_execution_account_start_time that stops after 3 rows, so the cost does
+        not grow with the accounts' execution history.
+        """
+        accounts = select(SnapchatAccount.id).where(SnapchatAccount.id.in_(account_ids)).subquery()
+        latest = (
+            select(
+                AccountExecution.id,
+                AccountExecution.snap_account_id,
+                AccountExecution.status,
+                AccountExecution.message,
+                AccountExecution.start_time,
+                AccountExecution.end_time,
             )
-                .filter(AccountExecution.snap_account_id.in_(account_ids))
-                .subquery()
+            .where(AccountExecution.snap_account_id == accounts.c.id)
+            .order_by(AccountExecution.start_time.desc(), AccountExecution.id.desc())
+            .limit(3)
+            .lateral()
         )
-
-        # (c) Join back to AccountExecution, filtering where rn <= 3
-        top_executions = (
-            db.query(AccountExecution)
-                .join(subq, AccountExecution.id == subq.c.ae_id)
-                .filter(subq.c.rn <= 3)
-                # optional order_by for consistent results (not strictly required)
-                .order_by(AccountExecution.snap_account_id, AccountExecution.start_time.desc())
-                .all()
+        return (
+            select(latest)
+            .select_from(accounts.join(latest, true()))
+            .order_by(latest.c.snap_account_id, latest.c.start_time.desc(), latest.c.id.desc())
         )
 
+    @staticmethod
+    def _account_list_items(
+            rows, fields: List[str], top_executions: Optional[list]
+    ) -> List[SnapchatAccountListItemResponse]:
+        """Builds the list items of get_all_accountsV2, setting only the selected fields."""
         execs_by_acct = defaultdict(list)
-        for ex in top_executions:
-            execs_by_acct[ex.snap_account_id].append(ex)
-
-        # Attach the top 3 to each SnapchatAccount *without* triggering lazy load:
-        for acct in snapchat_accounts:
-            # Directly overwrite the attribute in the instance’s __dict__, bypassing lazy loading.
-            raw_execs = execs_by_acct.get(acct.id, [])
-            # Make sure AccountExecutionSimpleResponse has `orm_mode = True` or `from_attributes = True`
-            pydantic_execs = [AccountExecutionSimpleResponse.from_orm(e) for e in raw_execs]
-
-            # Overwrite the relationship field with the Pydantic list
-            acct.__dict__["account_executions"] = pydantic_execs
-
-        return snapchat_accounts
+        for ex in top_executions or []:
+            execs_by_acct[ex.snap_account_id].append(
+                {"id": ex.id, "status": ex.status.value, "message": ex.message,
+                 "start_time": ex.start_time, "end_time": ex.end_time}
+            )
+        execs_by_acct = {
+            acct_id: ListSerializer.construct(AccountExecutionSimpleResponse, execs)
+            for acct_id, execs in execs_by_acct.items()
+        }
 
+        items = []
+        for row in rows:
+            acct = row[0]
+            values = {}
+            for field in fields:
+                if field in SnapchatAccountService.LIST_FLAG_FIELDS:
+                    values[field] = row._mapping[field]
+                elif field == "account_executions":
+                    values[field] = execs_by_acct.get(acct.id, [])
+                elif field == "status":
+                    values[field] = acct.status.value
+                else:
+                    # Related objects are read from their attributes by the bulk validation
+                    values[field] = getattr(acct, field)
+            items.append(values)
+        return ListSerializer.validate(SnapchatAccountListItemResponse, items)
 
     @staticmethod
     def get_account_by_id(db: Session, account_id: int) -> Optional[SnapchatAccount]:
@@ -643,12 +790,14 @@ class SnapchatAccountService:
         """
         Marks all accounts with the given IDs as TERMINATED.
         """
-        result = db.query(SnapchatAccount).filter(SnapchatAccount.id.in_(account_ids)).update(
-            {SnapchatAccount.status: AccountStatusEnum.TERMINATED},
-            synchronize_session="fetch",
+        if not account_ids:
+            return 0
+        updated_count = SnapchatAccountService.update_accounts_where(
+            db, SnapchatAccount.id.in_(account_ids),
+            status=AccountStatusEnum.TERMINATED.value,
         )
         db.commit()
-        return result
+        return updated_count
 
     @staticmethod
     def get_snap_id_for_account(snapchat_account: SnapchatAccount):
@@ -675,40 +824,125 @@ class SnapchatAccountService:
         if not account_ids:
             return 0  # or raise an exception
 
-        accounts = db.query(SnapchatAccount).filter(SnapchatAccount.id.in_(account_ids)).all()
-        if not accounts:
+        updated_count = SnapchatAccountService.update_accounts_where(
+            db, SnapchatAccount.id.in_(account_ids),
+            status=status, tags_to_add=tags_to_add, tags_to_remove=tags_to_remove,
+            model_id=model_id, chat_bot_id=chat_bot_id,
+        )
+        if not updated_count:
+            db.rollback()
             raise ValueError("No Snapchat accounts found with the given IDs.")
+        db.commit()
+        return updated_count
 
-        updated_count = 0
-
-        for account in accounts:
-            if status is not None:
-                try:
-                    new_status = AccountStatusEnum(status)
-                    account.status = new_status
-                except ValueError:
-                    raise ValueError(f"Invalid status value: {status}")
-
-            if tags_to_add:
-                if account.tags is None:
-                    account.tags = []
-
-                existing = set(account.tags)
-                new = set(tags_to_add)
-                account.tags = list(existing.union(new))
-
-            if tags_to_remove and account.tags:
-                remaining = [tag for tag in account.tags if tag not in tags_to_remove]
-                account.tags = remaining
-
-            if model_id is not None:
-                account.model_id = model_id
-
-            if chat_bot_id is not None:
-                account.chatbot_id = chat_bot_id
+    @staticmethod
+    def update_accounts_where(
+            db: Session,
+            condition: ColumnElement,
+            status: Optional[str] = None,
+            tags_to_add: Optional[List[str]] = None,
+            tags_to_remove: Optional[List[str]] = None,
+            model_id: Optional[int] = None,
+            chat_bot_id: Optional[int] = None,
+    ) -> int:
+        """
+        Sets the given fields on every account matching the condition with a single UPDATE.
+        Tags are added before they are removed. Does not commit.
 
-            updated_count += 1
+        :param db: Database session.
+        :param condition: Condition on SnapchatAccount columns, e.g. SnapchatAccount.id.in_(account_ids).
+        :return: The number of updated accounts.
+        :raises ValueError: If the status is not a valid account status.
+        """
+        values = {}
+        if status is not None:
+            try:
+                values["status"] = AccountStatusEnum(status)
+            except ValueError:
+                raise ValueError(f"Invalid status value: {status}")
+
+        tags, tag_params = "snapchat_account.tags", {}
+        if tags_to_add:
+            # Keep the existing order and append the tags the account does not have yet.
+            tag_params["tags_to_add"] = list(dict.fromkeys(tags_to_add))
+            tags = ("COALESCE(snapchat_account.tags, '{}') || ARRAY(SELECT tag FROM unnest(CAST(:tags_to_add AS varchar[])) "
+                    "AS tag WHERE NOT tag = ANY(COALESCE(snapchat_account.tags, '{}')))")
+        if tags_to_remove:
+            tag_params["tags_to_remove"] = list(tags_to_remove)
+            tags = (f"CASE WHEN {tags} IS NULL THEN NULL ELSE ARRAY("
+                    f"SELECT tag FROM unnest({tags}) WITH ORDINALITY AS kept(tag, position) "
+                    f"WHERE NOT tag = ANY(CAST(:tags_to_remove AS varchar[])) ORDER BY position) END")
+        if tag_params:
+            values["tags"] = text(tags).bindparams(**tag_params)
+
+        if model_id is not None:
+            values["model_id"] = model_id
+        if chat_bot_id is not None:
+            values["chatbot_id"] = chat_bot_id
+
+        return SnapchatAccountService._bulk_update(
+            db, condition, values, invalidates_statistics=model_id is not None
+        )
 
-        db.commit()
-        return updated_count
+    @staticmethod
+    def _bulk_update(
+            db: Session,
+            condition: ColumnElement,
+            values: dict,
+            invalidates_statistics: bool = False,
+    ) -> int:
+        """
+        Applies the values to the accounts matching the condition with a single UPDATE.
+
+        Core updates bypass the SnapchatAccount flush listeners, so the status changes returned
+        by the UPDATE are passed to the same helpers (record_status_changes and
+        apply_status_count_deltas) on the session's connection, in the same transaction.
+
+        :param db: Database session; the caller commits.
+        :param condition: Condition on SnapchatAccount columns selecting the accounts.
+        :param values: New values by snapchat_account column name; SQL expressions may refer
+            to the current row as snapchat_account.
+        :param invalidates_statistics: Whether the cached overview statistics of the updated
+            accounts' agencies are stale after the update (e.g. model reassignment).
+        :return: The number of updated accounts.
+        """
+        if not values:
+            return db.scalar(select(func.count()).select_from(SnapchatAccount).where(condition))
+
+        table = SnapchatAccount.__table__
+        previous = (
+            select(table.c.id, table.c.status)
+            .where(condition)
+            .with_for_update()
+            .cte("previous")
+        )
+        updated = db.execute(
+            update(table)
+            .where(table.c.id == previous.c.id)
+            .values(**values)
+            .returning(table.c.id, table.c.agency_id, previous.c.status.label("old_status"),
+                       table.c.status.label("new_status"), table.c.has_completed_quick_add)
+        ).all()
+
+        changed = [row for row in updated if row.old_status != row.new_status]
+        if changed:
+            connection = db.connection()
+            record_status_changes(
+                connection, [(row.id, row.old_status, row.new_status) for row in changed], datetime.utcnow()
+            )
+            apply_status_count_deltas(connection, status_move_deltas(
+                ((row.agency_id, row.old_status, row.has_completed_quick_add),
+                 (row.agency_id, row.new_status, row.has_completed_quick_add))
+                for row in changed
+            ))
+
+        agency_ids = {row.agency_id for row in updated if row.agency_id is not None}
+        if invalidates_statistics and agency_ids:
+            db.info.setdefault(STALE_STATISTICS_AGENCIES, set()).update(agency_ids)
+        # The updated accounts loaded in the session no longer match their rows.
+        updated_ids = {row.id for row in updated}
+        for obj in list(db.identity_map.values()):
+            if isinstance(obj, SnapchatAccount) and inspect(obj).identity[0] in updated_ids:
+                db.expire(obj)
+        return len(updated)
 
@@ -1,3 +1,4 @@
+from app.database import READ_REPLICA_MAX_LAG_SECONDS
 from app.dtos.statistics.daily_account_stats_dto import DailyAccountStatsDTO
 from app.dtos.statistics.snapchat_account_score_dto import SnapchatAccountScoreDTO
 from app.dtos.statistics.snapchat_account_stats_response import SnapchatAccountStatsDTO, AccountExecutionDTO, \
@@ -7,19 +8,32 @@ from app.models.account_status_enum import AccountStatusEnum
 from app.models.chat_bot_type_enum import ChatBotTypeEnum
 from app.models.operation_models.compute_statistics_result import ComputeStatisticsResult
 from app.models.execution_type_enum import ExecutionTypeEnum
-from app.models.status_enum import StatusEnum
-from app.schemas import SnapchatAccount, SnapchatAccountStatusLog, Model
+from app.schemas import SnapchatAccount, SnapchatAccountStatusLog, Model, SnapchatAccountLogin, ChatBot
 from app.schemas.executions.account_execution import AccountExecution
 from app.schemas.snapchat_account_stats import SnapchatAccountStats
+from app.schemas.snapchat_account_execution_rollup import SnapchatAccountExecutionRollup
+from app.schemas.agency_account_status_count import AgencyAccountStatusCount
+from app.schemas.agency_daily_activity import AgencyDailyActivity
+from app.schemas.snapchat_account_daily_activity import SnapchatAccountDailyActivity
+from app.event_listeners import EXIT_FROM_STATUSES
+from app.services.execution_archive_service import ExecutionArchiveService
 from app.services.snapchat_account_service import SnapchatAccountService
-from sqlalchemy import func, cast, Integer
-from sqlalchemy.sql import exists, and_
+from app.utils.account_score_cache import AccountScoreCache, AgencyScoreMetrics
+from app.utils.statistics_cache import StatisticsCache
+from sqlalchemy import func, select, update, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import heapq
+import itertools
+import numpy as np
 import requests
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import text
-from datetime import timedelta, datetime
-from typing import Dict, Optional
-from sqlalchemy import desc
+from datetime import timedelta, datetime, date
+from types import SimpleNamespace
+from typing import Dict, Optional, Tuple
 from typing import List
 
 import logging
@@ -28,6 +42,8 @@ logger = logging.getLogger(__name__)
 
 
 class SnapchatAccountStatisticsService:
+    CUPID_BOT_MAX_WORKERS = 8
+
     @staticmethod
     def _get_stats_from_cupidbot(cupid_token: str, snap_account_id: str) -> dict:
         """
@@ -81,6 +97,10 @@ class SnapchatAccountStatisticsService:
         """
         Retrieves statistics from account executions for a given Snapchat account.
 
+        The counters are read from the account's execution rollup row, which is kept up
+        to date by the AccountExecution listeners, so the cost does not depend on how
+        many executions the account has.
+
         :param db: Database session.
         :param snapchat_account: The Snapchat account instance.
         :return: A dictionary containing statistics.
@@ -91,105 +111,116 @@ class SnapchatAccountStatisticsService:
             "quick_ads_sent": 0,
             "total_executions": 0,
             "successful_executions": 0,
+            "rejected_count": 0,
+            "generated_leads": 0,
         }
 
         try:
-            # Fetch the most recent CHECK_CONVERSATIONS execution marked as DONE
-            conversation_execution = (
-                db.query(AccountExecution)
-                .filter(
-                    AccountExecution.snap_account_id == snapchat_account.id,
-                    AccountExecution.type == ExecutionTypeEnum.CHECK_CONVERSATIONS,
-                    AccountExecution.status == StatusEnum.DONE,
-                )
-                .order_by(AccountExecution.id.desc())
-                .first()
+            rollup = (
+                db.query(SnapchatAccountExecutionRollup)
+                .filter(SnapchatAccountExecutionRollup.snapchat_account_id == snapchat_account.id)
+                .one_or_none()
             )
+            if not rollup:
+                return stats
+
+            stats["total_conversations"] = rollup.last_conversations or 0
+            stats["quick_ads_sent"] = (rollup.quick_adds_sent_requests or 0) + \
+                                      (rollup.consume_leads_sent_requests or 0)
+            stats["rejected_count"] = (rollup.quick_adds_rejected_count or 0) + \
+                                      (rollup.generate_leads_rejected_count or 0)
+            stats["generated_leads"] = rollup.generated_leads or 0
+            stats["total_executions"] = rollup.total_executions or 0
+            stats["successful_executions"] = rollup.successful_executions or 0
 
-            # If found, update conversations count
-            if conversation_execution and "conversations" in conversation_execution.result:
-                stats["total_conversations"] = conversation_execution.result["conversations"] or 0
-
-            # Sum of 'total_sent_requests' from QUICK_ADDS executions marked as DONE
-            quick_ads_result_stats = (
-                db.query(
-                    func.sum(
-                        cast(AccountExecution.result.op('->>')('total_sent_requests'), Integer)
-                    ).label('quick_ads_total_sent_requests'),
-                    func.sum(
-                        cast(AccountExecution.result.op('->>')('rejected_count'), Integer)
-                    ).label('quick_ads_rejected_count')
-                )
-                .filter(
-                    AccountExecution.snap_account_id == snapchat_account.id,
-                    AccountExecution.type == ExecutionTypeEnum.QUICK_ADDS,
-                    AccountExecution.status == StatusEnum.DONE,
-                )
-                .first()
-            )
-            consume_leads_stats = (
-                db.query(
-                    func.sum(
-                        cast(AccountExecution.result.op('->>')('total_sent_requests'), Integer)
-                    ).label('consume_sent_requests')
-                )
-                .filter(
-                    AccountExecution.snap_account_id == snapchat_account.id,
-                    AccountExecution.type == ExecutionTypeEnum.CONSUME_LEADS,
-                    AccountExecution.status == StatusEnum.DONE,
-                )
-                .first()
-            )
-            generate_leads_stats = (
-                db.query(
-                    func.sum(
-                        cast(AccountExecution.result.op('->>')('generated_leads'), Integer)
-                    ).label('total_generated_leads'),
-                    func.sum(
-                        cast(AccountExecution.result.op('->>')('rejected_count'), Integer)
-                    ).label('generate_rejected_count')
-                )
-                .filter(
-                    AccountExecution.snap_account_id == snapchat_account.id,
-                    AccountExecution.type == ExecutionTypeEnum.GENERATE_LEADS,
-                    AccountExecution.status == StatusEnum.DONE,
-                )
-                .first()
-            )
+        except Exception as e:
+            logger.error(f"An error occurred while fetching statistics: {str(e)}")
 
-            # Extract the results with a fallback to 0
+        return stats
 
-            stats["quick_ads_sent"] = (quick_ads_result_stats.quick_ads_total_sent_requests or 0) + \
-                                      (consume_leads_stats.consume_sent_requests or 0)
+    # :account_ids NULL rebuilds every account.
+    EXECUTION_ROLLUP_REBUILD_SQL = text("""
+            INSERT INTO snapchat_account_execution_rollup (
+                snapchat_account_id,
+                total_executions,
+                successful_executions,
+                quick_adds_sent_requests,
+                quick_adds_rejected_count,
+                consume_leads_sent_requests,
+                generated_leads,
+                generate_leads_rejected_count,
+                last_conversations,
+                last_conversations_execution_id
+            )
+            SELECT
+                ae.snap_account_id,
+                COUNT(*),
+                COUNT(*) FILTER (WHERE ae.status = 'DONE'),
+                COALESCE(SUM(ae.total_sent_requests)
+                    FILTER (WHERE ae.status = 'DONE' AND ae.type = 'QUICK_ADDS'), 0),
+                COALESCE(SUM(ae.rejected_count)
+                    FILTER (WHERE ae.status = 'DONE' AND ae.type = 'QUICK_ADDS'), 0),
+                COALESCE(SUM(ae.total_sent_requests)
+                    FILTER (WHERE ae.status = 'DONE' AND ae.type = 'CONSUME_LEADS'), 0),
+                COALESCE(SUM(ae.generated_leads)
+                    FILTER (WHERE ae.status = 'DONE' AND ae.type = 'GENERATE_LEADS'), 0),
+                COALESCE(SUM(ae.rejected_count)
+                    FILTER (WHERE ae.status = 'DONE' AND ae.type = 'GENERATE_LEADS'), 0),
+                COALESCE((ARRAY_AGG(COALESCE(ae.conversations, 0) ORDER BY ae.id DESC)
+                    FILTER (WHERE ae.status = 'DONE' AND ae.type = 'CHECK_CONVERSATIONS'
+                            AND jsonb_exists(ae.result, 'conversations')))[1], 0),
+                MAX(ae.id) FILTER (WHERE ae.status = 'DONE' AND ae.type = 'CHECK_CONVERSATIONS'
+                                   AND jsonb_exists(ae.result, 'conversations'))
+            FROM account_execution ae
+            WHERE CAST(:account_ids AS integer[]) IS NULL OR ae.snap_account_id = ANY(:account_ids)
+            GROUP BY ae.snap_account_id
+        """)
 
-            stats["rejected_count"] = (quick_ads_result_stats.quick_ads_rejected_count or 0) + \
-                                      (generate_leads_stats.generate_rejected_count or 0)
+    @staticmethod
+    def rebuild_execution_rollups(db: Session, account_ids: Optional[List[int]] = None) -> int:
+        """
+        Recomputes the execution rollup rows from the full account_execution history.
 
-            stats["generated_leads"] = generate_leads_stats.total_generated_leads or 0
+        Only needed to seed or repair the rollup table; during normal operation the rows
+        are maintained incrementally when executions are inserted or change status.
 
-            # Count total executions (any status)
-            stats["total_executions"] = (
-                db.query(AccountExecution)
-                .filter(AccountExecution.snap_account_id == snapchat_account.id)
-                .count()
-            )
+        :param db: Database session.
+        :param account_ids: Optional list of Snapchat account IDs to restrict the rebuild to.
+        :return: The number of rollup rows written.
+        :raises ValueError: If account executions have been archived; the rollups would lose them.
+        """
+        ExecutionArchiveService.check_hot_range(db, None, "Rebuilding the execution rollups")
+        params = {"account_ids": list(account_ids) if account_ids is not None else None}
 
-            # Count successful executions (DONE)
-            stats["successful_executions"] = (
-                db.query(AccountExecution)
-                .filter(
-                    AccountExecution.snap_account_id == snapchat_account.id,
-                    AccountExecution.status == StatusEnum.DONE,
-                )
-                .count()
+        if account_ids is not None:
+            db.execute(
+                text("DELETE FROM snapchat_account_execution_rollup WHERE snapchat_account_id = ANY(:account_ids)"),
+                params
             )
+        else:
+            db.execute(text("DELETE FROM snapchat_account_execution_rollup"))
 
-        except Exception as e:
-            # Log or handle the exception appropriately
-            # For example, you could do logger.exception("Error fetching statistics") instead
-            print(f"An error occurred while fetching statistics: {str(e)}")
+        result = db.execute(SnapchatAccountStatisticsService.EXECUTION_ROLLUP_REBUILD_SQL, params)
+        db.commit()
+        return result.rowcount
 
-        return stats
+    @staticmethod
+    def _compute_score_rates(stats: dict) -> dict:
+        """
+        Derives the account score metrics from its statistics counters.
+
+        :param stats: Statistics counters keyed by SnapchatAccountStats column name.
+        :return: The rejecting, conversation and conversion rates (0 when undefined).
+        """
+        def rate(numerator: str, *denominators: str) -> float:
+            denominator = sum(stats.get(name) or 0 for name in denominators)
+            return (stats.get(numerator) or 0) / denominator if denominator else 0.0
+
+        return {
+            "rejecting_rate": rate("rejected_total", "rejected_total", "quick_ads_sent", "generated_leads"),
+            "conversation_rate": rate("total_conversations", "quick_ads_sent"),
+            "conversion_rate": rate("total_conversions", "conversations_charged"),
+        }
 
     @staticmethod
     def compute_statistics(
@@ -217,11 +248,6 @@ class SnapchatAccountStatisticsService:
                 "snapchat_account_id": snapchat_account.id
             }
 
-            # Initialize statistics object
-            stats = SnapchatAccountStats(
-                snapchat_account_id=snapchat_account.id,
-            )
-
             cupid_stats = None
             if snapchat_account.chat_bot:
                 if snapchat_account.chat_bot.type == ChatBotTypeEnum.CUPID_BOT:
@@ -256,6 +282,14 @@ class SnapchatAccountStatisticsService:
                 .filter(SnapchatAccountStats.snapchat_account_id == snapchat_account.id)
                 .one_or_none()
             )
+            # Rates also depend on the CupidBot counters, which are kept when they weren't refetched.
+            current_stats = {
+                column.name: getattr(existing_stats, column.name)
+                for column in SnapchatAccountStats.__table__.columns
+            } if existing_stats else {}
+            merged_stats.update(
+                SnapchatAccountStatisticsService._compute_score_rates({**current_stats, **merged_stats})
+            )
             snapchat_account.snapchat_id = snap_account_id
             db.add(snapchat_account)
             if existing_stats:
@@ -265,8 +299,9 @@ class SnapchatAccountStatisticsService:
                 db.add(existing_stats)
             else:
                 # Create new statistics record
-                db.add(stats)
+                db.add(SnapchatAccountStats(**merged_stats))
             db.commit()
+            StatisticsCache.invalidate([snapchat_account.agency_id])
 
             return ComputeStatisticsResult(
                 success=True,
@@ -280,6 +315,150 @@ class SnapchatAccountStatisticsService:
                 message=message
             )
 
+    @staticmethod
+    def compute_statistics_bulk(
+            db: Session,
+            agency_id: int,
+            account_ids: Optional[List[int]] = None,
+    ) -> Dict[int, ComputeStatisticsResult]:
+        """
+        Recomputes and stores statistics for many Snapchat accounts of an agency at once.
+
+        Account data, execution rollups and the current statistics rows are read with one
+        grouped query, and all statistics rows are written with a single
+        INSERT ... ON CONFLICT statement. Only the CupidBot analytics still require one
+        HTTP call per account that uses a CupidBot chatbot.
+
+        :param db: The database session.
+        :param agency_id: The agency whose accounts are recomputed.
+        :param account_ids: Optional list of account IDs to restrict the recompute to.
+        :return: A dictionary mapping account IDs to their ComputeStatisticsResult.
+        """
+        login_user_id = (
+            select(SnapchatAccountLogin.user_id)
+            .where(SnapchatAccountLogin.snap_account_id == SnapchatAccount.id)
+            .order_by(SnapchatAccountLogin.id.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        query = (
+            db.query(
+                SnapchatAccount.id.label("account_id"),
+                SnapchatAccount.snapchat_id,
+                func.coalesce(SnapchatAccount.snapchat_id, login_user_id).label("snap_account_id"),
+                ChatBot.type.label("chat_bot_type"),
+                ChatBot.token.label("chat_bot_token"),
+                SnapchatAccountExecutionRollup.last_conversations,
+                SnapchatAccountExecutionRollup.quick_adds_sent_requests,
+                SnapchatAccountExecutionRollup.quick_adds_rejected_count,
+                SnapchatAccountExecutionRollup.consume_leads_sent_requests,
+                SnapchatAccountExecutionRollup.generated_leads,
+                SnapchatAccountExecutionRollup.generate_leads_rejected_count,
+                SnapchatAccountExecutionRollup.total_executions,
+                SnapchatAccountExecutionRollup.successful_executions,
+                SnapchatAccountStats.chatbot_conversations,
+                SnapchatAccountStats.conversations_charged,
+                SnapchatAccountStats.cta_conversations,
+                SnapchatAccountStats.cta_shared_links,
+                SnapchatAccountStats.conversions_from_cta_links,
+                SnapchatAccountStats.total_conversions,
+            )
+            .outerjoin(ChatBot, ChatBot.id == SnapchatAccount.chatbot_id)
+            .outerjoin(SnapchatAccountExecutionRollup,
+                       SnapchatAccountExecutionRollup.snapchat_account_id == SnapchatAccount.id)
+            .outerjoin(SnapchatAccountStats, SnapchatAccountStats.snapchat_account_id == SnapchatAccount.id)
+            .filter(SnapchatAccount.agency_id == agency_id)
+        )
+        if account_ids is not None:
+            query = query.filter(SnapchatAccount.id.in_(account_ids))
+        rows = query.all()
+
+        results: Dict[int, ComputeStatisticsResult] = {}
+        if account_ids is not None:
+            for account_id in set(account_ids) - {row.account_id for row in rows}:
+                results[account_id] = ComputeStatisticsResult(
+                    success=False,
+                    message=f"Snapchat Account with id {account_id} not found"
+                )
+
+        # CupidBot analytics are only reachable over HTTP, fetch them concurrently.
+        cupid_rows = [
+            row for row in rows
+            if row.snap_account_id and row.chat_bot_type == ChatBotTypeEnum.CUPID_BOT
+        ]
+        cupid_stats_by_account = {}
+        if cupid_rows:
+            with ThreadPoolExecutor(max_workers=SnapchatAccountStatisticsService.CUPID_BOT_MAX_WORKERS) as pool:
+                fetched = pool.map(
+                    lambda row: SnapchatAccountStatisticsService._get_stats_from_cupidbot(
+                        row.chat_bot_token, row.snap_account_id
+                    ),
+                    cupid_rows
+                )
+                cupid_stats_by_account = {row.account_id: stats for row, stats in zip(cupid_rows, fetched)}
+
+        stats_rows = []
+        snapchat_id_updates = []
+        for row in rows:
+            if not row.snap_account_id:
+                results[row.account_id] = ComputeStatisticsResult(
+                    success=False,
+                    message="Current account has no executions registered in the platform, can't compute statistics."
+                )
+                continue
+
+            cupid_stats = cupid_stats_by_account.get(row.account_id) or {}
+            stats_row = {
+                "snapchat_account_id": row.account_id,
+                "chatbot_conversations": cupid_stats.get("chatbot_conversations", row.chatbot_conversations or 0),
+                "conversations_charged": cupid_stats.get("conversations_charged", row.conversations_charged or 0),
+                "cta_conversations": cupid_stats.get("cta_conversations", row.cta_conversations or 0),
+                "cta_shared_links": cupid_stats.get("cta_shared_links", row.cta_shared_links or 0),
+                "conversions_from_cta_links": cupid_stats.get("conversions_from_cta_links",
+                                                              row.conversions_from_cta_links or 0),
+                "total_conversions": cupid_stats.get("total_conversions", row.total_conversions or 0),
+                "total_conversations": row.last_conversations or 0,
+                "quick_ads_sent": (row.quick_adds_sent_requests or 0) + (row.consume_leads_sent_requests or 0),
+                "successful_executions": row.successful_executions or 0,
+                "total_executions": row.total_executions or 0,
+                "rejected_total": (row.quick_adds_rejected_count or 0) + (row.generate_leads_rejected_count or 0),
+                "generated_leads": row.generated_leads or 0,
+            }
+            stats_row.update(SnapchatAccountStatisticsService._compute_score_rates(stats_row))
+            stats_rows.append(stats_row)
+            if row.snapchat_id != row.snap_account_id:
+                snapchat_id_updates.append({"id": row.account_id, "snapchat_id": row.snap_account_id})
+
+        try:
+            if stats_rows:
+                stmt = pg_insert(SnapchatAccountStats.__table__).values(stats_rows)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[SnapchatAccountStats.__table__.c.snapchat_account_id],
+                    set_={
+                        column: stmt.excluded[column]
+                        for column in stats_rows[0] if column != "snapchat_account_id"
+                    }
+                )
+                db.execute(stmt)
+            if snapchat_id_updates:
+                db.execute(update(SnapchatAccount), snapchat_id_updates)
+            db.commit()
+            StatisticsCache.invalidate([agency_id])
+        except Exception as e:
+            db.rollback()
+            message = f"Error on collecting statistics: {e}"
+            logger.error(message)
+            for stats_row in stats_rows:
+                results[stats_row["snapchat_account_id"]] = ComputeStatisticsResult(success=False, message=message)
+            return results
+
+        for stats_row in stats_rows:
+            results[stats_row["snapchat_account_id"]] = ComputeStatisticsResult(
+                success=True,
+                message="Statistics computed and stored successfully."
+            )
+        return results
+
     @staticmethod
     def get_user_statistics(db: Session, snapchat_account_id: int) -> dict:
         """
@@ -341,31 +520,115 @@ class SnapchatAccountStatisticsService:
                 message=f"An error occurred while retrieving statistics: {str(e)}",
             )
 
+    TIMELINE_EXCLUDED_EXECUTION_TYPES = ["STATUS_CHECK", "COMPUTE_STATISTICS"]
+    TIMELINE_STREAM_BATCH_SIZE = 1000
+
+    @staticmethod
+    def encode_timeline_cursor(start_time: datetime, account_execution_id: int) -> str:
+        return f"{start_time.isoformat()}|{account_execution_id}"
+
+    @staticmethod
+    def decode_timeline_cursor(cursor: str):
+        """
+        Parses a cursor produced by encode_timeline_cursor.
+
+        :raises ValueError: If the cursor is malformed.
+        """
+        start_time, _, account_execution_id = cursor.rpartition("|")
+        return datetime.fromisoformat(start_time), int(account_execution_id)
+
+    @staticmethod
+    def get_timeline_account(db: Session, snapchat_account_id: int, agency_id: Optional[int] = None):
+        query = db.query(SnapchatAccount).filter(SnapchatAccount.id == snapchat_account_id)
+        if agency_id is not None:
+            query = query.filter(SnapchatAccount.agency_id == agency_id)
+        snapchat_account = query.one_or_none()
+        if not snapchat_account:
+            raise ValueError(f"No Snapchat account found with ID {snapchat_account_id}")
+        return snapchat_account
+
+    @staticmethod
+    def _timeline_executions_query(db: Session, snapchat_account_id: int):
+        return (
+            db.query(AccountExecution.id, AccountExecution.type, AccountExecution.start_time)
+            .filter(
+                AccountExecution.snap_account_id == snapchat_account_id,
+                ~AccountExecution.type.in_(SnapchatAccountStatisticsService.TIMELINE_EXCLUDED_EXECUTION_TYPES)
+            )
+            .order_by(AccountExecution.start_time, AccountExecution.id)
+        )
+
     @staticmethod
-    def get_user_timeline_statistics(db: Session, snapchat_account_id: int):
+    def _timeline_archived_executions(db: Session, snapchat_account_id: int, after: Optional[tuple] = None) -> list:
+        """Archived account executions of the timeline (see ExecutionArchiveService), oldest first."""
+        return [
+            SimpleNamespace(**row)
+            for row in ExecutionArchiveService.read_account_executions(
+                db, snapchat_account_id,
+                excluded_types=SnapchatAccountStatisticsService.TIMELINE_EXCLUDED_EXECUTION_TYPES,
+                after=after,
+            )
+        ]
+
+    @staticmethod
+    def _timeline_status_logs_query(db: Session, snapchat_account_id: int):
+        return (
+            db.query(SnapchatAccountStatusLog.id, SnapchatAccountStatusLog.new_status,
+                     SnapchatAccountStatusLog.changed_at)
+            .filter(SnapchatAccountStatusLog.snapchat_account_id == snapchat_account_id)
+            .order_by(SnapchatAccountStatusLog.changed_at, SnapchatAccountStatusLog.id)
+        )
+
+    @staticmethod
+    def get_user_timeline_statistics(db: Session, snapchat_account_id: int, agency_id: Optional[int] = None,
+                                     limit: Optional[int] = None, after: Optional[Tuple[datetime, int]] = None):
         """
         Retrieves detailed statistics for a given Snapchat account.
 
+        Without a limit the whole timeline is returned. With a limit, account executions are
+        paginated by (start_time, id) and only the status changes that happened in the same
+        time slice are returned; pass the returned next_cursor, decoded with
+        decode_timeline_cursor, to fetch the following page.
+        Pages reaching before the archive boundary are read from the execution archive.
+
         :param db: Database session.
         :param snapchat_account_id: ID of the Snapchat account.
+        :param agency_id: Optional agency the account must belong to.
+        :param limit: Optional maximum number of account executions per page.
+        :param after: Optional (start_time, id) of the last account execution of the previous page.
         :return: SnapchatAccountStatisticsDTO containing account statistics.
         """
         # Fetch the Snapchat account
-        snapchat_account = db.query(SnapchatAccount).filter(SnapchatAccount.id == snapchat_account_id).one_or_none()
+        snapchat_account = SnapchatAccountStatisticsService.get_timeline_account(db, snapchat_account_id, agency_id)
 
-        if not snapchat_account:
-            raise ValueError(f"No Snapchat account found with ID {snapchat_account_id}")
+        executions_query = SnapchatAccountStatisticsService._timeline_executions_query(db, snapchat_account_id)
+        status_logs_query = SnapchatAccountStatisticsService._timeline_status_logs_query(db, snapchat_account_id)
+        next_cursor = None
+
+        if after:
+            after_start_time, after_id = after
+            executions_query = executions_query.filter(
+                tuple_(AccountExecution.start_time, AccountExecution.id) > tuple_(after_start_time, after_id)
+            )
+            status_logs_query = status_logs_query.filter(SnapchatAccountStatusLog.changed_at > after_start_time)
 
-        # Fetch account executions
-        account_executions = db.query(AccountExecution).filter(
-            AccountExecution.snap_account_id == snapchat_account_id,
-            ~AccountExecution.type.in_(["STATUS_CHECK", "COMPUTE_STATISTICS"])
-        ).all()
+        # Archived executions all precede the ones still in Postgres.
+        archived_executions = SnapchatAccountStatisticsService._timeline_archived_executions(
+            db, snapchat_account_id, after
+        )
 
-        # Fetch status change logs
-        status_logs = db.query(SnapchatAccountStatusLog).filter(
-            SnapchatAccountStatusLog.snapchat_account_id == snapchat_account_id
-        ).all()
+        if limit is not None:
+            account_executions = archived_executions[:limit + 1]
+            if len(account_executions) <= limit:
+                account_executions += executions_query.limit(limit + 1 - len(account_executions)).all()
+            if len(account_executions) > limit:
+                account_executions = account_executions[:limit]
+                last = account_executions[-1]
+                next_cursor = SnapchatAccountStatisticsService.encode_timeline_cursor(last.start_time, last.id)
+                status_logs_query = status_logs_query.filter(SnapchatAccountStatusLog.changed_at <= last.start_time)
+        else:
+            account_executions = archived_executions + executions_query.all()
+        status_logs = status_logs_query.all()
 
         # Map account executions to DTOs
         account_executions_dto = [
@@ -384,6 +647,108 @@ class SnapchatAccountStatisticsService:
             ingestion_date=snapchat_account.added_to_system_date,
             account_executions=account_executions_dto,
             status_changes=status_changes_dto,
+            next_cursor=next_cursor,
+        )
+
+    @staticmethod
+    def iter_user_timeline_events(db: Session, snapchat_account_id: int, agency_id: Optional[int] = None):
+        """
+        Yields an account's timeline as JSON-serializable events in chronological order.
+
+        The first event describes the account, followed by its account executions and status
+        changes merged by time. Both are read with server-side cursors in batches of
+        TIMELINE_STREAM_BATCH_SIZE, so memory use does not grow with the account's history
+        (archived executions, read from Parquet, are loaded up front).
+
+        :param db: Database session, kept open while iterating.
+        :param snapchat_account_id: ID of the Snapchat account.
+        :param agency_id: Optional agency the account must belong to.
+        :raises ValueError: If the account does not exist (raised on the first iteration).
+        """
+        snapchat_account = SnapchatAccountStatisticsService.get_timeline_account(db, snapchat_account_id, agency_id)
+        yield {
+            "event": "account",
+            "creation_date": snapchat_account.creation_date.isoformat(),
+            "ingestion_date": snapchat_account.added_to_system_date.isoformat(),
+        }
+
+        batch_size = SnapchatAccountStatisticsService.TIMELINE_STREAM_BATCH_SIZE
+        executions = (
+            (execution.start_time, 0, {
+                "event": "account_execution",
+                "type": execution.type.name,
+                "start_time": execution.start_time.isoformat(),
+            })
+            for execution in itertools.chain(
+                SnapchatAccountStatisticsService._timeline_archived_executions(db, snapchat_account_id),
+                SnapchatAccountStatisticsService._timeline_executions_query(db, snapchat_account_id)
+                .yield_per(batch_size),
+            )
+        )
+        status_changes = (
+            (log.changed_at, 1, {
+                "event": "status_change",
+                "new_status": log.new_status.name,
+                "changed_at": log.changed_at.isoformat(),
+            })
+            for log in SnapchatAccountStatisticsService._timeline_status_logs_query(db, snapchat_account_id)
+            .yield_per(batch_size)
+            if log.changed_at is not None
+        )
+        for _, _, event in heapq.merge(executions, status_changes, key=lambda item: item[:2]):
+            yield event
+
+    @staticmethod
+    def _cache_ttl(db: Session) -> Optional[float]:
+        """
+        Lifetime for cache entries loaded through this session: bounded by the replica lag
+        tolerance when it reads from the read replica, the caches' default otherwise.
+        """
+        return READ_REPLICA_MAX_LAG_SECONDS if db.info.get("read_replica") else None
+
+    STATISTICS_SUM_COLUMNS = (
+        "total_conversations", "chatbot_conversations", "conversations_charged", "cta_conversations",
+        "cta_shared_links", "conversions_from_cta_links", "total_conversions", "quick_ads_sent",
+        "total_executions", "successful_executions", "rejected_total", "generated_leads",
+    )
+
+    @staticmethod
+    def _statistics_sums() -> list:
+        return [
+            func.sum(getattr(SnapchatAccountStats, column)).label(column)
+            for column in SnapchatAccountStatisticsService.STATISTICS_SUM_COLUMNS
+        ]
+
+    @staticmethod
+    def _statistics_dto(row) -> SnapchatAccountStatsDTO:
+        return SnapchatAccountStatsDTO(**{
+            column: getattr(row, column) or 0 for column in SnapchatAccountStatisticsService.STATISTICS_SUM_COLUMNS
+        })
+
+    @staticmethod
+    def _overall_statistics_query(agency_id: int):
+        return (
+            select(*SnapchatAccountStatisticsService._statistics_sums())
+            .select_from(SnapchatAccountStats)
+            .join(SnapchatAccount, SnapchatAccount.id == SnapchatAccountStats.snapchat_account_id)
+            .where(SnapchatAccount.agency_id == agency_id)
+        )
+
+    @staticmethod
+    def _overall_statistics(aggregated_stats) -> SnapchatAccountStatsDTO:
+        # Check if there are any statistics
+        if not aggregated_stats or all(stat is None for stat in aggregated_stats):
+            return SnapchatAccountStatsDTO(
+                success=False,
+                message="No statistics found for any Snapchat accounts.",
+            )
+        return SnapchatAccountStatisticsService._statistics_dto(aggregated_stats)
+
+    @staticmethod
+    def _overall_statistics_error(e: Exception) -> SnapchatAccountStatsDTO:
+        return SnapchatAccountStatsDTO(
+            success=False,
+            message=f"An error occurred while retrieving overall statistics: {str(e)}",
         )
 
     @staticmethod
@@ -395,56 +760,96 @@ class SnapchatAccountStatisticsService:
         :param agency_id: ID of the agency to filter statistics.
         :return: A SnapchatAccountStatsDTO containing overall statistics.
         """
+        cached = StatisticsCache.get(StatisticsCache.OVERALL, agency_id)
+        if cached is not None:
+            return SnapchatAccountStatsDTO(**cached)
         try:
-            # Aggregate statistics for Snapchat accounts by joining with SnapchatAccount
-            aggregated_stats = (
-                db.query(
-                    func.sum(SnapchatAccountStats.total_conversations).label("total_conversations"),
-                    func.sum(SnapchatAccountStats.chatbot_conversations).label("chatbot_conversations"),
-                    func.sum(SnapchatAccountStats.conversations_charged).label("conversations_charged"),
-                    func.sum(SnapchatAccountStats.cta_conversations).label("cta_conversations"),
-                    func.sum(SnapchatAccountStats.cta_shared_links).label("cta_shared_links"),
-                    func.sum(SnapchatAccountStats.conversions_from_cta_links).label("conversions_from_cta_links"),
-                    func.sum(SnapchatAccountStats.total_conversions).label("total_conversions"),
-                    func.sum(SnapchatAccountStats.quick_ads_sent).label("quick_ads_sent"),
-                    func.sum(SnapchatAccountStats.total_executions).label("total_executions"),
-                    func.sum(SnapchatAccountStats.successful_executions).label("successful_executions"),
-                    func.sum(SnapchatAccountStats.rejected_total).label("rejected_total"),
-                    func.sum(SnapchatAccountStats.generated_leads).label("generated_leads")
-                )
-                .join(SnapchatAccount, SnapchatAccount.id == SnapchatAccountStats.snapchat_account_id)
-                .filter(SnapchatAccount.agency_id == agency_id)
-                .one()
-            )
+            aggregated_stats = db.execute(SnapchatAccountStatisticsService._overall_statistics_query(agency_id)).one()
+            statistics_dto = SnapchatAccountStatisticsService._overall_statistics(aggregated_stats)
+            if statistics_dto.success:
+                StatisticsCache.set(StatisticsCache.OVERALL, agency_id, statistics_dto.model_dump(),
+                                    SnapchatAccountStatisticsService._cache_ttl(db))
+            return statistics_dto
 
-            # Check if there are any statistics
-            if not aggregated_stats or all(stat is None for stat in aggregated_stats):
-                return SnapchatAccountStatsDTO(
-                    success=False,
-                    message="No statistics found for any Snapchat accounts.",
-                )
+        except Exception as e:
+            return SnapchatAccountStatisticsService._overall_statistics_error(e)
 
-            # Return aggregated statistics as a DTO
-            return SnapchatAccountStatsDTO(
-                total_conversations=aggregated_stats.total_conversations or 0,
-                chatbot_conversations=aggregated_stats.chatbot_conversations or 0,
-                conversations_charged=aggregated_stats.conversations_charged or 0,
-                cta_conversations=aggregated_stats.cta_conversations or 0,
-                cta_shared_links=aggregated_stats.cta_shared_links or 0,
-                conversions_from_cta_links=aggregated_stats.conversions_from_cta_links or 0,
-                total_conversions=aggregated_stats.total_conversions or 0,
-                quick_ads_sent=aggregated_stats.quick_ads_sent or 0,
-                total_executions=aggregated_stats.total_executions or 0,
-                successful_executions=aggregated_stats.successful_executions or 0,
-                rejected_total=aggregated_stats.rejected_total or 0,
-                generated_leads=aggregated_stats.generated_leads or 0
-            )
+    @staticmethod
+    async def get_overall_statistics_async(db: AsyncSession, agency_id: int) -> SnapchatAccountStatsDTO:
+        """
+        Async variant of get_overall_statistics for AsyncSession callers.
+        """
+        cached = await StatisticsCache.get_async(StatisticsCache.OVERALL, agency_id)
+        if cached is not None:
+            return SnapchatAccountStatsDTO(**cached)
+        try:
+            aggregated_stats = (
+                await db.execute(SnapchatAccountStatisticsService._overall_statistics_query(agency_id))
+            ).one()
+            statistics_dto = SnapchatAccountStatisticsService._overall_statistics(aggregated_stats)
+            if statistics_dto.success:
+                await StatisticsCache.set_async(StatisticsCache.OVERALL, agency_id, statistics_dto.model_dump(),
+                                                SnapchatAccountStatisticsService._cache_ttl(db))
+            return statistics_dto
 
         except Exception as e:
-            return SnapchatAccountStatsDTO(
-                success=False,
-                message=f"An error occurred while retrieving overall statistics: {str(e)}",
+            return SnapchatAccountStatisticsService._overall_statistics_error(e)
+
+    @staticmethod
+    def _statistics_by_model_query(agency_id: int):
+        return (
+            select(
+                SnapchatAccount.model_id,
+                Model.name.label("model_name"),  # Fetch model name
+                *SnapchatAccountStatisticsService._statistics_sums()
             )
+            .select_from(SnapchatAccountStats)
+            .join(SnapchatAccount, SnapchatAccountStats.snapchat_account_id == SnapchatAccount.id)
+            .where(SnapchatAccount.agency_id == agency_id)
+            .outerjoin(Model, Model.id == SnapchatAccount.model_id)  # Join with Model to get model name
+            .group_by(SnapchatAccount.model_id, Model.name)  # Group by model_id and model name
+        )
+
+    @staticmethod
+    def _model_statistics(aggregated_stats) -> Dict[int, dict]:
+        model_statistics = {}
+        for row in aggregated_stats:
+            model_id = row.model_id if row.model_id is not None else "Unknown"
+            model_name = row.model_name if row.model_name is not None else "Unknown"
+
+            model_statistics[model_id] = {
+                "model_name": model_name,
+                "statistics": SnapchatAccountStatisticsService._statistics_dto(row),
+            }
+        return model_statistics
+
+    @staticmethod
+    def _model_statistics_to_cache(model_statistics: Dict[int, dict]) -> list:
+        # Stored as a list of entries since JSON object keys would turn model IDs into strings.
+        return [
+            {
+                "model_id": model_id,
+                "model_name": entry["model_name"],
+                "statistics": entry["statistics"].model_dump(),
+            }
+            for model_id, entry in model_statistics.items()
+        ]
+
+    @staticmethod
+    def _model_statistics_from_cache(cached: list) -> Dict[int, dict]:
+        return {
+            entry["model_id"]: {
+                "model_name": entry["model_name"],
+                "statistics": SnapchatAccountStatsDTO(**entry["statistics"]),
+            }
+            for entry in cached
+        }
+
+    @staticmethod
+    def _model_statistics_error(e: Exception) -> dict:
+        return {
+            "error": f"An error occurred while retrieving overall statistics grouped by model: {str(e)}"
+        }
 
     @staticmethod
     def get_overall_statistics_grouped_by_model(db: Session, agency_id:int) -> Dict[int, ModelSnapchatAccountStatsDTO]:
@@ -452,82 +857,60 @@ class SnapchatAccountStatisticsService:
         Retrieves overall statistics for all users, grouped by model, including model names.
 
         :param db: Database session.
+        :param agency_id: ID of the agency to filter statistics.
         :return: A dictionary where keys are model IDs, and values contain model name and statistics.
         """
+        cached = StatisticsCache.get(StatisticsCache.GROUPED_BY_MODEL, agency_id)
+        if cached is not None:
+            return SnapchatAccountStatisticsService._model_statistics_from_cache(cached)
         try:
-            # Aggregate statistics grouped by model_id, including model name
-            aggregated_stats = (
-                db.query(
-                    SnapchatAccount.model_id,
-                    Model.name.label("model_name"),  # Fetch model name
-                    func.sum(SnapchatAccountStats.total_conversations).label("total_conversations"),
-                    func.sum(SnapchatAccountStats.chatbot_conversations).label("chatbot_conversations"),
-                    func.sum(SnapchatAccountStats.conversations_charged).label("conversations_charged"),
-                    func.sum(SnapchatAccountStats.cta_conversations).label("cta_conversations"),
-                    func.sum(SnapchatAccountStats.cta_shared_links).label("cta_shared_links"),
-                    func.sum(SnapchatAccountStats.conversions_from_cta_links).label("conversions_from_cta_links"),
-                    func.sum(SnapchatAccountStats.total_conversions).label("total_conversions"),
-                    func.sum(SnapchatAccountStats.quick_ads_sent).label("quick_ads_sent"),
-                    func.sum(SnapchatAccountStats.total_executions).label("total_executions"),
-                    func.sum(SnapchatAccountStats.successful_executions).label("successful_executions"),
-                    func.sum(SnapchatAccountStats.rejected_total).label("rejected_total"),
-                    func.sum(SnapchatAccountStats.generated_leads).label("generated_leads")
-                )
-                .join(SnapchatAccount, SnapchatAccountStats.snapchat_account_id == SnapchatAccount.id)
-                .filter(SnapchatAccount.agency_id == agency_id)
-                .outerjoin(Model, Model.id == SnapchatAccount.model_id)  # Join with Model to get model name
-                .group_by(SnapchatAccount.model_id, Model.name)  # Group by model_id and model name
-                .all()
+            model_statistics = SnapchatAccountStatisticsService._model_statistics(
+                db.execute(SnapchatAccountStatisticsService._statistics_by_model_query(agency_id)).all()
             )
-
-            # Prepare the result dictionary
-            model_statistics = {}
-
-            for row in aggregated_stats:
-                model_id = row.model_id if row.model_id is not None else "Unknown"
-                model_name = row.model_name if row.model_name is not None else "Unknown"
-
-                model_statistics[model_id] = {
-                    "model_name": model_name,
-                    "statistics": SnapchatAccountStatsDTO(
-                        total_conversations=row.total_conversations or 0,
-                        chatbot_conversations=row.chatbot_conversations or 0,
-                        conversations_charged=row.conversations_charged or 0,
-                        cta_conversations=row.cta_conversations or 0,
-                        cta_shared_links=row.cta_shared_links or 0,
-                        conversions_from_cta_links=row.conversions_from_cta_links or 0,
-                        total_conversions=row.total_conversions or 0,
-                        quick_ads_sent=row.quick_ads_sent or 0,
-                        total_executions=row.total_executions or 0,
-                        successful_executions=row.successful_executions or 0,
-                        rejected_total=row.rejected_total or 0,
-                        generated_leads=row.generated_leads or 0
-                    ),
-                }
-
+            StatisticsCache.set(StatisticsCache.GROUPED_BY_MODEL, agency_id,
+                                SnapchatAccountStatisticsService._model_statistics_to_cache(model_statistics),
+                                SnapchatAccountStatisticsService._cache_ttl(db))
             return model_statistics
 
         except Exception as e:
-            return {
-                "error": f"An error occurred while retrieving overall statistics grouped by model: {str(e)}"
-            }
+            return SnapchatAccountStatisticsService._model_statistics_error(e)
 
     @staticmethod
-    def get_accounts_by_status(db: Session) -> dict:
+    async def get_overall_statistics_grouped_by_model_async(
+            db: AsyncSession, agency_id: int
+    ) -> Dict[int, ModelSnapchatAccountStatsDTO]:
         """
-        Retrieves the count of Snapchat accounts grouped by status.
+        Async variant of get_overall_statistics_grouped_by_model for AsyncSession callers.
         """
-        results = (
-            db.query(
-                SnapchatAccount.status,
-                func.count(SnapchatAccount.id).label("count")
+        cached = await StatisticsCache.get_async(StatisticsCache.GROUPED_BY_MODEL, agency_id)
+        if cached is not None:
+            return SnapchatAccountStatisticsService._model_statistics_from_cache(cached)
+        try:
+            model_statistics = SnapchatAccountStatisticsService._model_statistics(
+                (await db.execute(SnapchatAccountStatisticsService._statistics_by_model_query(agency_id))).all()
             )
-            .group_by(SnapchatAccount.status)
-            .all()
+            await StatisticsCache.set_async(StatisticsCache.GROUPED_BY_MODEL, agency_id,
+                                            SnapchatAccountStatisticsService._model_statistics_to_cache(model_statistics),
+                                            SnapchatAccountStatisticsService._cache_ttl(db))
+            return model_statistics
+
+        except Exception as e:
+            return SnapchatAccountStatisticsService._model_statistics_error(e)
+
+    @staticmethod
+    def _accounts_by_status_query(agency_id: Optional[int]):
+        query = select(
+            AgencyAccountStatusCount.status,
+            func.sum(AgencyAccountStatusCount.accounts).label("count")
         )
+        if agency_id is not None:
+            query = query.where(AgencyAccountStatusCount.agency_id == agency_id)
+        return query.group_by(AgencyAccountStatusCount.status)
 
+    @staticmethod
+    def _accounts_by_status(results) -> dict:
         # Convert results to a dictionary: {status: count, ...}
-        status_counts = {status.value: count for status, count in results}
+        status_counts = {status.value: int(count) for status, count in results if count}
         total_accounts = sum(status_counts.values())
 
         return {
@@ -536,32 +919,64 @@ class SnapchatAccountStatisticsService:
         }
 
     @staticmethod
-    def get_average_time_for_all_statuses(db: Session, agency_id) -> Dict[str, str]:
+    def get_accounts_by_status(db: Session, agency_id: Optional[int] = None) -> dict:
         """
-        Calculates the average time spent in each status across all accounts filtered by agency.
+        Retrieves the count of Snapchat accounts grouped by status.
+
+        Reads the per-agency counters maintained by the account listeners instead of
+        counting snapchat_account rows.
 
         :param db: Database session.
-        :param agency_id: The agency id to filter accounts.
-        :return: A dictionary mapping status names to average time spent as timedeltas.
+        :param agency_id: Optional agency to restrict the counts to; all agencies if omitted.
+        """
+        results = db.execute(SnapchatAccountStatisticsService._accounts_by_status_query(agency_id)).all()
+        return SnapchatAccountStatisticsService._accounts_by_status(results)
+
+    @staticmethod
+    async def get_accounts_by_status_async(db: AsyncSession, agency_id: Optional[int] = None) -> dict:
+        """
+        Async variant of get_accounts_by_status for AsyncSession callers.
+        """
+        results = (await db.execute(SnapchatAccountStatisticsService._accounts_by_status_query(agency_id))).all()
+        return SnapchatAccountStatisticsService._accounts_by_status(results)
+
+    STATUS_COUNTERS_REBUILD_SQL = text("""
+            INSERT INTO agency_account_status_count (agency_id, status, accounts, completed_quick_add_accounts)
+            SELECT agency_id, status, COUNT(*), COUNT(*) FILTER (WHERE has_completed_quick_add)
+            FROM snapchat_account
+            WHERE agency_id IS NOT NULL AND status IS NOT NULL
+            GROUP BY agency_id, status
+        """)
+
+    @staticmethod
+    def rebuild_status_counters(db: Session) -> int:
+        """
+        Recomputes agency_account_status_count from snapchat_account.
+
+        Only needed to seed or repair the table; during normal operation the counters are
+        maintained by the account listeners.
+
+        :param db: Database session.
+        :return: The number of counter rows written.
         """
-        sql = text("""
-                SELECT
-                    current_status,
-                    AVG(EXTRACT(epoch FROM (next_changed_at - changed_at))) AS avg_seconds
-                FROM (
-                    SELECT
-                        sal.changed_at,
-                        sal.new_status AS current_status,
-                        LEAD(sal.changed_at) OVER (PARTITION BY sal.snapchat_account_id ORDER BY sal.changed_at) AS next_changed_at
-                    FROM snapchat_account_status_log sal
-                    JOIN snapchat_account sa ON sal.snapchat_account_id = sa.id
-                    WHERE sa.agency_id = :agency_id
-                ) sub
-                WHERE next_changed_at IS NOT NULL
-                GROUP BY current_status
-            """)
-
-        results = db.execute(sql, {"agency_id": agency_id}).fetchall()
+        db.execute(text("DELETE FROM agency_account_status_count"))
+        result = db.execute(SnapchatAccountStatisticsService.STATUS_COUNTERS_REBUILD_SQL)
+        db.commit()
+        return result.rowcount
+
+    AVERAGE_TIME_BY_STATUS_SQL = text("""
+            SELECT
+                si.status AS current_status,
+                AVG(EXTRACT(epoch FROM (si.exited_at - si.entered_at))) AS avg_seconds
+            FROM snapchat_account_status_interval si
+            JOIN snapchat_account sa ON si.snapchat_account_id = sa.id
+            WHERE sa.agency_id = :agency_id
+              AND si.exited_at IS NOT NULL
+            GROUP BY si.status
+        """)
+
+    @staticmethod
+    def _average_times_by_status(results) -> Dict[str, str]:
         avg_times = {}
 
         for row in results:
@@ -574,6 +989,76 @@ class SnapchatAccountStatisticsService:
 
         return avg_times
 
+    @staticmethod
+    def get_average_time_for_all_statuses(db: Session, agency_id) -> Dict[str, str]:
+        """
+        Calculates the average time spent in each status across all accounts filtered by agency.
+
+        :param db: Database session.
+        :param agency_id: The agency id to filter accounts.
+        :return: A dictionary mapping status names to average time spent as timedeltas.
+        """
+        results = db.execute(
+            SnapchatAccountStatisticsService.AVERAGE_TIME_BY_STATUS_SQL, {"agency_id": agency_id}
+        ).fetchall()
+        return SnapchatAccountStatisticsService._average_times_by_status(results)
+
+    @staticmethod
+    async def get_average_time_for_all_statuses_async(db: AsyncSession, agency_id) -> Dict[str, str]:
+        """
+        Async variant of get_average_time_for_all_statuses for AsyncSession callers.
+        """
+        results = (await db.execute(
+            SnapchatAccountStatisticsService.AVERAGE_TIME_BY_STATUS_SQL, {"agency_id": agency_id}
+        )).fetchall()
+        return SnapchatAccountStatisticsService._average_times_by_status(results)
+
+    # Each log entry opens an interval that the next entry of the same account closes.
+    STATUS_INTERVALS_REBUILD_SQL = text("""
+            INSERT INTO snapchat_account_status_interval (snapchat_account_id, status, entered_at, exited_at, is_first_exit)
+            SELECT
+                sal.snapchat_account_id,
+                sal.new_status,
+                sal.changed_at,
+                LEAD(sal.changed_at) OVER (PARTITION BY sal.snapchat_account_id ORDER BY sal.changed_at, sal.id),
+                FALSE
+            FROM snapchat_account_status_log sal
+            WHERE sal.changed_at IS NOT NULL
+        """)
+
+    # The history form of the first exit rule applied live by event_listeners.record_status_intervals.
+    FIRST_EXITS_REBUILD_SQL = text("""
+            UPDATE snapchat_account_status_interval si
+            SET is_first_exit = TRUE
+            FROM (
+                SELECT DISTINCT ON (si.snapchat_account_id) si.id
+                FROM snapchat_account_status_interval si
+                JOIN snapchat_account sa ON sa.id = si.snapchat_account_id
+                WHERE CAST(si.status AS text) <> ALL(:exit_from_statuses)
+                  AND si.entered_at > sa.added_to_system_date
+                ORDER BY si.snapchat_account_id, si.entered_at, si.id
+            ) first_exit
+            WHERE si.id = first_exit.id
+        """)
+
+    @staticmethod
+    def rebuild_status_intervals(db: Session) -> int:
+        """
+        Recomputes snapchat_account_status_interval from the full status log.
+
+        Only needed to seed or repair the table; during normal operation intervals are
+        opened and closed by the status change listener.
+
+        :param db: Database session.
+        :return: The number of intervals written.
+        """
+        db.execute(text("DELETE FROM snapchat_account_status_interval"))
+        result = db.execute(SnapchatAccountStatisticsService.STATUS_INTERVALS_REBUILD_SQL)
+        db.execute(SnapchatAccountStatisticsService.FIRST_EXITS_REBUILD_SQL,
+                   {"exit_from_statuses": [status.name for status in EXIT_FROM_STATUSES]})
+        db.commit()
+        return result.rowcount
+
     @staticmethod
     def format_timedelta_to_days_hours(td: timedelta) -> str:
         total_seconds = int(td.total_seconds())
@@ -588,40 +1073,32 @@ class SnapchatAccountStatisticsService:
 
         return ", ".join(parts) if parts else "0 hours"
 
-    @staticmethod
-    def get_average_time_by_source_for_status_exit(db: Session, agency_id: int) -> Dict[str, str]:
-        """
-        Calculates the average time for accounts from all sources to transition
-        out of RECENTLY_INGESTED or GOOD_STANDING statuses from account creation,
-        filtered by agency.
+    AVERAGE_TIME_BY_SOURCE_SQL = text("""
+        SELECT
+            sa.account_source,
+            AVG(EXTRACT(epoch FROM (si.entered_at - sa.added_to_system_date))) AS avg_seconds
+        FROM snapchat_account_status_interval si
+        JOIN snapchat_account sa ON si.snapchat_account_id = sa.id
+        WHERE sa.agency_id = :agency_id
+          AND si.is_first_exit
+        GROUP BY sa.account_source
+    """)
+
+    EXECUTION_COUNTS_BY_SOURCE_SQL = text("""
+        SELECT
+            sa.account_source,
+            COUNT(ae.id) AS execution_count
+        FROM snapchat_account_status_interval si
+        JOIN snapchat_account sa ON si.snapchat_account_id = sa.id
+        JOIN account_execution ae ON ae.snap_account_id = si.snapchat_account_id
+        WHERE sa.agency_id = :agency_id
+          AND si.is_first_exit
+          AND ae.start_time < si.entered_at
+        GROUP BY sa.account_source
+    """)
 
-        :param db: Database session.
-        :param agency_id: The agency id to filter accounts.
-        :return: A dictionary mapping each account source to average time (formatted as a timedelta).
-        """
-        sql = text("""
-            WITH first_exit AS (
-                SELECT
-                    sa.id AS account_id,
-                    sa.account_source,
-                    MIN(exit_log.changed_at) AS first_exit_time,
-                    sa.added_to_system_date
-                FROM snapchat_account sa
-                JOIN snapchat_account_status_log exit_log 
-                    ON sa.id = exit_log.snapchat_account_id
-                WHERE sa.agency_id = :agency_id
-                  AND exit_log.new_status NOT IN ('RECENTLY_INGESTED', 'GOOD_STANDING')
-                  AND exit_log.changed_at > sa.added_to_system_date
-                GROUP BY sa.id, sa.account_source, sa.added_to_system_date
-            )
-            SELECT
-                account_source,
-                AVG(EXTRACT(epoch FROM (first_exit_time - added_to_system_date))) AS avg_seconds
-            FROM first_exit
-            GROUP BY account_source
-        """)
-
-        results = db.execute(sql, {"agency_id": agency_id}).fetchall()
+    @staticmethod
+    def _average_times_by_source(results) -> Dict[str, str]:
         avg_times: Dict[str, Optional[timedelta]] = {}
 
         for row in results:
@@ -638,6 +1115,32 @@ class SnapchatAccountStatisticsService:
 
         return formatted
 
+    @staticmethod
+    def get_average_time_by_source_for_status_exit(db: Session, agency_id: int) -> Dict[str, str]:
+        """
+        Calculates the average time for accounts from all sources to transition
+        out of RECENTLY_INGESTED or GOOD_STANDING statuses from account creation,
+        filtered by agency.
+
+        :param db: Database session.
+        :param agency_id: The agency id to filter accounts.
+        :return: A dictionary mapping each account source to average time (formatted as a timedelta).
+        """
+        results = db.execute(
+            SnapchatAccountStatisticsService.AVERAGE_TIME_BY_SOURCE_SQL, {"agency_id": agency_id}
+        ).fetchall()
+        return SnapchatAccountStatisticsService._average_times_by_source(results)
+
+    @staticmethod
+    async def get_average_time_by_source_for_status_exit_async(db: AsyncSession, agency_id: int) -> Dict[str, str]:
+        """
+        Async variant of get_average_time_by_source_for_status_exit for AsyncSession callers.
+        """
+        results = (await db.execute(
+            SnapchatAccountStatisticsService.AVERAGE_TIME_BY_SOURCE_SQL, {"agency_id": agency_id}
+        )).fetchall()
+        return SnapchatAccountStatisticsService._average_times_by_source(results)
+
     @staticmethod
     def get_execution_counts_by_source_until_status_change(db: Session, agency_id: int) -> Dict[str, int]:
         """
@@ -648,33 +1151,86 @@ class SnapchatAccountStatisticsService:
         :param agency_id: The agency ID to filter accounts.
         :return: A dictionary mapping each account source to the number of executions.
         """
-        sql = text("""
-            WITH first_exit AS (
-                SELECT
-                    sa.id AS account_id,
-                    sa.account_source,
-                    MIN(exit_log.changed_at) AS first_exit_time
-                FROM snapchat_account sa
-                JOIN snapchat_account_status_log exit_log 
-                    ON sa.id = exit_log.snapchat_account_id
-                WHERE sa.agency_id = :agency_id
-                  AND exit_log.new_status NOT IN ('RECENTLY_INGESTED', 'GOOD_STANDING')
-                  AND exit_log.changed_at > sa.added_to_system_date
-                GROUP BY sa.id, sa.account_source
-            )
-            SELECT
-                fe.account_source,
-                COUNT(ae.id) AS execution_count
-            FROM account_execution ae
-            JOIN first_exit fe ON ae.snap_account_id = fe.account_id
-            WHERE ae.start_time < fe.first_exit_time
-            GROUP BY fe.account_source
-        """)
-
-        results = db.execute(sql, {"agency_id": agency_id}).fetchall()
+        results = db.execute(
+            SnapchatAccountStatisticsService.EXECUTION_COUNTS_BY_SOURCE_SQL, {"agency_id": agency_id}
+        ).fetchall()
         execution_counts = {str(row.account_source): row.execution_count for row in results}
         return execution_counts
 
+    @staticmethod
+    async def get_execution_counts_by_source_until_status_change_async(db: AsyncSession,
+                                                                       agency_id: int) -> Dict[str, int]:
+        """
+        Async variant of get_execution_counts_by_source_until_status_change for AsyncSession callers.
+        """
+        results = (await db.execute(
+            SnapchatAccountStatisticsService.EXECUTION_COUNTS_BY_SOURCE_SQL, {"agency_id": agency_id}
+        )).fetchall()
+        return {str(row.account_source): row.execution_count for row in results}
+
+    @staticmethod
+    def _score_metrics_query(agency_id: int):
+        return (
+            select(
+                SnapchatAccount.id,
+                SnapchatAccount.username,
+                SnapchatAccountStats.rejecting_rate,
+                SnapchatAccountStats.conversation_rate,
+                SnapchatAccountStats.conversion_rate,
+            )
+            .join(SnapchatAccountStats, SnapchatAccountStats.snapchat_account_id == SnapchatAccount.id)
+            .where(SnapchatAccount.agency_id == agency_id)
+        )
+
+    @staticmethod
+    def _score_metrics(rows) -> AgencyScoreMetrics:
+        return AgencyScoreMetrics(
+            account_ids=np.array([row.id for row in rows], dtype=np.int64),
+            usernames=[row.username for row in rows],
+            rates=np.array(
+                [(row.rejecting_rate or 0, row.conversation_rate or 0, row.conversion_rate or 0) for row in rows],
+                dtype=float
+            ).reshape(len(rows), 3),
+        )
+
+    @staticmethod
+    def _load_score_metrics(session: Session, agency_id: int) -> AgencyScoreMetrics:
+        rows = session.execute(SnapchatAccountStatisticsService._score_metrics_query(agency_id)).all()
+        return SnapchatAccountStatisticsService._score_metrics(rows)
+
+    @staticmethod
+    async def _load_score_metrics_async(session: AsyncSession, agency_id: int) -> AgencyScoreMetrics:
+        rows = (await session.execute(SnapchatAccountStatisticsService._score_metrics_query(agency_id))).all()
+        # Building the arrays is CPU work proportional to the agency's account count.
+        return await asyncio.to_thread(SnapchatAccountStatisticsService._score_metrics, rows)
+
+    @staticmethod
+    def _get_score_metrics(session: Session, agency_id: int) -> AgencyScoreMetrics:
+        """Returns the agency's score metrics from the in-process cache, loading them on a miss."""
+        return AccountScoreCache.get(
+            agency_id, lambda: SnapchatAccountStatisticsService._load_score_metrics(session, agency_id),
+            max_age_seconds=SnapchatAccountStatisticsService._cache_ttl(session),
+        )
+
+    @staticmethod
+    async def _get_score_metrics_async(session: AsyncSession, agency_id: int) -> AgencyScoreMetrics:
+        """Async variant of _get_score_metrics."""
+        return await AccountScoreCache.get_async(
+            agency_id, lambda: SnapchatAccountStatisticsService._load_score_metrics_async(session, agency_id),
+            max_age_seconds=SnapchatAccountStatisticsService._cache_ttl(session),
+        )
+
+    @staticmethod
+    def _top_account_ids(metrics: AgencyScoreMetrics, n: int, weight_rejecting_rate: float,
+                         weight_conversation_rate: float, weight_conversion_rate: float) -> List[int]:
+        scores = metrics.scores(weight_rejecting_rate, weight_conversation_rate, weight_conversion_rate)
+        return [int(account_id) for account_id in metrics.account_ids[metrics.ranking(scores)[:n]]]
+
+    @staticmethod
+    def _in_order(accounts: List[SnapchatAccount], account_ids: List[int]) -> List[SnapchatAccount]:
+        accounts_by_id = {account.id: account for account in accounts}
+        return [accounts_by_id[account_id] for account_id in account_ids if account_id in accounts_by_id]
+
     @staticmethod
     def select_top_n_snapchat_accounts_optimized(session: Session,
                                                  agency_id: int,
@@ -683,64 +1239,70 @@ class SnapchatAccountStatisticsService:
                                                  weight_conversation_rate: float,
                                                  weight_conversion_rate: float):
         """
-        Optimized selection of top n Snapchat accounts using database-level computations,
-        filtered by agency.
-        """
-        # Subquery to compute metrics, filtering by agency_id
-        metrics_subquery = session.query(
-            SnapchatAccountStats.id.label('stat_id'),
-            SnapchatAccount.id.label('account_id'),
-            func.coalesce(
-                SnapchatAccountStats.rejected_total /
-                func.nullif(
-                    SnapchatAccountStats.rejected_total + SnapchatAccountStats.quick_ads_sent + SnapchatAccountStats.generated_leads,
-                    0
-                ),
-                0
-            ).label('rejecting_rate'),
-            func.coalesce(
-                SnapchatAccountStats.total_conversations /
-                func.nullif(SnapchatAccountStats.quick_ads_sent, 0),
-                0
-            ).label('conversation_rate'),
-            func.coalesce(
-                SnapchatAccountStats.total_conversions /
-                func.nullif(SnapchatAccountStats.conversations_charged, 0),
-                0
-            ).label('conversion_rate')
-        ).join(SnapchatAccount).filter(SnapchatAccount.agency_id == agency_id).subquery()
-
-        # Aggregates for normalization
-        aggregates = session.query(
-            func.max(metrics_subquery.c.rejecting_rate).label('max_rejecting_rate'),
-            func.max(metrics_subquery.c.conversation_rate).label('max_conversation_rate'),
-            func.max(metrics_subquery.c.conversion_rate).label('max_conversion_rate')
-        ).one()
-
-        max_rejecting_rate = aggregates.max_rejecting_rate or 1
-        max_conversation_rate = aggregates.max_conversation_rate or 1
-        max_conversion_rate = aggregates.max_conversion_rate or 1
+        Selects the top n Snapchat accounts of an agency by weighted score.
 
-        # Final query with score calculation, ensuring the agency filter is applied
-        final_query = session.query(
-            SnapchatAccount,
-            (
-                    weight_rejecting_rate * (metrics_subquery.c.rejecting_rate / max_rejecting_rate) +
-                    weight_conversation_rate * (metrics_subquery.c.conversation_rate / max_conversation_rate) +
-                    weight_conversion_rate * (metrics_subquery.c.conversion_rate / max_conversion_rate)
-            ).label('score')
-        ).join(SnapchatAccountStats, SnapchatAccountStats.snapchat_account_id == SnapchatAccount.id
-               ).join(metrics_subquery, metrics_subquery.c.stat_id == SnapchatAccountStats.id
-                      ).filter(SnapchatAccount.agency_id == agency_id
-                               ).order_by(desc('score')).limit(n)
+        Scores are computed in memory from the cached per-agency score metrics; only the
+        selected accounts are loaded from the database.
+        """
+        metrics = SnapchatAccountStatisticsService._get_score_metrics(session, agency_id)
+        top_ids = SnapchatAccountStatisticsService._top_account_ids(
+            metrics, n, weight_rejecting_rate, weight_conversation_rate, weight_conversion_rate
+        )
+        if not top_ids:
+            return []
 
-        # Execute query and fetch results
-        results = final_query.all()
+        accounts = session.query(SnapchatAccount).filter(SnapchatAccount.id.in_(top_ids)).all()
+        return SnapchatAccountStatisticsService._in_order(accounts, top_ids)
 
-        # Extract SnapchatAccount objects
-        top_n_snapchat_accounts = [result.SnapchatAccount for result in results]
+    @staticmethod
+    async def select_top_n_snapchat_accounts_optimized_async(session: AsyncSession,
+                                                             agency_id: int,
+                                                             n: int,
+                                                             weight_rejecting_rate: float,
+                                                             weight_conversation_rate: float,
+                                                             weight_conversion_rate: float) -> List[SnapchatAccount]:
+        """
+        Async variant of select_top_n_snapchat_accounts_optimized for AsyncSession callers.
+        The scoring runs in a worker thread so it does not hold up the event loop.
+        """
+        metrics = await SnapchatAccountStatisticsService._get_score_metrics_async(session, agency_id)
+        top_ids = await asyncio.to_thread(
+            SnapchatAccountStatisticsService._top_account_ids,
+            metrics, n, weight_rejecting_rate, weight_conversation_rate, weight_conversion_rate
+        )
+        if not top_ids:
+            return []
+
+        accounts = (await session.execute(
+            select(SnapchatAccount)
+            # Relationships read by SnapchatAccountResponseV2; AsyncSession cannot lazy load them.
+            .options(
+                selectinload(SnapchatAccount.proxy),
+                selectinload(SnapchatAccount.device),
+                selectinload(SnapchatAccount.cookies),
+                selectinload(SnapchatAccount.model),
+                selectinload(SnapchatAccount.chat_bot),
+                selectinload(SnapchatAccount.workflow),
+            )
+            .where(SnapchatAccount.id.in_(top_ids))
+        )).scalars().all()
+        return SnapchatAccountStatisticsService._in_order(accounts, top_ids)
 
-        return top_n_snapchat_accounts
+    @staticmethod
+    def _accounts_with_scores(metrics: AgencyScoreMetrics, weight_rejecting_rate: float,
+                              weight_conversation_rate: float, weight_conversion_rate: float) -> List[dict]:
+        scores = metrics.scores(weight_rejecting_rate, weight_conversation_rate, weight_conversion_rate)
+        return [
+            {
+                "account_id": int(metrics.account_ids[index]),
+                "username": metrics.usernames[index],
+                "rejecting_rate": float(metrics.rates[index, 0]),
+                "conversation_rate": float(metrics.rates[index, 1]),
+                "conversion_rate": float(metrics.rates[index, 2]),
+                "score": float(scores[index])
+            }
+            for index in metrics.ranking(scores)
+        ]
 
     @staticmethod
     def get_all_snapchat_accounts_with_scores(session: Session,
@@ -752,6 +1314,9 @@ class SnapchatAccountStatisticsService:
         Retrieves all Snapchat accounts with their rejecting rate, conversation rate,
         total conversions, and computed score based on provided weights, filtered by agency.
 
+        The rates are read from the cached per-agency score metrics, so changing the weights
+        does not hit the database.
+
         :param session: Database session.
         :param agency_id: The agency ID to filter accounts.
         :param weight_rejecting_rate: Weight for rejecting rate.
@@ -759,118 +1324,192 @@ class SnapchatAccountStatisticsService:
         :param weight_conversion_rate: Weight for conversion rate.
         :return: A list of dictionaries with Snapchat account details and calculated scores.
         """
+        metrics = SnapchatAccountStatisticsService._get_score_metrics(session, agency_id)
+        return SnapchatAccountStatisticsService._accounts_with_scores(
+            metrics, weight_rejecting_rate, weight_conversation_rate, weight_conversion_rate
+        )
 
-        # Subquery to compute individual metrics per account, filtered by agency_id
-        metrics_subquery = session.query(
-            SnapchatAccountStats.id.label('stat_id'),
-            SnapchatAccount.id.label('account_id'),
-            SnapchatAccount.username.label('username'),  # Include username
-            func.coalesce(
-                SnapchatAccountStats.rejected_total /
-                func.nullif(
-                    SnapchatAccountStats.rejected_total + SnapchatAccountStats.quick_ads_sent + SnapchatAccountStats.generated_leads,
-                    0
-                ),
-                0
-            ).label('rejecting_rate'),
-            func.coalesce(
-                SnapchatAccountStats.total_conversations /
-                func.nullif(SnapchatAccountStats.quick_ads_sent, 0),
-                0
-            ).label('conversation_rate'),
-            func.coalesce(
-                SnapchatAccountStats.total_conversions /
-                func.nullif(SnapchatAccountStats.conversations_charged, 0),
-                0
-            ).label('conversion_rate')
-        ).join(SnapchatAccount).filter(SnapchatAccount.agency_id == agency_id).subquery()
-
-        # Aggregates for normalization
-        aggregates = session.query(
-            func.max(metrics_subquery.c.rejecting_rate).label('max_rejecting_rate'),
-            func.max(metrics_subquery.c.conversation_rate).label('max_conversation_rate'),
-            func.max(metrics_subquery.c.conversion_rate).label('max_conversion_rate')
-        ).one()
-
-        max_rejecting_rate = aggregates.max_rejecting_rate or 1
-        max_conversation_rate = aggregates.max_conversation_rate or 1
-        max_conversion_rate = aggregates.max_conversion_rate or 1
+    @staticmethod
+    async def get_all_snapchat_accounts_with_scores_async(session: AsyncSession,
+                                                          agency_id: int,
+                                                          weight_rejecting_rate: float,
+                                                          weight_conversation_rate: float,
+                                                          weight_conversion_rate: float) -> List[SnapchatAccountScoreDTO]:
+        """
+        Async variant of get_all_snapchat_accounts_with_scores for AsyncSession callers.
+        The scoring runs in a worker thread so it does not hold up the event loop.
+        """
+        metrics = await SnapchatAccountStatisticsService._get_score_metrics_async(session, agency_id)
+        return await asyncio.to_thread(
+            SnapchatAccountStatisticsService._accounts_with_scores,
+            metrics, weight_rejecting_rate, weight_conversation_rate, weight_conversion_rate
+        )
 
-        # Final query to retrieve accounts with their metrics and computed score, filtered by agency_id
-        final_query = session.query(
-            SnapchatAccount.id.label('account_id'),
-            SnapchatAccount.username.label('username'),
-            metrics_subquery.c.rejecting_rate,
-            metrics_subquery.c.conversation_rate,
-            metrics_subquery.c.conversion_rate,
-            (
-                    weight_rejecting_rate * (metrics_subquery.c.rejecting_rate / max_rejecting_rate) +
-                    weight_conversation_rate * (metrics_subquery.c.conversation_rate / max_conversation_rate) +
-                    weight_conversion_rate * (metrics_subquery.c.conversion_rate / max_conversion_rate)
-            ).label('score')
-        ).join(
-            SnapchatAccountStats, SnapchatAccountStats.snapchat_account_id == SnapchatAccount.id
-        ).join(
-            metrics_subquery, metrics_subquery.c.stat_id == SnapchatAccountStats.id
-        ).filter(SnapchatAccount.agency_id == agency_id
-                 ).order_by(desc('score'))
+    DAILY_STATS_EXECUTION_TYPES = (ExecutionTypeEnum.QUICK_ADDS, ExecutionTypeEnum.CONSUME_LEADS)
 
-        # Fetch results
-        results = final_query.all()
+    @staticmethod
+    def _daily_stats_queries(agency_id: int, days: int, today_start: datetime) -> tuple:
+        """Builds the (sent by day, accounts by day, today) SELECTs of get_daily_account_stats."""
+        execution_types = SnapchatAccountStatisticsService.DAILY_STATS_EXECUTION_TYPES
+        first_day = (datetime.utcnow() - timedelta(days=days)).date()
+
+        sent_by_day = (
+            select(AgencyDailyActivity.day, func.sum(AgencyDailyActivity.total_sent_requests))
+            .where(
+                AgencyDailyActivity.agency_id == agency_id,
+                AgencyDailyActivity.day >= first_day,
+                AgencyDailyActivity.day < today_start.date(),
+                AgencyDailyActivity.execution_type.in_(execution_types),
+            )
+            .group_by(AgencyDailyActivity.day)
+        )
+        # An account running both execution types on one day is counted once, as before.
+        accounts_by_day = (
+            select(
+                SnapchatAccountDailyActivity.day,
+                func.count(func.distinct(SnapchatAccountDailyActivity.snapchat_account_id))
+            )
+            .where(
+                SnapchatAccountDailyActivity.agency_id == agency_id,
+                SnapchatAccountDailyActivity.day >= first_day,
+                SnapchatAccountDailyActivity.day < today_start.date(),
+                SnapchatAccountDailyActivity.execution_type.in_(execution_types),
+            )
+            .group_by(SnapchatAccountDailyActivity.day)
+        )
+        today = (
+            select(
+                func.count(func.distinct(AccountExecution.snap_account_id)).label("accounts_ran"),
+                func.sum(AccountExecution.total_sent_requests).label("total_quick_ads_sent"),
+            )
+            .join(SnapchatAccount, SnapchatAccount.id == AccountExecution.snap_account_id)
+            .where(
+                AccountExecution.start_time >= today_start,
+                AccountExecution.type.in_(execution_types),
+                SnapchatAccount.agency_id == agency_id
+            )
+        )
+        return sent_by_day, accounts_by_day, today
 
-        # Convert query results to list of dictionaries
-        accounts_with_scores = [
-            {
-                "account_id": row.account_id,
-                "username": row.username,
-                "rejecting_rate": row.rejecting_rate or 0,
-                "conversation_rate": row.conversation_rate or 0,
-                "conversion_rate": row.conversion_rate or 0,
-                "score": row.score or 0
-            }
-            for row in results
+    @staticmethod
+    def _daily_stats(sent_by_day: dict, accounts_by_day: dict, today, today_start: datetime) -> List[DailyAccountStatsDTO]:
+        daily_stats = [
+            DailyAccountStatsDTO(
+                day=day,
+                accounts_ran=accounts_by_day.get(day, 0),
+                total_quick_ads_sent=sent_by_day.get(day) or 0,
+            )
+            for day in sorted(set(sent_by_day) | set(accounts_by_day))
         ]
-
-        return accounts_with_scores
+        if today.accounts_ran:
+            daily_stats.append(DailyAccountStatsDTO(
+                day=today_start.date(),
+                accounts_ran=today.accounts_ran,
+                total_quick_ads_sent=today.total_quick_ads_sent or 0,
+            ))
+        return daily_stats
 
     @staticmethod
     def get_daily_account_stats(session: Session, agency_id: int, days: int) -> List[DailyAccountStatsDTO]:
         """
         Fetches daily account statistics over a given number of days, filtered by agency.
 
+        Past days are read from the daily activity rollup; only today is aggregated live
+        from account_execution.
+
         Args:
             session (Session): SQLAlchemy session object.
             agency_id (int): Agency ID to filter accounts.
             days (int): Number of past days to fetch data for.
 
         Returns:
-            List[Tuple[datetime, int, int]]: A list of tuples containing:
-                - Day (datetime)
+            List[DailyAccountStatsDTO]: One entry per day with activity, ordered by day, containing:
+                - Day (date)
                 - Count of distinct accounts ran (int)
                 - Total quick ads sent (int)
         """
-        query = (
-            session.query(
-                func.date(AccountExecution.start_time).label("day"),
-                func.count(func.distinct(AccountExecution.snap_account_id)).label("accounts_ran"),
-                func.sum(
-                    cast(
-                        func.coalesce(AccountExecution.result.op("->>")("total_sent_requests"), "0"),
-                        Integer
-                    )
-                ).label("total_quick_ads_sent"),
-            )
-            .join(SnapchatAccount, SnapchatAccount.id == AccountExecution.snap_account_id)
-            .filter(
-                AccountExecution.start_time >= datetime.utcnow() - timedelta(days=days),
-                AccountExecution.type.in_([ExecutionTypeEnum.QUICK_ADDS, ExecutionTypeEnum.CONSUME_LEADS]),
-                SnapchatAccount.agency_id == agency_id
-            )
-            .group_by(func.date(AccountExecution.start_time))
-            .order_by(func.date(AccountExecution.start_time))
+        today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        sent_by_day, accounts_by_day, today = SnapchatAccountStatisticsService._daily_stats_queries(
+            agency_id, days, today_start
+        )
+        return SnapchatAccountStatisticsService._daily_stats(
+            dict(session.execute(sent_by_day).all()),
+            dict(session.execute(accounts_by_day).all()),
+            session.execute(today).one(),
+            today_start,
+        )
+
+    @staticmethod
+    async def get_daily_account_stats_async(session: AsyncSession, agency_id: int,
+                                            days: int) -> List[DailyAccountStatsDTO]:
+        """
+        Async variant of get_daily_account_stats for AsyncSession callers.
+        """
+        today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        sent_by_day, accounts_by_day, today = SnapchatAccountStatisticsService._daily_stats_queries(
+            agency_id, days, today_start
+        )
+        return SnapchatAccountStatisticsService._daily_stats(
+            dict((await session.execute(sent_by_day)).all()),
+            dict((await session.execute(accounts_by_day)).all()),
+            (await session.execute(today)).one(),
+            today_start,
         )
 
-        return query.all()
+    @staticmethod
+    def rebuild_daily_activity(db: Session, since: Optional[date] = None) -> int:
+        """
+        Recomputes the daily activity rollup and its per-account markers from account_execution.
+
+        Only needed to seed or repair the rollup; during normal operation the rows are
+        maintained incrementally when executions are written.
+
+        :param db: Database session.
+        :param since: Optional first day to rebuild; all history is rebuilt when omitted.
+        :return: The number of rollup rows written.
+        :raises ValueError: If the rebuilt days reach into archived months.
+        """
+        ExecutionArchiveService.check_hot_range(db, since, "Rebuilding the daily activity")
+        day_filter = "WHERE ae.start_time >= :since" if since is not None else ""
+        params = {"since": since} if since is not None else {}
+
+        if since is not None:
+            db.execute(text("DELETE FROM agency_daily_activity WHERE day >= :since"), params)
+            db.execute(text("DELETE FROM snapchat_account_daily_activity WHERE day >= :since"), params)
+        else:
+            db.execute(text("DELETE FROM agency_daily_activity"))
+            db.execute(text("DELETE FROM snapchat_account_daily_activity"))
+
+        db.execute(text(f"""
+            INSERT INTO snapchat_account_daily_activity (snapchat_account_id, day, execution_type, agency_id)
+            SELECT DISTINCT ae.snap_account_id, DATE(ae.start_time), ae.type, sa.agency_id
+            FROM account_execution ae
+            JOIN snapchat_account sa ON sa.id = ae.snap_account_id
+            {day_filter}
+        """), params)
+        result = db.execute(text(f"""
+            INSERT INTO agency_daily_activity (agency_id, day, execution_type, executions, accounts_ran, total_sent_requests)
+            SELECT
+                sa.agency_id,
+                DATE(ae.start_time),
+                ae.type,
+                COUNT(*),
+                COUNT(DISTINCT ae.snap_account_id),
+                COALESCE(SUM(ae.total_sent_requests), 0)
+            FROM account_execution ae
+            JOIN snapchat_account sa ON sa.id = ae.snap_account_id
+            {day_filter}
+            GROUP BY sa.agency_id, DATE(ae.start_time), ae.type
+        """), params)
+        db.commit()
+        return result.rowcount
+
+    @staticmethod
+    def _daily_chatbot_run_accounts_query(agency_id: int):
+        return select(AgencyAccountStatusCount.completed_quick_add_accounts).where(
+            AgencyAccountStatusCount.agency_id == agency_id,
+            AgencyAccountStatusCount.status == AccountStatusEnum.GOOD_STANDING,
+        )
 
     @staticmethod
     def count_daily_chatbot_run_accounts(
@@ -885,27 +1524,21 @@ class SnapchatAccountStatisticsService:
             agency_id (int): The agency ID to filter accounts.
 
         Returns:
-            int: Count of matching Snapchat accounts.
+            int: Count of good-standing accounts that completed at least one quick add,
+            read from the maintained status counters.
         """
-        query = db.query(func.count(SnapchatAccount.id))
-
-        statuses = [AccountStatusEnum.GOOD_STANDING]
-        query = query.filter(SnapchatAccount.status.in_(statuses))
-
-        # Filter by agency_id
-        query = query.filter(SnapchatAccount.agency_id == agency_id)
-
-        query = query.filter(
-            exists().where(
-                and_(
-                    AccountExecution.snap_account_id == SnapchatAccount.id,
-                    AccountExecution.type == ExecutionTypeEnum.QUICK_ADDS,
-                    AccountExecution.status == StatusEnum.DONE,
-                )
-            )
-        )
+        count = db.execute(SnapchatAccountStatisticsService._daily_chatbot_run_accounts_query(agency_id)).scalar()
+        return count or 0
 
-        return query.scalar()
+    @staticmethod
+    async def count_daily_chatbot_run_accounts_async(db: AsyncSession, agency_id: int) -> int:
+        """
+        Async variant of count_daily_chatbot_run_accounts for AsyncSession callers.
+        """
+        count = (
+            await db.execute(SnapchatAccountStatisticsService._daily_chatbot_run_accounts_query(agency_id))
+        ).scalar()
+        return count or 0
 
     @staticmethod
     def get_accounts_by_thresholds(
@@ -0,0 +1,190 @@
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import BinaryIO, Dict, List, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import select, Integer
+from sqlalchemy.orm import Session
+
+from app.schemas import SnapchatAccount
+from app.schemas.executions.account_execution import AccountExecution
+from app.schemas.snapchat_account_stats import SnapchatAccountStats
+from app.schemas.snapchat_account_status_interval import SnapchatAccountStatusInterval
+from app.services.execution_archive_service import ExecutionArchiveService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ExportDataset:
+    """
+    An exportable table: the mapped table it reads, the column linking it to an account,
+    its exportable columns (name -> (SQL expression, Arrow type)), its time column and
+    whether its older months are moved out by ExecutionArchiveService.
+    """
+    table: object
+    account_id_column: object
+    columns: Dict[str, tuple]
+    time_column: Optional[object] = None
+    archived: bool = False
+
+
+class StatisticsExportService:
+    """
+    Exports agency-scoped statistics to columnar files (Parquet or Arrow IPC).
+
+    Rows are streamed from the database in chunks of CHUNK_SIZE with yield_per and written
+    batch by batch, so memory use is bounded by the chunk size. Column projection and the
+    date range are applied in SQL.
+
+    Archived datasets only export the months still in Postgres: they start at the archive
+    boundary by default and refuse an earlier date_from.
+    """
+    CHUNK_SIZE = 10000
+    FORMATS = ("parquet", "arrow")
+
+    DATASETS: Dict[str, ExportDataset] = {
+        "account_stats": ExportDataset(
+            table=SnapchatAccountStats,
+            account_id_column=SnapchatAccountStats.snapchat_account_id,
+            columns={
+                "snapchat_account_id": (SnapchatAccountStats.snapchat_account_id, pa.int64()),
+                "username": (SnapchatAccount.username, pa.string()),
+                "model_id": (SnapchatAccount.model_id, pa.int64()),
+                "account_source": (SnapchatAccount.account_source, pa.string()),
+                "status": (SnapchatAccount.status, pa.string()),
+                **{
+                    column.name: (column, pa.int64())
+                    for column in SnapchatAccountStats.__table__.columns
+                    if column.name not in ("id", "snapchat_account_id") and isinstance(column.type, Integer)
+                },
+                "rejecting_rate": (SnapchatAccountStats.rejecting_rate, pa.float64()),
+                "conversation_rate": (SnapchatAccountStats.conversation_rate, pa.float64()),
+                "conversion_rate": (SnapchatAccountStats.conversion_rate, pa.float64()),
+            },
+        ),
+        "account_executions": ExportDataset(
+            table=AccountExecution,
+            account_id_column=AccountExecution.snap_account_id,
+            columns={
+                "id": (AccountExecution.id, pa.int64()),
+                "execution_id": (AccountExecution.execution_id, pa.int64()),
+                "snapchat_account_id": (AccountExecution.snap_account_id, pa.int64()),
+                "type": (AccountExecution.type, pa.string()),
+                "status": (AccountExecution.status, pa.string()),
+                "start_time": (AccountExecution.start_time, pa.timestamp("us")),
+                "end_time": (AccountExecution.end_time, pa.timestamp("us")),
+                "total_sent_requests": (AccountExecution.total_sent_requests, pa.int64()),
+                "rejected_count": (AccountExecution.rejected_count, pa.int64()),
+                "generated_leads": (AccountExecution.generated_leads, pa.int64()),
+                "conversations": (AccountExecution.conversations, pa.int64()),
+            },
+            time_column=AccountExecution.start_time,
+            archived=True,
+        ),
+        "status_intervals": ExportDataset(
+            table=SnapchatAccountStatusInterval,
+            account_id_column=SnapchatAccountStatusInterval.snapchat_account_id,
+            columns={
+                "snapchat_account_id": (SnapchatAccountStatusInterval.snapchat_account_id, pa.int64()),
+                "status": (SnapchatAccountStatusInterval.status, pa.string()),
+                "entered_at": (SnapchatAccountStatusInterval.entered_at, pa.timestamp("us")),
+                "exited_at": (SnapchatAccountStatusInterval.exited_at, pa.timestamp("us")),
+                "is_first_exit": (SnapchatAccountStatusInterval.is_first_exit, pa.bool_()),
+            },
+            time_column=SnapchatAccountStatusInterval.entered_at,
+        ),
+    }
+
+    @staticmethod
+    def _build_query(dataset_name: str, agency_id: int, columns: Optional[List[str]],
+                     date_from: Optional[datetime], date_to: Optional[datetime]):
+        dataset = StatisticsExportService.DATASETS.get(dataset_name)
+        if dataset is None:
+            raise ValueError(f"Unknown dataset '{dataset_name}'. "
+                             f"Available: {', '.join(StatisticsExportService.DATASETS)}")
+        available = dataset.columns
+        selected = columns or list(available)
+        unknown = [name for name in selected if name not in available]
+        if unknown:
+            raise ValueError(f"Unknown columns for '{dataset_name}': {', '.join(unknown)}")
+        if (date_from or date_to) and dataset.time_column is None:
+            raise ValueError(f"Dataset '{dataset_name}' does not support date filters.")
+
+        query = (
+            select(*(available[name][0].label(name) for name in selected))
+            .select_from(dataset.table)
+            .join(SnapchatAccount, SnapchatAccount.id == dataset.account_id_column)
+            .where(SnapchatAccount.agency_id == agency_id)
+        )
+        if date_from:
+            query = query.where(dataset.time_column >= date_from)
+        if date_to:
+            query = query.where(dataset.time_column < date_to)
+
+        schema = pa.schema([(name, available[name][1]) for name in selected])
+        return query, schema
+
+    @staticmethod
+    def export(
+            db: Session,
+            agency_id: int,
+            dataset_name: str,
+            sink: BinaryIO,
+            file_format: str = "parquet",
+            columns: Optional[List[str]] = None,
+            date_from: Optional[datetime] = None,
+            date_to: Optional[datetime] = None,
+    ) -> int:
+        """
+        Writes an agency-scoped dataset to the given binary sink.
+
+        :param db: Database session.
+        :param agency_id: The agency whose data is exported.
+        :param dataset_name: One of DATASETS ("account_stats", "account_executions", "status_intervals").
+        :param sink: Writable binary file object.
+        :param file_format: "parquet" or "arrow" (Arrow IPC stream).
+        :param columns: Optional subset of the dataset's columns, in output order.
+        :param date_from: Optional inclusive lower bound on the dataset's time column; for
+            archived datasets it defaults to the archive boundary.
+        :param date_to: Optional exclusive upper bound on the dataset's time column.
+        :return: The number of exported rows.
+        :raises ValueError: On an unknown dataset, column or format, or a date_from in archived months.
+        """
+        if file_format not in StatisticsExportService.FORMATS:
+            raise ValueError(f"Unknown format '{file_format}'. Available: {', '.join(StatisticsExportService.FORMATS)}")
+        dataset = StatisticsExportService.DATASETS.get(dataset_name)
+        if dataset is not None and dataset.archived:
+            if date_from is None:
+                date_from = ExecutionArchiveService.archive_boundary(db)
+            else:
+                ExecutionArchiveService.check_hot_range(db, date_from, f"Exporting '{dataset_name}'")
+        query, arrow_schema = StatisticsExportService._build_query(
+            dataset_name, agency_id, columns, date_from, date_to
+        )
+        if file_format == "parquet":
+            writer = pq.ParquetWriter(sink, arrow_schema)
+        else:
+            writer = pa.ipc.new_stream(sink, arrow_schema)
+
+        total_rows = 0
+        try:
+            result = db.execute(query.execution_options(yield_per=StatisticsExportService.CHUNK_SIZE))
+            for chunk in result.partitions():
+                arrays = [
+                    pa.array(
+                        [value.name if isinstance(value, Enum) else value for value in values],
+                        type=arrow_schema.field(index).type
+                    )
+                    for index, values in enumerate(zip(*chunk))
+                ]
+                writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=arrow_schema))
+                total_rows += len(chunk)
+        finally:
+            writer.close()
+
+        logger.info(f"Exported {total_rows} rows of '{dataset_name}' for agency {agency_id} as {file_format}.")
+        return total_rows
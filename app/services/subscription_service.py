@@ -1,23 +1,75 @@
 from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set
+from sqlalchemy import update
 from sqlalchemy.orm import Session # adjust import paths as needed
 
+from app.database import SessionLocal
 from app.dtos.subscription_create_request import SubscriptionCreateRequest
 from app.dtos.subscription_response import SubscriptionResponse
 from app.dtos.subscription_update_request import SubscriptionUpdateRequest
 from app.schemas import Agency
 from app.schemas.subscription import Subscription, SubscriptionStatus
+from app.utils.subscription_state_cache import SubscriptionStateCache
 
 
 class SubscriptionService:
+    """
+    Subscriptions are AVAILABLE until their turned_off_at passes; expire_due_subscriptions,
+    run every minute by the subscription expiry job, then moves them to EXPIRED, and only a
+    renewal or an update moves them back. The read paths (request guards, jobs, workflows)
+    never write: they look the state up in SubscriptionStateCache, to which every write
+    here publishes the agency's new state.
+    """
+
+    @staticmethod
+    def _state(status: SubscriptionStatus, turned_off_at: Optional[datetime]) -> dict:
+        return {"status": status.value, "turned_off_at": turned_off_at.isoformat() if turned_off_at else None}
+
+    @staticmethod
+    def load_subscription_states() -> Dict[int, dict]:
+        """Reads the state of every agency's subscription; the loader of SubscriptionStateCache."""
+        with SessionLocal() as db:
+            rows = db.query(Subscription.agency_id, Subscription.status, Subscription.turned_off_at).all()
+        return {row.agency_id: SubscriptionService._state(row.status, row.turned_off_at) for row in rows}
+
+    @staticmethod
+    def publish_subscription_states(db: Session, agency_ids: Iterable[int]) -> None:
+        """Publishes the committed state of the given agencies' subscriptions to every process."""
+        agency_ids = list(set(agency_ids))
+        if not agency_ids:
+            return
+        rows = db.query(Subscription.agency_id, Subscription.status, Subscription.turned_off_at).filter(
+            Subscription.agency_id.in_(agency_ids)
+        ).all()
+        states = {row.agency_id: SubscriptionService._state(row.status, row.turned_off_at) for row in rows}
+        for agency_id in agency_ids:
+            SubscriptionStateCache.publish(agency_id, states.get(agency_id))
+
+    @staticmethod
+    def get_subscription_state(agency_id: int) -> Optional[dict]:
+        """
+        Returns the agency's subscription as {"status", "turned_off_at" (ISO string or None)}
+        from the in-process SubscriptionStateCache, or None if the agency has none.
+        """
+        return SubscriptionStateCache.get(agency_id, SubscriptionService.load_subscription_states)
+
     @staticmethod
-    def is_subscription_available(db: Session, agency_id: int) -> bool:
+    def is_state_available(state: Optional[dict], now: Optional[datetime] = None) -> bool:
+        """
+        Whether a subscription state is available. A turned_off_at in the past counts as
+        expired even before the expiry job has flipped the status.
+        """
+        if state is None or state["status"] != SubscriptionStatus.AVAILABLE.value:
+            return False
+        now = now or datetime.utcnow()
+        return not state["turned_off_at"] or datetime.fromisoformat(state["turned_off_at"]) >= now
+
+    @staticmethod
+    def is_subscription_available(agency_id: int) -> bool:
         """
         Check if the subscription for the given agency_id is still available.
-        If the subscription's turned_off_at is in the past, update its status to EXPIRED and return False.
-        Otherwise, return True.
 
         Args:
-            db (Session): SQLAlchemy session.
             agency_id (int): The agency identifier.
 
         Returns:
@@ -26,19 +78,53 @@ class SubscriptionService:
         Raises:
             ValueError: If no subscription exists for the given agency.
         """
-        subscription = db.query(Subscription).filter(Subscription.agency_id == agency_id).first()
-        if subscription is None:
+        state = SubscriptionService.get_subscription_state(agency_id)
+        if state is None:
             raise ValueError(f"No subscription found for agency_id {agency_id}")
-        if Subscription.status ==SubscriptionStatus.EXPIRED:
-            return False
-        # Check if the subscription has expired.
-        if subscription.turned_off_at and subscription.turned_off_at < datetime.utcnow():
-            if subscription.status != SubscriptionStatus.EXPIRED:
-                subscription.status = SubscriptionStatus.EXPIRED
-                db.commit()
-            return False
+        return SubscriptionService.is_state_available(state)
 
-        return True
+    @staticmethod
+    def get_available_agency_ids(agency_ids: Iterable[int]) -> Set[int]:
+        """
+        Returns which of the given agencies have an available subscription; agencies without
+        a subscription are not available.
+
+        Args:
+            agency_ids (Iterable[int]): The agency identifiers.
+
+        Returns:
+            Set[int]: The agencies whose subscription is available.
+        """
+        now = datetime.utcnow()
+        return {
+            agency_id for agency_id in set(agency_ids)
+            if SubscriptionService.is_state_available(SubscriptionService.get_subscription_state(agency_id), now)
+        }
+
+    @staticmethod
+    def expire_due_subscriptions(db: Session) -> List[int]:
+        """
+        Moves every AVAILABLE subscription whose turned_off_at has passed to EXPIRED and
+        publishes the new states.
+
+        Args:
+            db (Session): SQLAlchemy session.
+
+        Returns:
+            List[int]: The agencies whose subscription expired.
+        """
+        expired = db.execute(
+            update(Subscription)
+            .where(
+                Subscription.turned_off_at < datetime.utcnow(),
+                Subscription.status != SubscriptionStatus.EXPIRED,
+            )
+            .values(status=SubscriptionStatus.EXPIRED)
+            .returning(Subscription.agency_id)
+        ).scalars().all()
+        db.commit()
+        SubscriptionService.publish_subscription_states(db, expired)
+        return expired
 
     @staticmethod
     def get_subscription_by_agency(db: Session, agency_id: int) -> Subscription:
@@ -74,6 +160,7 @@ class SubscriptionService:
             subscription.turned_off_at = subscription_data.turned_off_at
 
         db.commit()
+        SubscriptionService.publish_subscription_states(db, [agency_id])
         db.refresh(subscription)
         return subscription
 
@@ -103,6 +190,7 @@ class SubscriptionService:
         # 3) persist in db
         db.add(new_sub)
         db.commit()
+        SubscriptionService.publish_subscription_states(db, [agency_id])
         db.refresh(new_sub)
 
         # 4) Return the subscription
@@ -122,9 +210,10 @@ class SubscriptionService:
             raise ValueError(f"No subscription found for agency_id {agency_id}")
 
         if subscription.turned_off_at and subscription.turned_off_at < datetime.utcnow():
-            if subscription.status != SubscriptionStatus.EXPIRED.value:
-                subscription.status = SubscriptionStatus.EXPIRED.value
+            if subscription.status != SubscriptionStatus.EXPIRED:
+                subscription.status = SubscriptionStatus.EXPIRED
                 db.commit()
+                SubscriptionService.publish_subscription_states(db, [agency_id])
             return False
         return True
 
@@ -153,5 +242,6 @@ class SubscriptionService:
             sub.turned_off_at = None
         sub.status = SubscriptionStatus.AVAILABLE
         db.commit()
+        SubscriptionService.publish_subscription_states(db, [agency_id])
         db.refresh(sub)
         return sub
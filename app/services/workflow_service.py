@@ -1,16 +1,24 @@
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
 from fastapi import HTTPException, status
-from typing import List, Optional
+from typing import Dict, List, Optional
+import logging
 # from sqlalchemy.sql import func
 from app.dtos.workflow_dtos import WorkflowCreateRequest, WorkflowResponse, WorkflowSimplifiedResponse, \
     WorkflowUpdateRequest, WorkflowSimplifiedNameResponse
 from app.dtos.workflow_snapchat_account_response import WorkflowSnapchatAccountResponse
 from app.models.workflow_status_enum import WorkflowStatusEnum
+from app.models.workflow_step_type_enum import WorkflowStepTypeEnum
 from app.schemas import SnapchatAccount
 from app.schemas.workflow.workflow import Workflow
 from app.schemas.workflow.workflow_step import WorkflowStep
 from datetime import datetime, timedelta
-from sqlalchemy import func, desc, and_
+from sqlalchemy import func, desc, and_, or_, select, cast, String
+
+from app.services.snapchat_account_service import SnapchatAccountService
+from app.services.subscription_service import SubscriptionService
+
+logger = logging.getLogger(__name__)
 
 
 class WorkflowsService:
@@ -67,7 +75,43 @@ class WorkflowsService:
 
     @staticmethod
     def get_workflow(db: Session, workflow_id: int) -> WorkflowResponse:
-        workflow = db.query(Workflow).filter(Workflow.workflow_id == workflow_id).first()
+        workflow = db.query(Workflow).filter(Workflow.id == workflow_id).first()
+        if not workflow:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Workflow with ID {workflow_id} not found",
+            )
+        return WorkflowResponse.from_orm(workflow)
+
+    @staticmethod
+    async def list_workflows_async(db: AsyncSession, agency_id: int, name_filter: Optional[str] = None) -> List[Workflow]:
+        """
+        Async variant of list_workflows for AsyncSession callers.
+        """
+        query = select(Workflow).options(selectinload(Workflow.steps)).where(Workflow.agency_id == agency_id)
+        if name_filter:
+            query = query.where(Workflow.name.ilike(f"%{name_filter}%"))
+        return (await db.execute(query)).scalars().all()
+
+    @staticmethod
+    async def list_workflows_simplified_async(db: AsyncSession, agency_id: int) -> List[WorkflowSimplifiedNameResponse]:
+        """
+        Async variant of list_workflows_simplified for AsyncSession callers.
+        """
+        workflows = (await db.execute(select(Workflow.id, Workflow.name).where(Workflow.agency_id == agency_id))).all()
+        return [
+            WorkflowSimplifiedNameResponse(id=workflow.id, name=workflow.name)
+            for workflow in workflows
+        ]
+
+    @staticmethod
+    async def get_workflow_async(db: AsyncSession, workflow_id: int) -> WorkflowResponse:
+        """
+        Async variant of get_workflow for AsyncSession callers.
+        """
+        workflow = (await db.execute(
+            select(Workflow).options(selectinload(Workflow.steps)).where(Workflow.id == workflow_id)
+        )).scalars().first()
         if not workflow:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -216,3 +260,81 @@ class WorkflowsService:
             )
             for account, step in accounts_with_steps
         ]
+
+    @staticmethod
+    def apply_workflow_step(db: Session, step: WorkflowStep, now: datetime) -> int:
+        """
+        Applies a workflow step, with one UPDATE, to the workflow's accounts that were added
+        to the system exactly step.day_offset whole days before `now` and that the step
+        changes. Does not commit.
+
+        :param db: Database session.
+        :param step: The workflow step.
+        :param now: Reference time of the workflow run.
+        :return: The number of updated accounts.
+        :raises ValueError: If a CHANGE_STATUS step names an unknown status.
+        """
+        # (now - added_to_system_date).days == day_offset
+        condition = and_(
+            SnapchatAccount.workflow_id == step.workflow_id,
+            SnapchatAccount.added_to_system_date > now - timedelta(days=step.day_offset + 1),
+            SnapchatAccount.added_to_system_date <= now - timedelta(days=step.day_offset),
+        )
+        if step.action_type == WorkflowStepTypeEnum.CHANGE_STATUS:
+            return SnapchatAccountService.update_accounts_where(
+                db, and_(condition, cast(SnapchatAccount.status, String) != step.action_value),
+                status=step.action_value
+            )
+        if step.action_type == WorkflowStepTypeEnum.ADD_TAG:
+            return SnapchatAccountService.update_accounts_where(
+                db, and_(condition, or_(SnapchatAccount.tags.is_(None), ~SnapchatAccount.tags.any(step.action_value))),
+                tags_to_add=[step.action_value]
+            )
+        if step.action_type == WorkflowStepTypeEnum.REMOVE_TAG:
+            return SnapchatAccountService.update_accounts_where(
+                db, and_(condition, SnapchatAccount.tags.any(step.action_value)),
+                tags_to_remove=[step.action_value]
+            )
+        return 0
+
+    @staticmethod
+    def execute_workflows(db: Session, now: Optional[datetime] = None) -> Dict[int, int]:
+        """
+        Runs today's steps of every workflow whose agency has an available subscription.
+
+        Each step is one set-based UPDATE (see apply_workflow_step), applied in the
+        workflow's step order, so the run scales with the number of steps rather than the
+        number of accounts. Each workflow is committed on its own.
+
+        :param db: Database session.
+        :param now: Reference time of the run (default: now).
+        :return: {workflow id: number of account updates} for the workflows that ran.
+        """
+        now = now or datetime.now()
+        workflows = db.query(Workflow).options(selectinload(Workflow.steps)).all()
+        available_agencies = SubscriptionService.get_available_agency_ids(
+            [workflow.agency_id for workflow in workflows]
+        )
+
+        updates = {}
+        for workflow in workflows:
+            if workflow.agency_id not in available_agencies:
+                logger.info(f"[WORKFLOW_EXECUTION_JOB]* Workflow: {workflow.name} (ID: {workflow.id}) "
+                            f"was not executed because subscription is expired")
+                continue
+            updated = 0
+            try:
+                for step in sorted(workflow.steps, key=lambda step: (step.day_offset, step.id)):
+                    try:
+                        updated += WorkflowsService.apply_workflow_step(db, step, now)
+                    except ValueError as e:
+                        logger.error(f"[WORKFLOW_EXECUTION_JOB]* Skipping step {step.id} of workflow {workflow.id}: {e}")
+                db.commit()
+            except Exception as e:
+                logger.error(f"[WORKFLOW_EXECUTION_JOB]* Failed to process workflow {workflow.id}: {e}")
+                db.rollback()
+                continue
+            updates[workflow.id] = updated
+            logger.info(f"[WORKFLOW_EXECUTION_JOB]* Successfully processed workflow: {workflow.name} "
+                        f"(ID: {workflow.id}), {updated} account update(s)")
+        return updates
@@ -0,0 +1,101 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+
+from app.utils.statistics_cache import StatisticsCache
+
+
+@dataclass
+class AgencyScoreMetrics:
+    """Score metrics of an agency's accounts as parallel arrays (one row per account with stats)."""
+    account_ids: np.ndarray
+    usernames: List[str]
+    # Columns: rejecting_rate, conversation_rate, conversion_rate
+    rates: np.ndarray
+
+    def scores(self, weight_rejecting_rate: float, weight_conversation_rate: float,
+               weight_conversion_rate: float) -> np.ndarray:
+        """Weighted sum of the rates, each normalized by its maximum across the agency."""
+        if not len(self.account_ids):
+            return np.zeros(0)
+        maxima = self.rates.max(axis=0)
+        maxima[maxima == 0] = 1
+        weights = np.array([weight_rejecting_rate, weight_conversation_rate, weight_conversion_rate], dtype=float)
+        return (self.rates / maxima) @ weights
+
+    def ranking(self, scores: np.ndarray) -> np.ndarray:
+        """Row indices ordered by descending score."""
+        return np.argsort(-scores, kind="stable")
+
+
+class AccountScoreCache:
+    """
+    In-process cache of AgencyScoreMetrics per agency.
+
+    Entries are reused while the agency's StatisticsCache generation is unchanged, so a
+    statistics run in any process invalidates them. If Redis is unavailable, entries fall
+    back to a short TTL.
+    """
+    FALLBACK_TTL_SECONDS = 30
+
+    _entries: Dict[int, tuple] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def get(agency_id: int, loader: Callable[[], AgencyScoreMetrics],
+            max_age_seconds: Optional[float] = None) -> AgencyScoreMetrics:
+        """
+        :param max_age_seconds: Optional lifetime of a newly loaded entry even while the
+            generation is unchanged, for loaders reading possibly stale data (a read replica).
+        """
+        generation = StatisticsCache.generation(agency_id)
+        metrics = AccountScoreCache._lookup(agency_id, generation)
+        if metrics is None:
+            loaded_at = time.monotonic()
+            metrics = loader()
+            AccountScoreCache._store(agency_id, generation, loaded_at, max_age_seconds, metrics)
+        return metrics
+
+    @staticmethod
+    async def get_async(agency_id: int, loader: Callable[[], Awaitable[AgencyScoreMetrics]],
+                        max_age_seconds: Optional[float] = None) -> AgencyScoreMetrics:
+        """Async variant of get; the loader is awaited."""
+        generation = await StatisticsCache.generation_async(agency_id)
+        metrics = AccountScoreCache._lookup(agency_id, generation)
+        if metrics is None:
+            loaded_at = time.monotonic()
+            metrics = await loader()
+            AccountScoreCache._store(agency_id, generation, loaded_at, max_age_seconds, metrics)
+        return metrics
+
+    @staticmethod
+    def _lookup(agency_id: int, generation: Optional[int]) -> Optional[AgencyScoreMetrics]:
+        entry = AccountScoreCache._entries.get(agency_id)
+        if entry is None:
+            return None
+        cached_generation, loaded_at, max_age, metrics = entry
+        age = time.monotonic() - loaded_at
+        if max_age is not None and age >= max_age:
+            return None
+        if generation is not None and cached_generation == generation:
+            return metrics
+        if generation is None and age < AccountScoreCache.FALLBACK_TTL_SECONDS:
+            return metrics
+        return None
+
+    @staticmethod
+    def _store(agency_id: int, generation: Optional[int], loaded_at: float, max_age_seconds: Optional[float],
+               metrics: AgencyScoreMetrics) -> None:
+        with AccountScoreCache._lock:
+            AccountScoreCache._entries[agency_id] = (generation, loaded_at, max_age_seconds, metrics)
+
+    @staticmethod
+    def invalidate(agency_id: Optional[int] = None) -> None:
+        with AccountScoreCache._lock:
+            if agency_id is None:
+                AccountScoreCache._entries.clear()
+            else:
+                AccountScoreCache._entries.pop(agency_id, None)
@@ -0,0 +1,153 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+
+class AuthCache:
+    """
+    Two-level cache of what the request guards look up on every call:
+
+    - USERS: username -> {"role", "agency_id"}
+    - API_KEYS: SHA-256 of the key -> {"service_name"} (active keys only)
+
+    Lookups go to a per-process LRU first (LOCAL_TTL_SECONDS), then to Redis (TTL_SECONDS),
+    then to the database. Misses are never cached. The admin and API key write paths call
+    invalidate(), which drops the Redis entry and this process's copy; other processes pick
+    the change up once their local copy expires. Redis errors never fail a request, they
+    only cost the database lookup. Subscription states live in SubscriptionStateCache.
+    """
+    REDIS_URL = os.getenv("AUTH_CACHE_REDIS_URL", "redis://localhost:6379/2")
+    TTL_SECONDS = int(os.getenv("AUTH_CACHE_TTL_SECONDS", "300"))
+    LOCAL_TTL_SECONDS = float(os.getenv("AUTH_CACHE_LOCAL_TTL_SECONDS", "5"))
+    LOCAL_MAX_ENTRIES = 10000
+
+    USERS = "user"
+    API_KEYS = "api_key"
+
+    _local: "OrderedDict[str, tuple]" = OrderedDict()
+    _lock = threading.Lock()
+    _redis: Optional[Redis] = None
+    _async_redis: Optional[AsyncRedis] = None
+
+    @staticmethod
+    def _client() -> Redis:
+        if AuthCache._redis is None:
+            AuthCache._redis = Redis.from_url(AuthCache.REDIS_URL, socket_connect_timeout=0.5, socket_timeout=0.5)
+        return AuthCache._redis
+
+    @staticmethod
+    def _async_client() -> AsyncRedis:
+        if AuthCache._async_redis is None:
+            AuthCache._async_redis = AsyncRedis.from_url(
+                AuthCache.REDIS_URL, socket_connect_timeout=0.5, socket_timeout=0.5
+            )
+        return AuthCache._async_redis
+
+    @staticmethod
+    def _key(section: str, key) -> str:
+        return f"auth:{section}:{key}"
+
+    @staticmethod
+    def api_key_hash(api_key: str) -> str:
+        """API keys are cached under their hash, so the plain keys never reach Redis."""
+        return hashlib.sha256(api_key.encode()).hexdigest()
+
+    @staticmethod
+    def _get_local(cache_key: str) -> Optional[dict]:
+        with AuthCache._lock:
+            entry = AuthCache._local.get(cache_key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del AuthCache._local[cache_key]
+                return None
+            AuthCache._local.move_to_end(cache_key)
+            return value
+
+    @staticmethod
+    def _set_local(cache_key: str, value: dict) -> None:
+        with AuthCache._lock:
+            AuthCache._local[cache_key] = (time.monotonic() + AuthCache.LOCAL_TTL_SECONDS, value)
+            AuthCache._local.move_to_end(cache_key)
+            while len(AuthCache._local) > AuthCache.LOCAL_MAX_ENTRIES:
+                AuthCache._local.popitem(last=False)
+
+    @staticmethod
+    def get(section: str, key) -> Optional[dict]:
+        """Returns the cached entry, or None on a miss or Redis error."""
+        cache_key = AuthCache._key(section, key)
+        value = AuthCache._get_local(cache_key)
+        if value is not None:
+            return value
+        try:
+            payload = AuthCache._client().get(cache_key)
+        except RedisError as e:
+            logger.warning(f"Auth cache read failed for {cache_key}: {e}")
+            return None
+        if payload is None:
+            return None
+        value = json.loads(payload)
+        AuthCache._set_local(cache_key, value)
+        return value
+
+    @staticmethod
+    async def get_async(section: str, key) -> Optional[dict]:
+        """Async variant of get, for the guards of async endpoints."""
+        cache_key = AuthCache._key(section, key)
+        value = AuthCache._get_local(cache_key)
+        if value is not None:
+            return value
+        try:
+            payload = await AuthCache._async_client().get(cache_key)
+        except RedisError as e:
+            logger.warning(f"Auth cache read failed for {cache_key}: {e}")
+            return None
+        if payload is None:
+            return None
+        value = json.loads(payload)
+        AuthCache._set_local(cache_key, value)
+        return value
+
+    @staticmethod
+    def set(section: str, key, value: dict) -> None:
+        cache_key = AuthCache._key(section, key)
+        AuthCache._set_local(cache_key, value)
+        try:
+            AuthCache._client().set(cache_key, json.dumps(value), ex=AuthCache.TTL_SECONDS)
+        except RedisError as e:
+            logger.warning(f"Auth cache write failed for {cache_key}: {e}")
+
+    @staticmethod
+    async def set_async(section: str, key, value: dict) -> None:
+        cache_key = AuthCache._key(section, key)
+        AuthCache._set_local(cache_key, value)
+        try:
+            await AuthCache._async_client().set(cache_key, json.dumps(value), ex=AuthCache.TTL_SECONDS)
+        except RedisError as e:
+            logger.warning(f"Auth cache write failed for {cache_key}: {e}")
+
+    @staticmethod
+    def invalidate(section: str, keys: Iterable) -> None:
+        """Drops the entries of the given keys (usernames or API key hashes)."""
+        cache_keys = [AuthCache._key(section, key) for key in keys if key is not None]
+        if not cache_keys:
+            return
+        with AuthCache._lock:
+            for cache_key in cache_keys:
+                AuthCache._local.pop(cache_key, None)
+        try:
+            AuthCache._client().delete(*cache_keys)
+        except RedisError as e:
+            logger.warning(f"Auth cache invalidation failed for keys {cache_keys}: {e}")
@@ -0,0 +1,60 @@
+import threading
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+
+class PoolMetrics:
+    """
+    Process-wide counters of how long connection checkouts wait on the pools.
+
+    Filled by the instrumented pool classes below, keyed by engine name
+    ("sync", "async"), and read by the admin db-pool-metrics endpoint.
+    """
+    _lock = threading.Lock()
+    _stats = {}
+
+    @staticmethod
+    def record(name: str, wait_seconds: float, timed_out: bool = False) -> None:
+        with PoolMetrics._lock:
+            stats = PoolMetrics._stats.setdefault(name, {
+                "checkouts": 0, "timeouts": 0, "total_wait_seconds": 0.0, "max_wait_seconds": 0.0,
+            })
+            stats["checkouts"] += 1
+            stats["timeouts"] += int(timed_out)
+            stats["total_wait_seconds"] += wait_seconds
+            stats["max_wait_seconds"] = max(stats["max_wait_seconds"], wait_seconds)
+
+    @staticmethod
+    def snapshot() -> dict:
+        with PoolMetrics._lock:
+            return {
+                name: {
+                    **stats,
+                    "avg_wait_seconds": stats["total_wait_seconds"] / stats["checkouts"] if stats["checkouts"] else 0.0,
+                }
+                for name, stats in PoolMetrics._stats.items()
+            }
+
+
+class _CheckoutTimingMixin:
+    metrics_name = "sync"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            PoolMetrics.record(self.metrics_name, time.perf_counter() - started, timed_out=True)
+            raise
+        PoolMetrics.record(self.metrics_name, time.perf_counter() - started)
+        return connection
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    metrics_name = "sync"
+
+
+class InstrumentedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    metrics_name = "async"
@@ -3,16 +3,19 @@ import string
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, Header, Path
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Optional
-from datetime import datetime
 
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.schemas import User
-from app.schemas.subscription import Subscription, SubscriptionStatus
+from app.schemas.subscription import SubscriptionStatus
 from app.schemas.user import UserRole
 from app.utils.jwt_handler import verify_token
 from app.services.api_key_service import APIKeyService
+from app.services.subscription_service import SubscriptionService
+from app.utils.auth_cache import AuthCache
 
 # Hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -38,7 +41,8 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 
 # 🔑 Extract & verify current user from JWT
-def get_current_user(token: str = Depends(oauth2_scheme)):
+# Async so that async endpoints do not spend a threadpool slot on it.
+async def get_current_user(token: str = Depends(oauth2_scheme)):
     payload = verify_token(token)
     if not payload:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
@@ -66,17 +70,50 @@ def get_agency_id(
     Ensures the user is part of the given agency.
     Allows GLOBAL_ADMIN to access all agencies.
     """
-    user = db.query(User).filter(User.username == current_user["sub"]).first()
+    username = current_user["sub"]
+    access = AuthCache.get(AuthCache.USERS, username)
+    if access is None:
+        access = _user_access(db.query(User.role, User.agency_id).filter(User.username == username).first())
+        if access is not None:
+            AuthCache.set(AuthCache.USERS, username, access)
+    return _check_agency_access(access, agency_id)
 
-    if not user:
+
+async def get_agency_id_async(
+    agency_id: int = Path(..., description="Agency ID from the URL"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Async variant of get_agency_id for async endpoints.
+    """
+    username = current_user["sub"]
+    access = await AuthCache.get_async(AuthCache.USERS, username)
+    if access is None:
+        result = await db.execute(select(User.role, User.agency_id).where(User.username == username))
+        access = _user_access(result.first())
+        if access is not None:
+            await AuthCache.set_async(AuthCache.USERS, username, access)
+    return _check_agency_access(access, agency_id)
+
+
+def _user_access(user) -> Optional[dict]:
+    """The cached part of a user: role and agency."""
+    if user is None:
+        return None
+    return {"role": user.role.value, "agency_id": user.agency_id}
+
+
+def _check_agency_access(access: Optional[dict], agency_id: int) -> int:
+    if not access:
         raise HTTPException(status_code=403, detail="Unauthorized access.")
 
     # ✅ Allow GLOBAL_ADMIN to access any agency
-    if user.role == UserRole.GLOBAL_ADMIN:
+    if access["role"] == UserRole.GLOBAL_ADMIN.value:
         return agency_id
 
     # ❌ Block regular users/admins from accessing other agencies
-    if user.agency_id != agency_id:
+    if access["agency_id"] != agency_id:
         raise HTTPException(status_code=403, detail="You do not belong to this agency.")
 
     return agency_id
@@ -93,10 +130,6 @@ def authenticate_user_or_api_key(
     Authenticates using either an API key or a JWT token.
     If both are missing, denies access.
     """
-    # ✅ Debugging logs
-    print(f"[DEBUG] Received x-api-key: {x_api_key}")
-    print(f"[DEBUG] Received Authorization: {authorization}")
-
     # ✅ Check API key authentication
     if x_api_key:
         service_name = APIKeyService.validate_api_key(x_api_key=x_api_key, db=db)
@@ -114,29 +147,50 @@ def authenticate_user_or_api_key(
     raise HTTPException(status_code=401, detail="Authentication required: provide either API key or Bearer token")
 
 
+async def authenticate_user_or_api_key_async(
+        db: AsyncSession = Depends(get_async_db),
+        x_api_key: Optional[str] = Header(None),
+        authorization: Optional[str] = Header(None)
+):
+    """
+    Async variant of authenticate_user_or_api_key for async endpoints.
+    """
+    if x_api_key:
+        service_name = await APIKeyService.validate_api_key_async(x_api_key=x_api_key, db=db)
+        if service_name:
+            return {"auth_type": "api_key", "service_name": service_name}
+
+    if authorization and authorization.startswith("Bearer "):
+        token = authorization.split("Bearer ")[1]
+        user_payload = verify_token(token)
+        if user_payload:
+            return {"auth_type": "jwt", "user": user_payload}
+
+    raise HTTPException(status_code=401, detail="Authentication required: provide either API key or Bearer token")
+
+
 def check_subscription_available(
         agency_id: int = Depends(get_agency_id),
-        db: Session = Depends(get_db)
 ):
     """
     Ensures the agency's subscription is still available.
     - Checks if the subscription exists.
     - Verifies that its status is AVAILABLE.
     - Verifies that the current time is before the subscription's turned_off_at time.
+
+    The state is looked up in memory; the subscription expiry job moves expired
+    subscriptions to EXPIRED. Returns the state ({"status", "turned_off_at"}).
     """
-    subscription = db.query(Subscription).filter(Subscription.agency_id == agency_id).first()
-    if not subscription:
+    state = SubscriptionService.get_subscription_state(agency_id)
+    if not state:
         raise HTTPException(status_code=404, detail="Subscription not found.")
 
     # Check that the subscription status is AVAILABLE
-    if subscription.status != SubscriptionStatus.AVAILABLE:
+    if state["status"] != SubscriptionStatus.AVAILABLE.value:
         raise HTTPException(status_code=402, detail="Subscription is not available.")
 
     # Check if the subscription has expired based on its turned_off_at value.
-    if subscription.turned_off_at and subscription.turned_off_at < datetime.utcnow():
-        if subscription.status != SubscriptionStatus.EXPIRED:
-            subscription.status = SubscriptionStatus.EXPIRED
-            db.commit()
+    if not SubscriptionService.is_state_available(state):
         raise HTTPException(status_code=402, detail="Subscription has expired.")
 
-    return subscription
+    return state
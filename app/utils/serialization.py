@@ -0,0 +1,54 @@
+from typing import Dict, Iterable, List, Mapping, Optional
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+
+class ListSerializer:
+    """
+    Validation and JSON rendering of list responses.
+
+    validate() converts all rows (ORM objects, result rows or dicts) in one pydantic-core call
+    instead of a from_orm per row. response() renders the validated DTOs straight to JSON
+    bytes; returning a Response makes FastAPI skip its own pass over the result (validation
+    against response_model, jsonable_encoder, json.dumps). Endpoints keep their response_model
+    for the OpenAPI schema.
+    """
+    _adapters: Dict[type, TypeAdapter] = {}
+
+    @staticmethod
+    def adapter(dto: type) -> TypeAdapter:
+        adapter = ListSerializer._adapters.get(dto)
+        if adapter is None:
+            adapter = ListSerializer._adapters[dto] = TypeAdapter(List[dto])
+        return adapter
+
+    @staticmethod
+    def validate(dto: type, items: Iterable) -> List[BaseModel]:
+        """
+        Validates ORM objects, result rows or dicts into DTOs in bulk.
+
+        :param dto: The item DTO class.
+        :param items: The items; attributes are read like from_orm does.
+        """
+        return ListSerializer.adapter(dto).validate_python(list(items), from_attributes=True)
+
+    @staticmethod
+    def construct(dto: type, rows: Iterable[Mapping]) -> List[BaseModel]:
+        """
+        Builds DTOs without validation, for rows whose values already have the DTO field
+        types (e.g. enums converted to their values). Only the given keys count as set.
+        """
+        return [dto.model_construct(**row) for row in rows]
+
+    @staticmethod
+    def response(
+            dto: type,
+            items: List[BaseModel],
+            exclude_unset: bool = False,
+            headers: Optional[Dict[str, str]] = None,
+            status_code: int = 200,
+    ) -> Response:
+        """Renders validated or constructed DTOs as a JSON list response."""
+        content = ListSerializer.adapter(dto).dump_json(items, by_alias=True, exclude_unset=exclude_unset)
+        return Response(content=content, status_code=status_code, headers=headers, media_type="application/json")
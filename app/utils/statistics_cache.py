@@ -0,0 +1,141 @@
+import json
+import logging
+import os
+from typing import Iterable, Optional
+
+from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+
+class StatisticsCache:
+    """
+    Redis cache for the agency-wide statistics DTOs.
+
+    Entries are keyed by agency and dropped whenever that agency's statistics rows (or the
+    account/model data they are grouped by) are written. The TTL is only a safety net for
+    writes that bypass invalidation. Redis errors never fail a request: reads fall back to
+    the database and failed invalidations expire with the TTL. The *_async variants are for
+    async endpoints, which must not block the event loop on Redis.
+    """
+    REDIS_URL = os.getenv("STATISTICS_CACHE_REDIS_URL", "redis://localhost:6379/1")
+    TTL_SECONDS = int(os.getenv("STATISTICS_CACHE_TTL_SECONDS", "900"))
+
+    OVERALL = "overall"
+    GROUPED_BY_MODEL = "grouped_by_model"
+    SECTIONS = (OVERALL, GROUPED_BY_MODEL)
+
+    _redis: Optional[Redis] = None
+    _async_redis: Optional[AsyncRedis] = None
+
+    @staticmethod
+    def _client() -> Redis:
+        if StatisticsCache._redis is None:
+            StatisticsCache._redis = Redis.from_url(
+                StatisticsCache.REDIS_URL, socket_connect_timeout=0.5, socket_timeout=0.5
+            )
+        return StatisticsCache._redis
+
+    @staticmethod
+    def _async_client() -> AsyncRedis:
+        if StatisticsCache._async_redis is None:
+            StatisticsCache._async_redis = AsyncRedis.from_url(
+                StatisticsCache.REDIS_URL, socket_connect_timeout=0.5, socket_timeout=0.5
+            )
+        return StatisticsCache._async_redis
+
+    @staticmethod
+    def _key(section: str, agency_id: int) -> str:
+        return f"statistics:{section}:agency:{agency_id}"
+
+    @staticmethod
+    def get(section: str, agency_id: int):
+        """Returns the cached JSON payload for the agency, or None on a miss or Redis error."""
+        try:
+            payload = StatisticsCache._client().get(StatisticsCache._key(section, agency_id))
+        except RedisError as e:
+            logger.warning(f"Statistics cache read failed for agency {agency_id}: {e}")
+            return None
+        return json.loads(payload) if payload is not None else None
+
+    @staticmethod
+    async def get_async(section: str, agency_id: int):
+        """Async variant of get."""
+        try:
+            payload = await StatisticsCache._async_client().get(StatisticsCache._key(section, agency_id))
+        except RedisError as e:
+            logger.warning(f"Statistics cache read failed for agency {agency_id}: {e}")
+            return None
+        return json.loads(payload) if payload is not None else None
+
+    @staticmethod
+    def _ttl(ttl_seconds: Optional[float]) -> int:
+        return StatisticsCache.TTL_SECONDS if ttl_seconds is None else max(1, int(ttl_seconds))
+
+    @staticmethod
+    def set(section: str, agency_id: int, payload, ttl_seconds: Optional[float] = None) -> None:
+        """
+        Caches the payload for TTL_SECONDS, or for ttl_seconds when it was read from a
+        source that may already be stale (a read replica).
+        """
+        try:
+            StatisticsCache._client().set(
+                StatisticsCache._key(section, agency_id), json.dumps(payload), ex=StatisticsCache._ttl(ttl_seconds)
+            )
+        except RedisError as e:
+            logger.warning(f"Statistics cache write failed for agency {agency_id}: {e}")
+
+    @staticmethod
+    async def set_async(section: str, agency_id: int, payload, ttl_seconds: Optional[float] = None) -> None:
+        """Async variant of set."""
+        try:
+            await StatisticsCache._async_client().set(
+                StatisticsCache._key(section, agency_id), json.dumps(payload), ex=StatisticsCache._ttl(ttl_seconds)
+            )
+        except RedisError as e:
+            logger.warning(f"Statistics cache write failed for agency {agency_id}: {e}")
+
+    @staticmethod
+    def generation(agency_id: int) -> Optional[int]:
+        """
+        Returns a counter that changes every time the agency's statistics are invalidated,
+        so in-process caches can tell whether their copy is still current. None if Redis is down.
+        """
+        try:
+            value = StatisticsCache._client().get(StatisticsCache._key("generation", agency_id))
+        except RedisError as e:
+            logger.warning(f"Statistics cache generation read failed for agency {agency_id}: {e}")
+            return None
+        return int(value) if value is not None else 0
+
+    @staticmethod
+    async def generation_async(agency_id: int) -> Optional[int]:
+        """Async variant of generation."""
+        try:
+            value = await StatisticsCache._async_client().get(StatisticsCache._key("generation", agency_id))
+        except RedisError as e:
+            logger.warning(f"Statistics cache generation read failed for agency {agency_id}: {e}")
+            return None
+        return int(value) if value is not None else 0
+
+    @staticmethod
+    def invalidate(agency_ids: Iterable[int]) -> None:
+        """Drops every cached statistics section of the given agencies."""
+        agency_ids = {agency_id for agency_id in agency_ids if agency_id is not None}
+        keys = [
+            StatisticsCache._key(section, agency_id)
+            for agency_id in agency_ids
+            for section in StatisticsCache.SECTIONS
+        ]
+        if not keys:
+            return
+        try:
+            pipeline = StatisticsCache._client().pipeline()
+            pipeline.delete(*keys)
+            for agency_id in agency_ids:
+                pipeline.incr(StatisticsCache._key("generation", agency_id))
+            pipeline.execute()
+        except RedisError as e:
+            logger.warning(f"Statistics cache invalidation failed for keys {keys}: {e}")
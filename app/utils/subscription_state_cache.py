@@ -0,0 +1,140 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from redis import Redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+
+class SubscriptionStateCache:
+    """
+    Per-process copy of every agency's subscription state, {agency_id: {"status", "turned_off_at"}}.
+
+    The copy is loaded in full on first use and reloaded every RELOAD_SECONDS. In between,
+    changes are pushed: SubscriptionService publishes an agency's new state on CHANNEL after
+    every write (the expiry job included) and a listener thread in each process applies it.
+    While Redis is unreachable the periodic reload bounds how stale a process gets.
+    """
+    REDIS_URL = os.getenv("SUBSCRIPTION_STATE_REDIS_URL", "redis://localhost:6379/2")
+    CHANNEL = "subscription-state"
+    RELOAD_SECONDS = float(os.getenv("SUBSCRIPTION_STATE_RELOAD_SECONDS", "60"))
+    RETRY_SECONDS = 5
+
+    _states: Dict[int, dict] = {}
+    _loaded_at: Optional[float] = None
+    # agency_id -> (applied at, state) of the changes applied while a reload may be running
+    _applied: Dict[int, tuple] = {}
+    _lock = threading.Lock()
+    _reload_lock = threading.Lock()
+    _listener_pid: Optional[int] = None
+    _redis: Optional[Redis] = None
+
+    @staticmethod
+    def _client() -> Redis:
+        if SubscriptionStateCache._redis is None:
+            SubscriptionStateCache._redis = Redis.from_url(
+                SubscriptionStateCache.REDIS_URL, socket_connect_timeout=0.5, socket_timeout=0.5
+            )
+        return SubscriptionStateCache._redis
+
+    @staticmethod
+    def get(agency_id: int, loader: Callable[[], Dict[int, dict]]) -> Optional[dict]:
+        """
+        Returns the agency's state, or None if it has no subscription.
+
+        :param loader: Returns the states of all agencies; called on first use and every
+            RELOAD_SECONDS, by one thread at a time.
+        """
+        SubscriptionStateCache._ensure_listener()
+        loaded_at = SubscriptionStateCache._loaded_at
+        if loaded_at is None or time.monotonic() - loaded_at >= SubscriptionStateCache.RELOAD_SECONDS:
+            SubscriptionStateCache._reload(loader, wait=loaded_at is None)
+        return SubscriptionStateCache._states.get(agency_id)
+
+    @staticmethod
+    def _reload(loader: Callable[[], Dict[int, dict]], wait: bool) -> None:
+        # Other threads keep serving the current copy while one reloads it.
+        if not SubscriptionStateCache._reload_lock.acquire(blocking=wait):
+            return
+        try:
+            if wait and SubscriptionStateCache._loaded_at is not None:
+                return
+            started = time.monotonic()
+            states = loader()
+            with SubscriptionStateCache._lock:
+                # Changes pushed while the loader ran may be newer than what it read.
+                for agency_id, (applied_at, state) in SubscriptionStateCache._applied.items():
+                    if applied_at >= started:
+                        SubscriptionStateCache._set(states, agency_id, state)
+                SubscriptionStateCache._applied = {}
+                SubscriptionStateCache._states = states
+                SubscriptionStateCache._loaded_at = started
+        finally:
+            SubscriptionStateCache._reload_lock.release()
+
+    @staticmethod
+    def _set(states: Dict[int, dict], agency_id: int, state: Optional[dict]) -> None:
+        if state is None:
+            states.pop(agency_id, None)
+        else:
+            states[agency_id] = state
+
+    @staticmethod
+    def apply(agency_id: int, state: Optional[dict]) -> None:
+        """Updates this process's copy; None removes the agency."""
+        with SubscriptionStateCache._lock:
+            states = dict(SubscriptionStateCache._states)
+            SubscriptionStateCache._set(states, agency_id, state)
+            SubscriptionStateCache._states = states
+            SubscriptionStateCache._applied[agency_id] = (time.monotonic(), state)
+
+    @staticmethod
+    def publish(agency_id: int, state: Optional[dict]) -> None:
+        """Applies the agency's new state here and pushes it to every other process."""
+        SubscriptionStateCache.apply(agency_id, state)
+        try:
+            SubscriptionStateCache._client().publish(
+                SubscriptionStateCache.CHANNEL, json.dumps({"agency_id": agency_id, "state": state})
+            )
+        except RedisError as e:
+            logger.warning(f"Subscription state publish failed for agency {agency_id}: {e}")
+
+    @staticmethod
+    def _ensure_listener() -> None:
+        # Keyed by pid: forked workers do not inherit the parent's listener thread.
+        if SubscriptionStateCache._listener_pid == os.getpid():
+            return
+        with SubscriptionStateCache._lock:
+            if SubscriptionStateCache._listener_pid == os.getpid():
+                return
+            threading.Thread(
+                target=SubscriptionStateCache._listen, name="subscription-state-listener", daemon=True
+            ).start()
+            SubscriptionStateCache._listener_pid = os.getpid()
+
+    @staticmethod
+    def _listen() -> None:
+        connected_before = False
+        while True:
+            try:
+                pubsub = Redis.from_url(
+                    SubscriptionStateCache.REDIS_URL, socket_connect_timeout=0.5, health_check_interval=30
+                ).pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(SubscriptionStateCache.CHANNEL)
+                if connected_before:
+                    # Changes published while disconnected were missed.
+                    SubscriptionStateCache._loaded_at = None
+                connected_before = True
+                for message in pubsub.listen():
+                    payload = json.loads(message["data"])
+                    SubscriptionStateCache.apply(payload["agency_id"], payload["state"])
+            except RedisError as e:
+                logger.warning(f"Subscription state listener disconnected: {e}")
+            except Exception as e:
+                logger.error(f"Subscription state listener failed: {e}", exc_info=True)
+            time.sleep(SubscriptionStateCache.RETRY_SECONDS)
@@ -0,0 +1,177 @@
+"""
+Load-tests the read-heavy endpoints of a running API: for each endpoint and concurrency
+level, N clients issue requests back to back for a fixed duration, and the throughput and
+latency percentiles are written to a JSON report that can be compared between builds.
+
+Synchronous endpoints share Starlette's threadpool (40 threads by default), so their
+throughput flattens once the concurrency exceeds it while the requests wait on the
+database; async endpoints keep scaling until the connection pool or the CPU is the limit.
+
+Usage:
+    # against a build of the previous commit, then against the current one
+    python -m benchmarks.api_load_benchmark --base-url http://localhost:8001 --agency-id 1 --token $JWT \
+        --output reports/sync.json
+    python -m benchmarks.api_load_benchmark --base-url http://localhost:8001 --agency-id 1 --token $JWT \
+        --output reports/async.json --compare reports/sync.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import subprocess
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# name -> path below /agencies/{agency_id}
+ENDPOINTS: Dict[str, str] = {
+    "accounts": "/accounts/?page_size=50",
+    "accounts_offset": "/accounts/?page=1&page_size=50",
+    "accounts_lean": "/accounts/?page_size=50&fields=username,status,model,has_device,has_cookies",
+    "accounts_with_executions": "/accounts/?page_size=50&include_executions=true",
+    "executions": "/executions/?limit=20",
+    "statistics": "/statistics/",
+    "statistics_by_status": "/statistics/accounts-by-status",
+    "daily_stats": "/statistics/daily-stats?days=7",
+    "workflows": "/workflows/",
+    "jobs": "/jobs/",
+}
+
+CONCURRENCY_LEVELS = [1, 10, 50, 100, 200]
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+async def _run_level(client: httpx.AsyncClient, url: str, concurrency: int, duration: float) -> dict:
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                response = await client.get(url)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            if failed:
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    result = {"concurrency": concurrency, "requests": len(latencies), "errors": errors,
+              "requests_per_second": len(latencies) / elapsed}
+    if latencies:
+        latencies.sort()
+        result.update(
+            p50_ms=_percentile(latencies, 0.5) * 1000,
+            p95_ms=_percentile(latencies, 0.95) * 1000,
+            p99_ms=_percentile(latencies, 0.99) * 1000,
+            mean_ms=statistics.fmean(latencies) * 1000,
+        )
+    return result
+
+
+async def run_load_test(base_url: str, agency_id: int, headers: dict, levels: List[int], duration: float,
+                        only: Optional[List[str]] = None) -> Dict[str, list]:
+    results = {}
+    limits = httpx.Limits(max_connections=max(levels), max_keepalive_connections=max(levels))
+    async with httpx.AsyncClient(base_url=f"{base_url.rstrip('/')}/agencies/{agency_id}", headers=headers,
+                                 limits=limits, timeout=120) as client:
+        for name, path in ENDPOINTS.items():
+            if only and name not in only:
+                continue
+            # Warm up caches and connections before measuring.
+            await client.get(path)
+            results[name] = []
+            for concurrency in levels:
+                result = await _run_level(client, path, concurrency, duration)
+                results[name].append(result)
+                logger.info(f"{name} x{concurrency}: {result['requests_per_second']:.1f} req/s, "
+                            f"p95 {result.get('p95_ms', float('nan')):.1f} ms, {result['errors']} error(s)")
+    return results
+
+
+def compare(report: dict, baseline: dict) -> None:
+    print(f"{'endpoint':<28} {'clients':>8} {'baseline rps':>13} {'rps':>10} {'ratio':>7} "
+          f"{'baseline p95':>13} {'p95':>10}")
+    for name, levels in report["results"].items():
+        previous = {level["concurrency"]: level for level in baseline["results"].get(name, [])}
+        for level in levels:
+            before = previous.get(level["concurrency"])
+            if before is None:
+                continue
+            ratio = level["requests_per_second"] / before["requests_per_second"] \
+                if before["requests_per_second"] else float("inf")
+            print(f"{name:<28} {level['concurrency']:>8} {before['requests_per_second']:>13.1f} "
+                  f"{level['requests_per_second']:>10.1f} {ratio:>7.2f} "
+                  f"{before.get('p95_ms', float('nan')):>13.1f} {level.get('p95_ms', float('nan')):>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the read-heavy API endpoints.")
+    parser.add_argument("--base-url", default=os.getenv("LOAD_TEST_BASE_URL", "http://localhost:8001"))
+    parser.add_argument("--agency-id", type=int, required=True)
+    parser.add_argument("--token", default=os.getenv("LOAD_TEST_TOKEN"),
+                        help="JWT of a user of the agency (or LOAD_TEST_TOKEN).")
+    parser.add_argument("--concurrency", default=",".join(str(level) for level in CONCURRENCY_LEVELS),
+                        help="Comma separated numbers of concurrent clients.")
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds per endpoint and concurrency level.")
+    parser.add_argument("--only", default=None,
+                        help="Comma separated endpoint names to run (default: all of ENDPOINTS).")
+    parser.add_argument("--output", default="api_load_benchmark.json")
+    parser.add_argument("--compare", default=None, help="Baseline report to compare against.")
+    args = parser.parse_args()
+
+    if not args.token:
+        parser.error("--token (or LOAD_TEST_TOKEN) is required")
+    levels = [int(level) for level in args.concurrency.split(",") if level.strip()]
+    only = [name.strip() for name in args.only.split(",") if name.strip()] if args.only else None
+    if only and set(only) - set(ENDPOINTS):
+        parser.error(f"Unknown endpoint(s): {', '.join(sorted(set(only) - set(ENDPOINTS)))}")
+
+    results = asyncio.run(run_load_test(
+        args.base_url, args.agency_id, {"Authorization": f"Bearer {args.token}"}, levels, args.duration, only
+    ))
+    report = {
+        "generated_at": datetime.utcnow().isoformat(),
+        "git_commit": _git_commit(),
+        "base_url": args.base_url,
+        "duration_seconds": args.duration,
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    # httpx logs every request at INFO, which costs client CPU during the run.
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    main()
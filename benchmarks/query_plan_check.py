@@ -0,0 +1,203 @@
+"""
+Runs the read-only statistics benchmark cases and the hot account, execution, workflow and
+proxy lookups (LOOKUP_CASES) against a seeded database, EXPLAINs every SELECT they issue
+and fails if a plan falls back to a sequential scan on a large table, or if a case listed in
+EXPECTED_INDEXES stops using its indexes.
+
+By default the plans are taken with enable_seqscan off, so a Seq Scan in the plan means no
+index can serve the query at all, independently of how the seeded data is distributed.
+With --planner-defaults the plans the planner would actually pick are checked instead.
+
+Usage:
+    python -m benchmarks.query_plan_check --database-url postgresql+psycopg2://postgres@localhost:5433/bench
+"""
+import argparse
+import logging
+import os
+import sys
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List
+
+from sqlalchemy import create_engine, event, select, text
+from sqlalchemy.orm import Session, sessionmaker
+
+# The generated protobuf modules import each other as top-level modules (see app/main.py).
+protobuf_path = os.path.abspath("app/protos")
+if protobuf_path not in sys.path:
+    sys.path.append(protobuf_path)
+
+from app.models.account_status_enum import AccountStatusEnum
+from app.schemas.workflow.workflow import Workflow
+from app.schemas.workflow.workflow_step import WorkflowStep
+from app.services.job_executor_service import JobExecutorService
+from app.services.proxy_service import ProxyService
+from app.services.snapchat_account_service import SnapchatAccountService
+from app.services.workflow_service import WorkflowsService
+from app.utils.account_score_cache import AccountScoreCache
+from app.utils.statistics_cache import StatisticsCache
+from benchmarks.seed import SeedConfig
+from benchmarks.statistics_benchmark import CASES, BenchmarkCase, BenchmarkContext, _build_context
+
+logger = logging.getLogger(__name__)
+
+
+def _workflow_step(db: Session, ctx: BenchmarkContext) -> WorkflowStep:
+    step = db.execute(
+        select(WorkflowStep).join(Workflow).where(Workflow.agency_id == ctx.agency_id).order_by(WorkflowStep.id)
+    ).scalars().first()
+    if step is None:
+        raise SystemExit(f"Agency {ctx.agency_id} has no workflows; re-seed it with benchmarks.statistics_benchmark --seed.")
+    return step
+
+
+# The list and lookup queries outside the statistics service.
+# apply_workflow_step issues an UPDATE, but the session is never committed, so it is rolled back.
+LOOKUP_CASES: Dict[str, BenchmarkCase] = {
+    "accounts_v2_by_status": BenchmarkCase(lambda db, ctx: SnapchatAccountService.get_all_accountsV2(
+        db, ctx.agency_id, statuses=[AccountStatusEnum.LOCKED, AccountStatusEnum.CAPTCHA],
+        include_executions=True)),
+    "accounts_v2_keyset_page": BenchmarkCase(lambda db, ctx: SnapchatAccountService.get_all_accountsV2(
+        db, ctx.agency_id, after_id=ctx.account_ids_sample[-1])),
+    "executions_v3_page": BenchmarkCase(lambda db, ctx: JobExecutorService.get_executionsV3(
+        db, ctx.agency_id, limit=20, offset=100)),
+    "workflow_accounts": BenchmarkCase(lambda db, ctx: WorkflowsService.get_snapchat_accounts_with_last_executed_step(
+        db, _workflow_step(db, ctx).workflow_id)),
+    "apply_workflow_step": BenchmarkCase(lambda db, ctx: WorkflowsService.apply_workflow_step(
+        db, _workflow_step(db, ctx), datetime.now())),
+    "least_used_proxy": BenchmarkCase(lambda db, ctx: ProxyService.get_least_used_proxy(db, ctx.agency_id)),
+}
+
+# Indexes the plans of a case must use. Without them the planner often still avoids a Seq Scan
+# by reading a whole index (e.g. the primary key), which the Seq Scan check alone would miss.
+# The account list and workflow account pages are left out: the seed has a single agency, so
+# reading snapchat_account in primary key order is a legitimate plan for them.
+EXPECTED_INDEXES: Dict[str, tuple] = {
+    "get_overall_statistics_grouped_by_model": ("ix_snapchat_account_agency_status",),
+    "get_accounts_by_status": ("uq_agency_account_status_count",),
+    "executions_v3_page": ("ix_execution_agency_start_time",),
+    "apply_workflow_step": ("ix_snapchat_account_workflow",),
+    "least_used_proxy": ("ix_snapchat_account_proxy",),
+}
+
+# (case, table) pairs that legitimately read the whole table, with the reason.
+ALLOWED_SEQ_SCANS = {
+    ("get_accounts_by_thresholds", "snapchat_account_stats"): "not agency scoped, filters on every account's rates",
+    ("get_accounts_by_thresholds", "snapchat_account"): "not agency scoped, filters on every account's rates",
+}
+
+
+def _plan_nodes(node: dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+def _table_sizes(connection) -> Dict[str, float]:
+    rows = connection.execute(text(
+        "SELECT relname, reltuples FROM pg_class WHERE relkind IN ('r', 'p') "
+        "AND relnamespace = 'public'::regnamespace"
+    ))
+    return {name: reltuples for name, reltuples in rows}
+
+
+def _capture_selects(engine, run) -> List[tuple]:
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        run()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return statements
+
+
+def check_plans(engine, session_factory, ctx, min_rows: int, planner_defaults: bool, only=None) -> Dict[str, list]:
+    """
+    Returns {case name: [(problem, statement), ...]} for every unexpected sequential scan
+    and every expected index (EXPECTED_INDEXES) the case's plans do not use.
+    """
+    failures = defaultdict(list)
+    with engine.connect() as connection:
+        sizes = _table_sizes(connection)
+
+    for name, case in {**CASES, **LOOKUP_CASES}.items():
+        if case.writes or (only and only not in name):
+            continue
+        StatisticsCache.invalidate([ctx.agency_id])
+        AccountScoreCache.invalidate()
+
+        def run():
+            with session_factory() as db:
+                case.run(db, ctx)
+
+        statements = _capture_selects(engine, run)
+        used_indexes = set()
+        with engine.connect() as connection:
+            with connection.begin():
+                if not planner_defaults:
+                    connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+                for statement, parameters in statements:
+                    plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+                    for node in _plan_nodes(plan[0]["Plan"]):
+                        table = node.get("Relation Name")
+                        if node.get("Index Name"):
+                            used_indexes.add(node["Index Name"])
+                        if node["Node Type"] != "Seq Scan" or sizes.get(table, 0) < min_rows:
+                            continue
+                        if (name, table) in ALLOWED_SEQ_SCANS:
+                            continue
+                        failures[name].append((f"Seq Scan on {table}", statement))
+        for index in EXPECTED_INDEXES.get(name, ()):
+            if index not in used_indexes:
+                failures[name].append((f"{index} not used", None))
+        logger.info(f"{name}: {len(statements)} statement(s) explained, "
+                    f"{len(failures.get(name, []))} problem(s)")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fail on sequential scans and unused indexes in the statistics and lookup queries.")
+    parser.add_argument("--database-url", default=os.getenv("BENCHMARK_DATABASE_URL"),
+                        help="Seeded database to check (or BENCHMARK_DATABASE_URL); see benchmarks.statistics_benchmark.")
+    parser.add_argument("--agency-name", default=SeedConfig.agency_name)
+    parser.add_argument("--sample-size", type=int, default=1000)
+    parser.add_argument("--min-rows", type=int, default=10000,
+                        help="Ignore sequential scans on tables with fewer estimated rows.")
+    parser.add_argument("--planner-defaults", action="store_true",
+                        help="Check the plans the planner picks with its default settings.")
+    parser.add_argument("--only", default=None, help="Only check cases whose name contains this string.")
+    args = parser.parse_args()
+
+    if not args.database_url:
+        parser.error("--database-url (or BENCHMARK_DATABASE_URL) is required")
+    logging.getLogger("app.utils.statistics_cache").setLevel(logging.ERROR)
+
+    engine = create_engine(args.database_url, pool_size=2, max_overflow=0)
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+    with session_factory() as db:
+        agency_id = db.execute(text("SELECT id FROM agencies WHERE name = :name"),
+                               {"name": args.agency_name}).scalar()
+        if agency_id is None:
+            parser.error(f"Agency '{args.agency_name}' not found; seed it with benchmarks.statistics_benchmark --seed.")
+        ctx = _build_context(db, agency_id, args.sample_size)
+
+    failures = check_plans(engine, session_factory, ctx, args.min_rows, args.planner_defaults, args.only)
+    for name, scans in failures.items():
+        for problem, statement in scans:
+            print(f"{name}: {problem}")
+            if statement:
+                print(f"    {' '.join(statement.split())[:300]}")
+    if failures:
+        raise SystemExit(1)
+    print("No unexpected sequential scans, every expected index is used.")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    main()
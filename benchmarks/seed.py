@@ -0,0 +1,266 @@
+"""
+Seeds a benchmark database with a synthetic large tenant.
+
+Everything is generated server-side with generate_series, so tens of millions of rows
+take minutes rather than hours. The derived tables (execution rollups, daily activity,
+status intervals, status counters and account stats) are rebuilt afterwards, since the
+bulk inserts bypass the ORM listeners that normally maintain them.
+"""
+import logging
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.schemas import *  # noqa: F401,F403 - register every table before create_all
+from app.schemas.invitation_token import InvitationToken  # noqa: F401 - not exported by app.schemas
+from app.schemas.subscription import Subscription  # noqa: F401 - not exported by app.schemas
+from app.services.partition_service import PartitionService
+from app.services.snapchat_account_statistics_service import SnapchatAccountStatisticsService
+
+logger = logging.getLogger(__name__)
+
+EXECUTION_TYPES = ["QUICK_ADDS", "QUICK_ADDS", "QUICK_ADDS", "CONSUME_LEADS", "CONSUME_LEADS",
+                   "CHECK_CONVERSATIONS", "GENERATE_LEADS", "STATUS_CHECK", "COMPUTE_STATISTICS"]
+ACCOUNT_STATUSES = ["RECENTLY_INGESTED", "GOOD_STANDING", "GOOD_STANDING", "GOOD_STANDING", "LOCKED",
+                    "TERMINATED", "CAPTCHA", "TEMPORARY_LOCKED"]
+ACCOUNT_SOURCES = ["WEB", "IOS", "MANUAL", "EXTERNAL"]
+
+
+@dataclass
+class SeedConfig:
+    accounts: int = 100_000
+    executions: int = 10_000_000
+    status_changes_per_account: int = 5
+    models: int = 50
+    proxies: int = 500
+    workflows: int = 20
+    days: int = 365
+    batch_size: int = 1_000_000
+    agency_name: str = "benchmark-agency"
+
+
+def _timed(label: str, fn):
+    started = time.perf_counter()
+    result = fn()
+    logger.info(f"{label} done in {time.perf_counter() - started:.1f}s")
+    return result
+
+
+def seed(engine, config: SeedConfig) -> int:
+    """
+    Creates the schema if needed and seeds one agency with the configured volumes.
+
+    An existing agency with the same name is deleted first, so seeding is repeatable.
+
+    :return: The ID of the seeded agency.
+    """
+    Base.metadata.create_all(bind=engine)
+    logger.info(f"Seeding benchmark data: {asdict(config)}")
+
+    with Session(bind=engine) as db:
+        PartitionService.ensure_partitions(db, since=(datetime.utcnow() - timedelta(days=config.days)).date())
+        _delete_agency(db, config.agency_name)
+        agency_id = db.execute(
+            text("INSERT INTO agencies (name, created_at) VALUES (:name, now()) RETURNING id"),
+            {"name": config.agency_name}
+        ).scalar_one()
+
+        _timed("models", lambda: db.execute(text("""
+            INSERT INTO model (agency_id, name, onlyfans_url)
+            SELECT :agency_id, 'bench-model-' || g, 'https://example.com/' || g
+            FROM generate_series(1, :models) g
+        """), {"agency_id": agency_id, "models": config.models}))
+
+        _timed("proxies", lambda: db.execute(text("""
+            INSERT INTO proxy (agency_id, proxy_username, proxy_password, host, port)
+            SELECT :agency_id, 'bench_' || :agency_id || '_' || g, 'password', '10.0.0.1', '44444'
+            FROM generate_series(1, :proxies) g
+        """), {"agency_id": agency_id, "proxies": config.proxies}))
+
+        # One ADD_TAG step per workflow, a week after the account was added.
+        _timed("workflows", lambda: db.execute(text("""
+            WITH workflows AS (
+                INSERT INTO workflow (agency_id, status, name)
+                SELECT :agency_id, 'ACTIVE', 'bench-workflow-' || g
+                FROM generate_series(1, :workflows) g
+                RETURNING id
+            )
+            INSERT INTO workflowstep (workflow_id, day_offset, action_type, action_value)
+            SELECT id, 7, 'ADD_TAG', 'week-one' FROM workflows
+        """), {"agency_id": agency_id, "workflows": config.workflows}))
+
+        # 9 in 10 accounts get a proxy and 1 in 5 runs a workflow.
+        _timed("accounts", lambda: db.execute(text("""
+            WITH models AS (SELECT array_agg(id ORDER BY id) AS ids FROM model WHERE agency_id = :agency_id),
+                 proxies AS (SELECT array_agg(id ORDER BY id) AS ids FROM proxy WHERE agency_id = :agency_id),
+                 workflows AS (SELECT array_agg(id ORDER BY id) AS ids FROM workflow WHERE agency_id = :agency_id)
+            INSERT INTO snapchat_account (agency_id, username, password, snapchat_link, creation_date,
+                                          added_to_system_date, status, account_source, model_id, tags,
+                                          proxy_id, workflow_id)
+            SELECT
+                :agency_id,
+                'bench_' || :agency_id || '_' || g,
+                'password',
+                'https://snapchat.com/add/bench_' || g,
+                now() - random() * :days * interval '1 day' - interval '30 days',
+                now() - random() * :days * interval '1 day',
+                (CAST(:statuses AS text[]))[1 + floor(random() * cardinality(CAST(:statuses AS text[])))::int]::account_status_enum,
+                (CAST(:sources AS text[]))[1 + floor(random() * cardinality(CAST(:sources AS text[])))::int],
+                models.ids[1 + (g % cardinality(models.ids))],
+                ARRAY['bench', 'tag-' || (g % 10)],
+                CASE WHEN g % 10 <> 0 THEN proxies.ids[1 + (g % cardinality(proxies.ids))] END,
+                CASE WHEN g % 5 = 0 THEN workflows.ids[1 + (g / 5 % cardinality(workflows.ids))] END
+            FROM generate_series(1, :accounts) g, models, proxies, workflows
+        """), {"agency_id": agency_id, "accounts": config.accounts, "days": config.days,
+               "statuses": ACCOUNT_STATUSES, "sources": ACCOUNT_SOURCES}))
+        db.commit()
+
+        account_ids = db.execute(
+            text("SELECT array_agg(id ORDER BY id) FROM snapchat_account WHERE agency_id = :agency_id"),
+            {"agency_id": agency_id}
+        ).scalar_one()
+
+        for offset in range(0, config.executions, config.batch_size):
+            count = min(config.batch_size, config.executions - offset)
+            _timed(f"account executions {offset + count}/{config.executions}",
+                   lambda: _seed_executions(db, agency_id, account_ids, count, config.days))
+            db.commit()
+
+        _timed("status logs", lambda: db.execute(text("""
+            INSERT INTO snapchat_account_status_log (snapchat_account_id, old_status, new_status, changed_at)
+            SELECT
+                sa.id,
+                (CAST(:statuses AS text[]))[1 + floor(random() * cardinality(CAST(:statuses AS text[])))::int]::account_status_enum,
+                (CAST(:statuses AS text[]))[1 + floor(random() * cardinality(CAST(:statuses AS text[])))::int]::account_status_enum,
+                sa.added_to_system_date + n * random() * 5 * interval '1 day'
+            FROM snapchat_account sa, generate_series(1, :changes) n
+            WHERE sa.agency_id = :agency_id
+        """), {"agency_id": agency_id, "changes": config.status_changes_per_account, "statuses": ACCOUNT_STATUSES}))
+        db.commit()
+
+        _timed("execution rollups", lambda: SnapchatAccountStatisticsService.rebuild_execution_rollups(db))
+        _timed("daily activity", lambda: SnapchatAccountStatisticsService.rebuild_daily_activity(db))
+        _timed("status intervals", lambda: SnapchatAccountStatisticsService.rebuild_status_intervals(db))
+        _timed("quick-add flags", lambda: _seed_quick_add_flags(db, agency_id))
+        _timed("status counters", lambda: SnapchatAccountStatisticsService.rebuild_status_counters(db))
+        _timed("account stats", lambda: _seed_stats(db, agency_id))
+        db.commit()
+
+        _timed("analyze", lambda: db.execute(text("ANALYZE")))
+        db.commit()
+    return agency_id
+
+
+def _delete_agency(db: Session, agency_name: str):
+    agency_id = db.execute(text("SELECT id FROM agencies WHERE name = :name"), {"name": agency_name}).scalar()
+    if agency_id is None:
+        return
+    logger.info(f"Deleting previous benchmark agency {agency_id}")
+    params = {"agency_id": agency_id}
+    accounts = "SELECT id FROM snapchat_account WHERE agency_id = :agency_id"
+    for statement in (
+            f"DELETE FROM account_execution WHERE snap_account_id IN ({accounts})",
+            f"DELETE FROM snapchat_account_status_log WHERE snapchat_account_id IN ({accounts})",
+            "DELETE FROM execution WHERE agency_id = :agency_id",
+            "DELETE FROM agency_daily_activity WHERE agency_id = :agency_id",
+            "DELETE FROM snapchat_account WHERE agency_id = :agency_id",
+            "DELETE FROM model WHERE agency_id = :agency_id",
+            "DELETE FROM proxy WHERE agency_id = :agency_id",
+            "DELETE FROM workflow WHERE agency_id = :agency_id",
+            "DELETE FROM agencies WHERE id = :agency_id",
+    ):
+        db.execute(text(statement), params)
+    db.commit()
+
+
+def _seed_executions(db: Session, agency_id: int, account_ids: list, count: int, days: int):
+    # Group account executions under parent executions of 1000 accounts each.
+    parents = db.execute(text("""
+        INSERT INTO execution (agency_id, type, start_time, end_time, triggered_by, configuration, status)
+        SELECT :agency_id, 'QUICK_ADDS', now(), now(), 'benchmark', '{}', 'DONE'
+        FROM generate_series(1, :parents)
+        RETURNING id
+    """), {"agency_id": agency_id, "parents": (count + 999) // 1000}).scalars().all()
+
+    db.execute(text("""
+        INSERT INTO account_execution (type, execution_id, snap_account_id, status, result, message, start_time, end_time)
+        SELECT
+            e.type::executiontypeenum,
+            (CAST(:parents AS int[]))[1 + g / 1000],
+            (CAST(:account_ids AS int[]))[1 + floor(random() * cardinality(CAST(:account_ids AS int[])))::int],
+            e.status::statusenum,
+            jsonb_build_object(
+                'success', e.status = 'DONE',
+                'total_sent_requests', floor(random() * 100)::int,
+                'rejected_count', floor(random() * 10)::int,
+                'generated_leads', floor(random() * 20)::int,
+                'conversations', floor(random() * 50)::int
+            ),
+            NULL,
+            e.start_time,
+            e.start_time + interval '5 minutes'
+        FROM generate_series(0, :count - 1) g
+        CROSS JOIN LATERAL (
+            SELECT
+                (CAST(:types AS text[]))[1 + floor(random() * cardinality(CAST(:types AS text[])))::int] AS type,
+                CASE WHEN random() < 0.85 THEN 'DONE' ELSE 'FAILURE' END AS status,
+                now() - random() * :days * interval '1 day' AS start_time
+            WHERE g >= 0
+        ) e
+    """), {"parents": parents, "account_ids": account_ids, "count": count, "days": days, "types": EXECUTION_TYPES})
+
+
+def _seed_quick_add_flags(db: Session, agency_id: int):
+    db.execute(text("""
+        UPDATE snapchat_account sa
+        SET has_completed_quick_add = EXISTS (
+            SELECT 1 FROM account_execution ae
+            WHERE ae.snap_account_id = sa.id AND ae.type = 'QUICK_ADDS' AND ae.status = 'DONE'
+        )
+        WHERE sa.agency_id = :agency_id
+    """), {"agency_id": agency_id})
+
+
+def _seed_stats(db: Session, agency_id: int):
+    db.execute(text("""
+        DELETE FROM snapchat_account_stats
+        WHERE snapchat_account_id IN (SELECT id FROM snapchat_account WHERE agency_id = :agency_id)
+    """), {"agency_id": agency_id})
+    db.execute(text("""
+        INSERT INTO snapchat_account_stats (
+            snapchat_account_id, total_conversations, chatbot_conversations, conversations_charged,
+            cta_conversations, cta_shared_links, conversions_from_cta_links, total_conversions,
+            quick_ads_sent, total_executions, successful_executions, rejected_total, generated_leads,
+            rejecting_rate, conversation_rate, conversion_rate
+        )
+        SELECT
+            s.snapchat_account_id, s.total_conversations, s.chatbot_conversations, s.conversations_charged,
+            s.cta_conversations, s.cta_shared_links, s.conversions_from_cta_links, s.total_conversions,
+            s.quick_ads_sent, s.total_executions, s.successful_executions, s.rejected_total, s.generated_leads,
+            COALESCE(s.rejected_total::float / NULLIF(s.rejected_total + s.quick_ads_sent + s.generated_leads, 0), 0),
+            COALESCE(s.total_conversations::float / NULLIF(s.quick_ads_sent, 0), 0),
+            COALESCE(s.total_conversions::float / NULLIF(s.conversations_charged, 0), 0)
+        FROM (
+            SELECT
+                r.snapchat_account_id,
+                r.last_conversations AS total_conversations,
+                floor(random() * 100)::int AS chatbot_conversations,
+                floor(random() * 50)::int AS conversations_charged,
+                floor(random() * 30)::int AS cta_conversations,
+                floor(random() * 20)::int AS cta_shared_links,
+                floor(random() * 10)::int AS conversions_from_cta_links,
+                floor(random() * 10)::int AS total_conversions,
+                r.quick_adds_sent_requests + r.consume_leads_sent_requests AS quick_ads_sent,
+                r.total_executions,
+                r.successful_executions,
+                r.quick_adds_rejected_count + r.generate_leads_rejected_count AS rejected_total,
+                r.generated_leads
+            FROM snapchat_account_execution_rollup r
+            JOIN snapchat_account sa ON sa.id = r.snapchat_account_id
+            WHERE sa.agency_id = :agency_id
+        ) s
+    """), {"agency_id": agency_id})
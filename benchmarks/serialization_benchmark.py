@@ -0,0 +1,126 @@
+"""
+Times the serialization of list responses: the previous path (from_orm per row, then
+FastAPI's response_model validation and JSONResponse) against ORJSONResponse and against
+ListSerializer (bulk validation or model_construct, rendered with dump_json).
+
+Runs in-process on synthetic objects, no database or server needed. The FastAPI path goes
+through fastapi.routing.serialize_response, so it matches what the router does per request.
+
+Usage:
+    python -m benchmarks.serialization_benchmark --rows 50,500,5000 --repeat 20
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Callable, Dict, List
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.dtos.account_execution_simple_response import AccountExecutionSimpleResponse
+from app.dtos.snapchat_account_response import SnapchatAccountResponseV2
+from app.utils.serialization import ListSerializer
+
+logger = logging.getLogger(__name__)
+
+
+def _accounts(rows: int) -> list:
+    now = datetime.utcnow()
+    proxy = SimpleNamespace(id=1, host="10.0.0.1", port="44444", proxy_username="user", proxy_password="secret")
+    model = SimpleNamespace(id=1, name="model", onlyfans_url="https://onlyfans.com/model")
+    chat_bot = SimpleNamespace(id=1, type="DEFAULT", token="token")
+    workflow = SimpleNamespace(id=1, name="workflow")
+    return [
+        SimpleNamespace(
+            id=index, username=f"user{index}", password="password", snapchat_link=f"https://snapchat.com/add/user{index}",
+            two_fa_secret=None, creation_date=now - timedelta(days=index % 365), added_to_system_date=now,
+            status="GOOD_STANDING", proxy=proxy, device=SimpleNamespace(id=index, data={"model": "Pixel 7"}),
+            cookies=SimpleNamespace(id=index, data={"session": "x" * 64}), model=model, chat_bot=chat_bot,
+            tags=["warm", "batch-3"], account_source="import", workflow=workflow, email=None, email_password=None,
+        )
+        for index in range(rows)
+    ]
+
+
+def _executions(rows: int) -> List[dict]:
+    now = datetime.utcnow()
+    return [
+        {"id": index, "status": "DONE", "message": "Quick adds sent", "start_time": now - timedelta(minutes=index),
+         "end_time": now}
+        for index in range(rows)
+    ]
+
+
+def _fastapi_path(dto: type, response_class) -> Callable[[list], bytes]:
+    """from_orm per row, then the response_model pass FastAPI runs on the returned list."""
+    field = create_model_field(name="Response", type_=List[dto], mode="serialization")
+    loop = asyncio.new_event_loop()
+
+    def run(items: list) -> bytes:
+        models = [dto.from_orm(item) for item in items]
+        content = loop.run_until_complete(serialize_response(field=field, response_content=models, is_coroutine=True))
+        return response_class(content).body
+    return run
+
+
+def _list_serializer_path(dto: type) -> Callable[[list], bytes]:
+    return lambda items: ListSerializer.response(dto, ListSerializer.validate(dto, items)).body
+
+
+def _construct_path(dto: type) -> Callable[[list], bytes]:
+    return lambda items: ListSerializer.response(dto, ListSerializer.construct(dto, items)).body
+
+
+def _cases() -> Dict[str, tuple]:
+    # name -> (data factory, {path name: path})
+    return {
+        "accounts": (_accounts, {
+            "from_orm+JSONResponse": _fastapi_path(SnapchatAccountResponseV2, JSONResponse),
+            "from_orm+ORJSONResponse": _fastapi_path(SnapchatAccountResponseV2, ORJSONResponse),
+            "ListSerializer.validate": _list_serializer_path(SnapchatAccountResponseV2),
+        }),
+        "account_executions": (_executions, {
+            "from_orm+JSONResponse": _fastapi_path(AccountExecutionSimpleResponse, JSONResponse),
+            "from_orm+ORJSONResponse": _fastapi_path(AccountExecutionSimpleResponse, ORJSONResponse),
+            "ListSerializer.validate": _list_serializer_path(AccountExecutionSimpleResponse),
+            "ListSerializer.construct": _construct_path(AccountExecutionSimpleResponse),
+        }),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark list response serialization.")
+    parser.add_argument("--rows", default="50,500,5000", help="Comma separated list sizes.")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.rows.split(",") if size.strip()]
+    print(f"{'case':<20} {'rows':>6} {'path':<26} {'median ms':>10} {'p95 ms':>9} {'speedup':>8}")
+    for name, (factory, paths) in _cases().items():
+        for size in sizes:
+            items = factory(size)
+            baseline = None
+            for path_name, run in paths.items():
+                for _ in range(args.warmup):
+                    run(items)
+                timings = []
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    run(items)
+                    timings.append((time.perf_counter() - started) * 1000)
+                timings.sort()
+                median = statistics.median(timings)
+                baseline = baseline or median
+                p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+                print(f"{name:<20} {size:>6} {path_name:<26} {median:>10.2f} {p95:>9.2f} {baseline / median:>7.2f}x")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    main()
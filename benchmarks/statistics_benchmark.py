@@ -0,0 +1,280 @@
+"""
+Times every public method of SnapchatAccountStatisticsService against a benchmark database
+and writes a JSON report that can be compared between commits.
+
+Usage:
+    # seed a local database (never point this at production) and run the benchmarks
+    python -m benchmarks.statistics_benchmark --database-url postgresql+psycopg2://postgres@localhost:5433/bench \
+        --seed --accounts 100000 --executions 10000000 --output reports/$(git rev-parse --short HEAD).json
+
+    # re-run on an already seeded database and compare against a previous report
+    python -m benchmarks.statistics_benchmark --database-url ... --output new.json --compare old.json
+"""
+import argparse
+import inspect
+import json
+import logging
+import os
+import statistics
+import subprocess
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker, Session
+
+from app.schemas import SnapchatAccount
+from app.services.snapchat_account_statistics_service import SnapchatAccountStatisticsService
+from app.utils.account_score_cache import AccountScoreCache
+from app.utils.statistics_cache import StatisticsCache
+from benchmarks.seed import SeedConfig, seed
+
+logger = logging.getLogger(__name__)
+
+Service = SnapchatAccountStatisticsService
+
+
+@dataclass
+class BenchmarkContext:
+    agency_id: int
+    account_id: int
+    account_ids_sample: list
+
+
+@dataclass
+class BenchmarkCase:
+    run: Callable[[Session, BenchmarkContext], object]
+    # Writes to the database; skipped unless --include-writes is given.
+    writes: bool = False
+
+
+WEIGHTS = dict(weight_rejecting_rate=-1.0, weight_conversation_rate=1.0, weight_conversion_rate=1.0)
+
+CASES: Dict[str, BenchmarkCase] = {
+    "get_user_statistics": BenchmarkCase(lambda db, ctx: Service.get_user_statistics(db, ctx.account_id)),
+    "get_timeline_account": BenchmarkCase(
+        lambda db, ctx: Service.get_timeline_account(db, ctx.account_id, ctx.agency_id)),
+    "get_user_timeline_statistics": BenchmarkCase(
+        lambda db, ctx: Service.get_user_timeline_statistics(db, ctx.account_id, ctx.agency_id)),
+    "iter_user_timeline_events": BenchmarkCase(
+        lambda db, ctx: sum(1 for _ in Service.iter_user_timeline_events(db, ctx.account_id, ctx.agency_id))),
+    "get_overall_statistics": BenchmarkCase(lambda db, ctx: Service.get_overall_statistics(db, ctx.agency_id)),
+    "get_overall_statistics_grouped_by_model": BenchmarkCase(
+        lambda db, ctx: Service.get_overall_statistics_grouped_by_model(db, ctx.agency_id)),
+    "get_accounts_by_status": BenchmarkCase(lambda db, ctx: Service.get_accounts_by_status(db, ctx.agency_id)),
+    "get_average_time_for_all_statuses": BenchmarkCase(
+        lambda db, ctx: Service.get_average_time_for_all_statuses(db, ctx.agency_id)),
+    "get_average_time_by_source_for_status_exit": BenchmarkCase(
+        lambda db, ctx: Service.get_average_time_by_source_for_status_exit(db, ctx.agency_id)),
+    "get_execution_counts_by_source_until_status_change": BenchmarkCase(
+        lambda db, ctx: Service.get_execution_counts_by_source_until_status_change(db, ctx.agency_id)),
+    "select_top_n_snapchat_accounts_optimized": BenchmarkCase(
+        lambda db, ctx: Service.select_top_n_snapchat_accounts_optimized(db, ctx.agency_id, 100, **WEIGHTS)),
+    "get_all_snapchat_accounts_with_scores": BenchmarkCase(
+        lambda db, ctx: Service.get_all_snapchat_accounts_with_scores(db, ctx.agency_id, **WEIGHTS)),
+    "get_daily_account_stats": BenchmarkCase(lambda db, ctx: Service.get_daily_account_stats(db, ctx.agency_id, 90)),
+    "count_daily_chatbot_run_accounts": BenchmarkCase(
+        lambda db, ctx: Service.count_daily_chatbot_run_accounts(db, ctx.agency_id)),
+    "get_accounts_by_thresholds": BenchmarkCase(
+        lambda db, ctx: Service.get_accounts_by_thresholds(db, 0.5, 0.0, 0.0)),
+    "compute_statistics": BenchmarkCase(
+        lambda db, ctx: Service.compute_statistics(db, db.get(SnapchatAccount, ctx.account_id), None), writes=True),
+    "compute_statistics_bulk": BenchmarkCase(
+        lambda db, ctx: Service.compute_statistics_bulk(db, ctx.agency_id, ctx.account_ids_sample), writes=True),
+    "rebuild_execution_rollups": BenchmarkCase(
+        lambda db, ctx: Service.rebuild_execution_rollups(db, ctx.account_ids_sample), writes=True),
+    "rebuild_daily_activity": BenchmarkCase(
+        lambda db, ctx: Service.rebuild_daily_activity(db, since=(datetime.utcnow() - timedelta(days=7)).date()),
+        writes=True),
+    "rebuild_status_intervals": BenchmarkCase(lambda db, ctx: Service.rebuild_status_intervals(db), writes=True),
+    "rebuild_status_counters": BenchmarkCase(lambda db, ctx: Service.rebuild_status_counters(db), writes=True),
+}
+
+# Public methods that are not worth timing; listed so new methods cannot be forgotten silently.
+NOT_BENCHMARKED = {
+    "format_timedelta_to_days_hours": "pure formatting helper",
+    "encode_timeline_cursor": "pure formatting helper",
+    "decode_timeline_cursor": "pure parsing helper",
+}
+
+
+def _public_methods():
+    # The *_async variants run the same statements as their sync counterparts; the API load
+    # benchmark times them end to end.
+    return sorted(
+        name for name, method in inspect.getmembers(SnapchatAccountStatisticsService, predicate=inspect.isfunction)
+        if not name.startswith("_") and not inspect.iscoroutinefunction(method)
+    )
+
+
+def _check_coverage():
+    missing = [name for name in _public_methods() if name not in CASES and name not in NOT_BENCHMARKED]
+    if missing:
+        raise SystemExit(f"No benchmark case for public method(s): {', '.join(missing)}. "
+                         f"Add them to CASES or NOT_BENCHMARKED in {__name__}.")
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _build_context(db: Session, agency_id: int, sample_size: int) -> BenchmarkContext:
+    # The account with the most executions is the worst case for per-account methods.
+    account_id = db.execute(text("""
+        SELECT r.snapchat_account_id
+        FROM snapchat_account_execution_rollup r
+        JOIN snapchat_account sa ON sa.id = r.snapchat_account_id
+        WHERE sa.agency_id = :agency_id
+        ORDER BY r.total_executions DESC
+        LIMIT 1
+    """), {"agency_id": agency_id}).scalar()
+    if account_id is None:
+        raise SystemExit(f"Agency {agency_id} has no accounts with executions; seed it first with --seed.")
+    sample = db.execute(
+        text("SELECT id FROM snapchat_account WHERE agency_id = :agency_id ORDER BY id LIMIT :limit"),
+        {"agency_id": agency_id, "limit": sample_size}
+    ).scalars().all()
+    return BenchmarkContext(agency_id=agency_id, account_id=account_id, account_ids_sample=list(sample))
+
+
+def _volumes(db: Session, agency_id: int) -> dict:
+    params = {"agency_id": agency_id}
+    accounts = "SELECT id FROM snapchat_account WHERE agency_id = :agency_id"
+    return {
+        "accounts": db.execute(text(f"SELECT COUNT(*) FROM ({accounts}) a"), params).scalar(),
+        "account_executions": db.execute(
+            text(f"SELECT COUNT(*) FROM account_execution WHERE snap_account_id IN ({accounts})"), params).scalar(),
+        "status_logs": db.execute(
+            text(f"SELECT COUNT(*) FROM snapchat_account_status_log WHERE snapchat_account_id IN ({accounts})"),
+            params).scalar(),
+    }
+
+
+def run_benchmarks(session_factory, ctx: BenchmarkContext, repeat: int, warmup: int,
+                   include_writes: bool, only: Optional[str]) -> dict:
+    results = {}
+    for name, case in CASES.items():
+        if only and only not in name:
+            continue
+        if case.writes and not include_writes:
+            results[name] = {"skipped": "writes to the database, run with --include-writes"}
+            continue
+
+        runs_ms = []
+        for iteration in range(warmup + repeat):
+            # Measure the database path, not the caches in front of it.
+            StatisticsCache.invalidate([ctx.agency_id])
+            AccountScoreCache.invalidate()
+            with session_factory() as db:
+                started = time.perf_counter()
+                case.run(db, ctx)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+            if iteration >= warmup:
+                runs_ms.append(round(elapsed_ms, 3))
+
+        results[name] = {
+            "runs_ms": runs_ms,
+            "min_ms": min(runs_ms),
+            "median_ms": statistics.median(runs_ms),
+            "mean_ms": round(statistics.mean(runs_ms), 3),
+            "max_ms": max(runs_ms),
+        }
+        logger.info(f"{name}: median {results[name]['median_ms']:.1f} ms over {repeat} runs")
+    return results
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> bool:
+    """Prints median timings against a baseline report; returns False if any method regressed."""
+    ok = True
+    print(f"{'method':<55} {'baseline ms':>12} {'current ms':>12} {'ratio':>7}")
+    for name, result in report["results"].items():
+        previous = baseline.get("results", {}).get(name, {})
+        if "median_ms" not in result or "median_ms" not in previous:
+            continue
+        ratio = result["median_ms"] / previous["median_ms"] if previous["median_ms"] else float("inf")
+        regressed = ratio > threshold
+        ok = ok and not regressed
+        print(f"{name:<55} {previous['median_ms']:>12.1f} {result['median_ms']:>12.1f} {ratio:>7.2f}"
+              + ("  REGRESSION" if regressed else ""))
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SnapchatAccountStatisticsService.")
+    parser.add_argument("--database-url", default=os.getenv("BENCHMARK_DATABASE_URL"),
+                        help="Database to benchmark against (or BENCHMARK_DATABASE_URL). Use a dedicated database.")
+    parser.add_argument("--seed", action="store_true", help="(Re)seed the benchmark agency before running.")
+    parser.add_argument("--accounts", type=int, default=SeedConfig.accounts)
+    parser.add_argument("--executions", type=int, default=SeedConfig.executions)
+    parser.add_argument("--status-changes-per-account", type=int, default=SeedConfig.status_changes_per_account)
+    parser.add_argument("--models", type=int, default=SeedConfig.models)
+    parser.add_argument("--days", type=int, default=SeedConfig.days, help="Spread of the seeded history in days.")
+    parser.add_argument("--agency-name", default=SeedConfig.agency_name)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--sample-size", type=int, default=1000,
+                        help="Number of accounts used by the bulk/rebuild cases.")
+    parser.add_argument("--include-writes", action="store_true",
+                        help="Also time methods that write (compute/rebuild).")
+    parser.add_argument("--only", default=None, help="Only run cases whose name contains this string.")
+    parser.add_argument("--output", default="statistics_benchmark.json")
+    parser.add_argument("--compare", default=None, help="Baseline report to compare against.")
+    parser.add_argument("--regression-threshold", type=float, default=1.2,
+                        help="Median ratio above which a method counts as regressed.")
+    args = parser.parse_args()
+
+    if not args.database_url:
+        parser.error("--database-url (or BENCHMARK_DATABASE_URL) is required")
+    _check_coverage()
+    logging.getLogger("app.utils.statistics_cache").setLevel(logging.ERROR)
+
+    engine = create_engine(args.database_url, pool_size=5, max_overflow=0)
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+
+    seed_config = SeedConfig(
+        accounts=args.accounts, executions=args.executions,
+        status_changes_per_account=args.status_changes_per_account,
+        models=args.models, days=args.days, agency_name=args.agency_name,
+    )
+    if args.seed:
+        agency_id = seed(engine, seed_config)
+    else:
+        with session_factory() as db:
+            agency_id = db.execute(text("SELECT id FROM agencies WHERE name = :name"),
+                                   {"name": args.agency_name}).scalar()
+        if agency_id is None:
+            parser.error(f"Agency '{args.agency_name}' not found; run with --seed first.")
+
+    with session_factory() as db:
+        ctx = _build_context(db, agency_id, args.sample_size)
+        volumes = _volumes(db, agency_id)
+
+    report = {
+        "generated_at": datetime.utcnow().isoformat(),
+        "git_commit": _git_commit(),
+        "volumes": volumes,
+        "seed_config": asdict(seed_config) if args.seed else None,
+        "repeat": args.repeat,
+        "warmup": args.warmup,
+        "results": run_benchmarks(session_factory, ctx, args.repeat, args.warmup, args.include_writes, args.only),
+        "not_benchmarked": NOT_BENCHMARKED,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if not compare(report, baseline, args.regression_threshold):
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    main()
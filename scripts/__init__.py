@@ -0,0 +1,4 @@
+import os
+
+# CLIs get the small "script" connection pool profile (see app/database.py).
+os.environ.setdefault("DB_PROCESS_ROLE", "script")
@@ -0,0 +1,37 @@
+"""
+Rebuilds the daily activity rollup (agency_daily_activity / snapchat_account_daily_activity)
+from the account_execution history.
+
+Usage:
+    python -m scripts.backfill_daily_activity            # full history
+    python -m scripts.backfill_daily_activity --days 30  # only the last 30 days
+"""
+import argparse
+import logging
+from datetime import datetime, timedelta
+
+from app.database import SessionLocal
+from app.schemas import *  # noqa: F401,F403 - register every mapper before querying
+from app.services.snapchat_account_statistics_service import SnapchatAccountStatisticsService
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill the daily activity rollup from account executions.")
+    parser.add_argument("--days", type=int, default=None,
+                        help="Only rebuild the last N days instead of the full history.")
+    args = parser.parse_args()
+
+    since = (datetime.utcnow() - timedelta(days=args.days)).date() if args.days is not None else None
+    db = SessionLocal()
+    try:
+        rows = SnapchatAccountStatisticsService.rebuild_daily_activity(db, since=since)
+        print(f"Rebuilt {rows} daily activity rows" + (f" since {since}." if since else "."))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,53 @@
+"""
+Exports agency-scoped statistics to Parquet or Arrow IPC files.
+
+Usage:
+    python -m scripts.export_statistics --agency-id 1 --dataset account_executions \
+        --columns id,snapchat_account_id,type,status,start_time,total_sent_requests \
+        --date-from 2024-01-01 --date-to 2024-02-01 --output executions.parquet
+"""
+import argparse
+import logging
+from datetime import datetime
+
+from app.database import SessionLocal
+from app.schemas import *  # noqa: F401,F403 - register every mapper before querying
+from app.services.statistics_export_service import StatisticsExportService
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export agency statistics to a columnar file.")
+    parser.add_argument("--agency-id", type=int, required=True)
+    parser.add_argument("--dataset", required=True, choices=list(StatisticsExportService.DATASETS))
+    parser.add_argument("--format", dest="file_format", default="parquet", choices=StatisticsExportService.FORMATS)
+    parser.add_argument("--columns", default=None, help="Comma separated subset of the dataset's columns.")
+    parser.add_argument("--date-from", type=datetime.fromisoformat, default=None,
+                        help="Inclusive lower bound on the dataset's time column (ISO format).")
+    parser.add_argument("--date-to", type=datetime.fromisoformat, default=None,
+                        help="Exclusive upper bound on the dataset's time column (ISO format).")
+    parser.add_argument("--output", required=True, help="Path of the file to write.")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        with open(args.output, "wb") as sink:
+            rows = StatisticsExportService.export(
+                db=db,
+                agency_id=args.agency_id,
+                dataset_name=args.dataset,
+                sink=sink,
+                file_format=args.file_format,
+                columns=[column.strip() for column in args.columns.split(",")] if args.columns else None,
+                date_from=args.date_from,
+                date_to=args.date_to,
+            )
+        print(f"Wrote {rows} rows to {args.output}.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,47 @@
+import os
+import sys
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+# The generated protobuf modules import each other by bare name, as in app.main
+protobuf_path = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, "app", "protos"))
+if protobuf_path not in sys.path:
+    sys.path.append(protobuf_path)
+
+from app.database import Base  # noqa: E402
+from app.schemas import *  # noqa: F401,F403 - register every table before create_all
+from app.schemas.invitation_token import InvitationToken  # noqa: F401 - not exported by app.schemas
+from app.schemas.subscription import Subscription  # noqa: F401 - not exported by app.schemas
+import app.event_listeners  # noqa: F401 - registers the session and mapper listeners
+
+# Tests run against a disposable Postgres database (never production), e.g.
+# TEST_DATABASE_URL=postgresql+psycopg2://postgres@localhost:5432/test
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+@pytest.fixture(scope="session")
+def engine():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    engine = create_engine(TEST_DATABASE_URL)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def connection(engine):
+    """A connection whose outer transaction is rolled back after the test."""
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        yield connection
+        transaction.rollback()
+
+
+@pytest.fixture
+def db(connection):
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    yield session
+    session.close()
@@ -0,0 +1,128 @@
+import io
+from datetime import date, datetime, timedelta
+
+import pyarrow.parquet as pq
+import pytest
+
+from app.dtos.execution_response import ExecutionResponse
+from app.models.account_status_enum import AccountStatusEnum
+from app.models.execution_type_enum import ExecutionTypeEnum
+from app.models.status_enum import StatusEnum
+from app.schemas.agency import Agency
+from app.schemas.executions.account_execution import AccountExecution
+from app.schemas.executions.execution import Execution
+from app.schemas.snapchat_account import SnapchatAccount
+from app.services.execution_archive_service import ExecutionArchiveService
+from app.services.job_executor_service import JobExecutorService
+from app.services.partition_service import PartitionService
+from app.services.snapchat_account_statistics_service import SnapchatAccountStatisticsService
+from app.services.statistics_export_service import StatisticsExportService
+
+ARCHIVE_BOUNDARY = datetime(2026, 1, 1)
+
+
+@pytest.fixture
+def account(db):
+    PartitionService.ensure_partitions(db, months_ahead=0)
+    agency = Agency(name="archive-test")
+    db.add(agency)
+    db.flush()
+    account = SnapchatAccount(
+        agency_id=agency.id, username="archived", password="password",
+        snapchat_link="https://snapchat.com/add/archived", account_source="test",
+        status=AccountStatusEnum.GOOD_STANDING, added_to_system_date=datetime.utcnow() - timedelta(days=90),
+    )
+    db.add(account)
+    db.flush()
+    return account
+
+
+def _execution(db, account, start_time):
+    execution = Execution(
+        agency_id=account.agency_id, type=ExecutionTypeEnum.STATUS_CHECK, start_time=start_time,
+        triggered_by="test", configuration={}, status=StatusEnum.DONE,
+    )
+    db.add(execution)
+    db.flush()
+    return execution
+
+
+def test_page_continues_into_the_archive(db, account, monkeypatch):
+    hot = _execution(db, account, datetime.utcnow())
+    db.add(AccountExecution(
+        execution_id=hot.id, snap_account_id=account.id, type=ExecutionTypeEnum.STATUS_CHECK,
+        status=StatusEnum.DONE, start_time=hot.start_time,
+    ))
+    archived = _execution(db, account, datetime.utcnow() - timedelta(days=60))
+    db.flush()
+    archived_row = {
+        "id": 10 ** 9, "execution_id": archived.id, "snap_account_id": account.id,
+        "type": ExecutionTypeEnum.STATUS_CHECK, "status": StatusEnum.DONE, "result": {"status": "GOOD"},
+        "message": None, "start_time": archived.start_time, "end_time": None,
+    }
+    monkeypatch.setattr(ExecutionArchiveService, "read_account_executions",
+                        staticmethod(lambda db, snapchat_account_id: [archived_row]))
+
+    executions = JobExecutorService.get_executions_by_snapchat_account(db, account.id, limit=10, offset=0)
+
+    assert [execution.id for execution in executions] == [hot.id, archived.id]
+    assert isinstance(executions[1], ExecutionResponse)
+    [archived_account_execution] = executions[1].account_executions
+    assert archived_account_execution.id == archived_row["id"]
+    assert archived_account_execution.snapchat_account_username == "archived"
+    assert archived_account_execution.result == {"status": "GOOD"}
+    # Nothing read back from the archive is attached to the session, so a flush cannot re-insert it.
+    assert not db.new
+    assert len(account.account_executions) == 1
+
+
+def test_offset_skips_the_hot_executions(db, account, monkeypatch):
+    _execution(db, account, datetime.utcnow())
+    archived = [_execution(db, account, datetime.utcnow() - timedelta(days=days)) for days in (60, 61)]
+    monkeypatch.setattr(ExecutionArchiveService, "read_account_executions", staticmethod(
+        lambda db, snapchat_account_id: [
+            {"id": 10 ** 9 + index, "execution_id": execution.id, "snap_account_id": account.id,
+             "type": ExecutionTypeEnum.STATUS_CHECK, "status": StatusEnum.DONE, "result": None,
+             "message": None, "start_time": execution.start_time, "end_time": None}
+            for index, execution in enumerate(archived)
+        ]
+    ))
+
+    executions = JobExecutorService.get_executions_by_snapchat_account(db, account.id, limit=1, offset=1)
+
+    assert [execution.id for execution in executions] == [archived[1].id]
+
+
+@pytest.fixture
+def archived_before_boundary(monkeypatch):
+    monkeypatch.setattr(ExecutionArchiveService, "archive_boundary", staticmethod(lambda db: ARCHIVE_BOUNDARY))
+
+
+@pytest.mark.parametrize("rebuild", [
+    lambda: SnapchatAccountStatisticsService.rebuild_execution_rollups(None, [1]),
+    lambda: SnapchatAccountStatisticsService.rebuild_daily_activity(None),
+    lambda: SnapchatAccountStatisticsService.rebuild_daily_activity(None, since=date(2025, 12, 31)),
+    lambda: StatisticsExportService.export(None, 1, "account_executions", io.BytesIO(),
+                                           date_from=ARCHIVE_BOUNDARY - timedelta(seconds=1)),
+])
+def test_reads_reaching_into_archived_months_are_refused(archived_before_boundary, rebuild):
+    with pytest.raises(ValueError, match="archived"):
+        rebuild()
+
+
+def test_export_starts_at_the_archive_boundary_by_default(db, account, archived_before_boundary):
+    for start_time in (ARCHIVE_BOUNDARY - timedelta(days=1), ARCHIVE_BOUNDARY + timedelta(days=1)):
+        execution = _execution(db, account, start_time)
+        db.add(AccountExecution(
+            execution_id=execution.id, snap_account_id=account.id, type=ExecutionTypeEnum.STATUS_CHECK,
+            status=StatusEnum.DONE, start_time=start_time,
+        ))
+    db.flush()
+    sink = io.BytesIO()
+
+    rows = StatisticsExportService.export(db, account.agency_id, "account_executions", sink,
+                                          columns=["start_time"])
+
+    assert rows == 1
+    sink.seek(0)
+    assert pq.read_table(sink).column("start_time").to_pylist() == [ARCHIVE_BOUNDARY + timedelta(days=1)]
@@ -0,0 +1,175 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import inspect, select
+
+from app.models.account_status_enum import AccountStatusEnum
+from app.models.workflow_step_type_enum import WorkflowStepTypeEnum
+from app.schemas.agency import Agency
+from app.schemas.agency_account_status_count import AgencyAccountStatusCount
+from app.schemas.snapchat_account import SnapchatAccount
+from app.schemas.snapchat_account_status_interval import SnapchatAccountStatusInterval
+from app.schemas.snapchat_account_status_log import SnapchatAccountStatusLog
+from app.schemas.workflow.workflow import Workflow
+from app.schemas.workflow.workflow_step import WorkflowStep
+from app.services.snapchat_account_service import SnapchatAccountService
+from app.services.snapchat_account_statistics_service import SnapchatAccountStatisticsService
+from app.services.workflow_service import WorkflowsService
+
+
+def _account(agency_id, username, **kwargs):
+    return SnapchatAccount(**{
+        "agency_id": agency_id, "username": username, "password": "password",
+        "snapchat_link": f"https://snapchat.com/add/{username}", "account_source": "test",
+        "status": AccountStatusEnum.GOOD_STANDING, "added_to_system_date": datetime.utcnow() - timedelta(days=1),
+        **kwargs,
+    })
+
+
+def test_bulk_update_expires_only_matching_accounts(db):
+    agency = Agency(name="bulk-update-test")
+    db.add(agency)
+    db.flush()
+    account, other_account = _account(agency.id, "bulk_update"), _account(agency.id, "bulk_update_other")
+    workflow = Workflow(agency_id=agency.id, name="bulk-update-workflow")
+    db.add_all([account, other_account, workflow])
+    db.flush()
+
+    updated = SnapchatAccountService.update_accounts_where(
+        db, SnapchatAccount.id == account.id, status=AccountStatusEnum.LOCKED.value
+    )
+
+    assert updated == 1
+    assert "status" in inspect(account).expired_attributes
+    assert not inspect(other_account).expired_attributes
+    assert not inspect(workflow).expired_attributes
+    assert account.status is AccountStatusEnum.LOCKED
+
+
+@pytest.mark.parametrize("action_type, action_value, tags, expected_tags, expected_updated", [
+    (WorkflowStepTypeEnum.ADD_TAG, "new", [None, ["old"], ["new"]], [["new"], ["old", "new"], ["new"]], 2),
+    (WorkflowStepTypeEnum.REMOVE_TAG, "old", [None, ["old", "kept"], ["kept"]], [None, ["kept"], ["kept"]], 1),
+])
+def test_workflow_tag_steps_only_update_accounts_they_change(db, action_type, action_value, tags,
+                                                              expected_tags, expected_updated):
+    agency = Agency(name="workflow-step-test")
+    db.add(agency)
+    db.flush()
+    workflow = Workflow(agency_id=agency.id, name="workflow-step-test")
+    db.add(workflow)
+    db.flush()
+    now = datetime.utcnow()
+    accounts = [
+        _account(agency.id, f"workflow_step{index}", workflow_id=workflow.id, tags=account_tags,
+                 added_to_system_date=now - timedelta(days=2, hours=1))
+        for index, account_tags in enumerate(tags)
+    ]
+    # Added a day too late for the step's day_offset
+    too_new = _account(agency.id, "workflow_step_new", workflow_id=workflow.id, tags=None,
+                       added_to_system_date=now - timedelta(hours=1))
+    db.add_all([*accounts, too_new])
+    db.flush()
+    step = WorkflowStep(workflow_id=workflow.id, day_offset=2, action_type=action_type, action_value=action_value)
+
+    updated = WorkflowsService.apply_workflow_step(db, step, now)
+
+    assert updated == expected_updated
+    assert [account.tags for account in accounts] == expected_tags
+    assert too_new.tags is None
+
+
+def test_workflow_status_step_skips_accounts_already_in_the_status(db):
+    agency = Agency(name="workflow-status-step-test")
+    db.add(agency)
+    db.flush()
+    workflow = Workflow(agency_id=agency.id, name="workflow-status-step-test")
+    db.add(workflow)
+    db.flush()
+    now = datetime.utcnow()
+    accounts = [_account(agency.id, f"workflow_status{index}", workflow_id=workflow.id, status=status,
+                         added_to_system_date=now - timedelta(hours=1))
+                for index, status in enumerate((AccountStatusEnum.GOOD_STANDING, AccountStatusEnum.LOCKED))]
+    db.add_all(accounts)
+    db.flush()
+    step = WorkflowStep(workflow_id=workflow.id, day_offset=0, action_type=WorkflowStepTypeEnum.CHANGE_STATUS,
+                        action_value=AccountStatusEnum.LOCKED.value)
+
+    assert WorkflowsService.apply_workflow_step(db, step, now) == 1
+    assert [account.status for account in accounts] == [AccountStatusEnum.LOCKED] * 2
+
+
+def _status_counts(db, agency_id):
+    return {
+        count.status: (count.accounts, count.completed_quick_add_accounts)
+        for count in db.scalars(select(AgencyAccountStatusCount).where(AgencyAccountStatusCount.agency_id == agency_id))
+        if count.accounts or count.completed_quick_add_accounts
+    }
+
+
+def test_bulk_status_change_is_logged_and_counted(db):
+    agency = Agency(name="bulk-status-test")
+    db.add(agency)
+    db.flush()
+    accounts = [
+        SnapchatAccount(
+            agency_id=agency.id, username=f"bulk_status{index}", password="password",
+            snapchat_link=f"https://snapchat.com/add/bulk_status{index}", account_source="test", status=status,
+            has_completed_quick_add=index == 0, added_to_system_date=datetime.utcnow() - timedelta(days=1),
+        )
+        for index, status in enumerate((AccountStatusEnum.GOOD_STANDING, AccountStatusEnum.GOOD_STANDING,
+                                        AccountStatusEnum.LOCKED))
+    ]
+    db.add_all(accounts)
+    db.flush()
+    account_ids = [account.id for account in accounts]
+
+    updated = SnapchatAccountService.update_accounts_where(
+        db, SnapchatAccount.id.in_(account_ids), status=AccountStatusEnum.LOCKED.value
+    )
+
+    assert updated == 3
+    logs = db.scalars(select(SnapchatAccountStatusLog)
+                      .where(SnapchatAccountStatusLog.snapchat_account_id.in_(account_ids))).all()
+    assert sorted((log.snapchat_account_id, log.old_status, log.new_status) for log in logs) == [
+        (account_id, AccountStatusEnum.GOOD_STANDING, AccountStatusEnum.LOCKED) for account_id in account_ids[:2]
+    ]
+    intervals = db.scalars(select(SnapchatAccountStatusInterval)
+                           .where(SnapchatAccountStatusInterval.snapchat_account_id.in_(account_ids))).all()
+    assert sorted((interval.snapchat_account_id, interval.status, interval.is_first_exit, interval.exited_at)
+                  for interval in intervals) == [
+        (account_id, AccountStatusEnum.LOCKED, True, None) for account_id in account_ids[:2]
+    ]
+    assert _status_counts(db, agency.id) == {AccountStatusEnum.LOCKED: (3, 1)}
+
+
+def test_rebuilt_first_exits_match_the_live_ones(db):
+    agency = Agency(name="first-exit-rebuild-test")
+    db.add(agency)
+    db.flush()
+    account = SnapchatAccount(
+        agency_id=agency.id, username="first_exit_rebuild", password="password",
+        snapchat_link="https://snapchat.com/add/first_exit_rebuild", account_source="test",
+        status=AccountStatusEnum.GOOD_STANDING, added_to_system_date=datetime.utcnow() - timedelta(days=1),
+    )
+    db.add(account)
+    db.flush()
+    for status in (AccountStatusEnum.RECENTLY_INGESTED, AccountStatusEnum.CAPTCHA, AccountStatusEnum.LOCKED):
+        SnapchatAccountService.update_accounts_where(
+            db, SnapchatAccount.id == account.id, status=status.value
+        )
+
+    def first_exits():
+        return db.execute(
+            select(SnapchatAccountStatusInterval.status, SnapchatAccountStatusInterval.is_first_exit)
+            .where(SnapchatAccountStatusInterval.snapchat_account_id == account.id)
+            .order_by(SnapchatAccountStatusInterval.entered_at, SnapchatAccountStatusInterval.id)
+        ).all()
+
+    live = first_exits()
+    SnapchatAccountStatisticsService.rebuild_status_intervals(db)
+
+    assert live == [
+        (AccountStatusEnum.RECENTLY_INGESTED, False), (AccountStatusEnum.CAPTCHA, True),
+        (AccountStatusEnum.LOCKED, False),
+    ]
+    assert first_exits() == live
@@ -0,0 +1,255 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm.attributes import set_committed_value
+
+import app.event_listeners as event_listeners
+from app.event_listeners import log_status_changes, record_status_changes, to_enum_if_str
+from app.models.account_status_enum import AccountStatusEnum
+from app.schemas.agency import Agency
+from app.schemas.snapchat_account import SnapchatAccount
+from app.schemas.snapchat_account_status_interval import SnapchatAccountStatusInterval
+from app.schemas.snapchat_account_status_log import SnapchatAccountStatusLog
+
+
+@pytest.fixture
+def agency(db):
+    agency = Agency(name="status-listener-test")
+    db.add(agency)
+    db.flush()
+    return agency
+
+
+@pytest.fixture
+def make_account(db, agency):
+    def make(username, status=AccountStatusEnum.GOOD_STANDING, added_to_system_date=None):
+        account = SnapchatAccount(
+            agency_id=agency.id, username=username, password="password",
+            snapchat_link=f"https://snapchat.com/add/{username}", account_source="test", status=status,
+            added_to_system_date=added_to_system_date or datetime.utcnow() - timedelta(days=1),
+        )
+        db.add(account)
+        db.flush()
+        return account
+    return make
+
+
+@pytest.fixture
+def statements(connection):
+    """The SQL statements executed on the test connection after the fixture is requested."""
+    executed = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(connection, "before_cursor_execute", capture)
+    yield executed
+    event.remove(connection, "before_cursor_execute", capture)
+
+
+def _logs(db, account_ids):
+    return db.scalars(
+        select(SnapchatAccountStatusLog)
+        .where(SnapchatAccountStatusLog.snapchat_account_id.in_(account_ids))
+        .order_by(SnapchatAccountStatusLog.id)
+    ).all()
+
+
+def _intervals(db, account_id):
+    return db.scalars(
+        select(SnapchatAccountStatusInterval)
+        .where(SnapchatAccountStatusInterval.snapchat_account_id == account_id)
+        .order_by(SnapchatAccountStatusInterval.id)
+    ).all()
+
+
+def test_to_enum_if_str():
+    assert to_enum_if_str("LOCKED") is AccountStatusEnum.LOCKED
+    assert to_enum_if_str(AccountStatusEnum.LOCKED) is AccountStatusEnum.LOCKED
+    assert to_enum_if_str(None) is None
+    with pytest.raises(ValueError):
+        to_enum_if_str("NOT_A_STATUS")
+
+
+def _loaded_account(account_id, status):
+    """A detached account whose loaded status is `status`, as if read from the database."""
+    account = SnapchatAccount()
+    set_committed_value(account, "id", account_id)
+    set_committed_value(account, "status", status)
+    return account
+
+
+class _RecordingConnection:
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, statement):
+        self.statements.append(statement)
+
+
+def test_flush_changes_are_collected_and_normalized(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(event_listeners, "record_status_changes",
+                        lambda connection, changes, changed_at: recorded.append((connection, changes, changed_at)))
+    locked, captcha, unchanged, deleted = (
+        _loaded_account(account_id, AccountStatusEnum.GOOD_STANDING) for account_id in (1, 2, 3, 4)
+    )
+    locked.status = "LOCKED"
+    captcha.status = AccountStatusEnum.CAPTCHA
+    unchanged.status = "GOOD_STANDING"
+    deleted.status = AccountStatusEnum.TERMINATED
+    connection = object()
+    session = SimpleNamespace(dirty=[locked, captcha, unchanged, deleted, object()], deleted={deleted},
+                              connection=lambda: connection)
+
+    log_status_changes(session, None)
+
+    [(used_connection, changes, _)] = recorded
+    assert used_connection is connection
+    assert changes == [
+        (1, AccountStatusEnum.GOOD_STANDING, AccountStatusEnum.LOCKED),
+        (2, AccountStatusEnum.GOOD_STANDING, AccountStatusEnum.CAPTCHA),
+    ]
+
+
+def test_flush_without_status_changes_records_nothing(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(event_listeners, "record_status_changes", lambda *args: recorded.append(args))
+    account = _loaded_account(1, AccountStatusEnum.GOOD_STANDING)
+    account.status = "GOOD_STANDING"
+
+    log_status_changes(SimpleNamespace(dirty=[account], deleted=set(), connection=lambda: None), None)
+
+    assert recorded == []
+
+
+def test_status_changes_are_logged_with_one_multi_row_insert():
+    connection = _RecordingConnection()
+    changed_at = datetime(2026, 1, 1)
+    changes = [(account_id, AccountStatusEnum.GOOD_STANDING, AccountStatusEnum.LOCKED) for account_id in (1, 2, 3)]
+
+    record_status_changes(connection, changes, changed_at)
+
+    log_inserts = [statement for statement in connection.statements
+                   if statement.is_insert and statement.table.name == "snapchat_account_status_log"]
+    assert len(log_inserts) == 1
+    params = log_inserts[0].compile(dialect=postgresql.dialect()).params
+    assert [params[f"snapchat_account_id_m{row}"] for row in range(3)] == [1, 2, 3]
+    assert {params[f"new_status_m{row}"] for row in range(3)} == {AccountStatusEnum.LOCKED}
+    assert {params[f"changed_at_m{row}"] for row in range(3)} == {changed_at}
+
+
+def test_one_log_insert_per_flush(db, make_account, statements):
+    accounts = [make_account(f"bulk{index}") for index in range(3)]
+    statements.clear()
+
+    for account in accounts:
+        account.status = AccountStatusEnum.LOCKED
+    db.flush()
+
+    log_inserts = [statement for statement in statements
+                   if statement.startswith("INSERT INTO snapchat_account_status_log")]
+    assert len(log_inserts) == 1
+    logs = _logs(db, [account.id for account in accounts])
+    assert sorted(log.snapchat_account_id for log in logs) == sorted(account.id for account in accounts)
+    assert {(log.old_status, log.new_status) for log in logs} == {
+        (AccountStatusEnum.GOOD_STANDING, AccountStatusEnum.LOCKED)
+    }
+
+
+def test_changes_of_one_flush_share_changed_at(db, make_account):
+    first, second = make_account("shared1"), make_account("shared2")
+
+    first.status = AccountStatusEnum.LOCKED
+    second.status = AccountStatusEnum.CAPTCHA
+    db.flush()
+
+    logs = _logs(db, [first.id, second.id])
+    assert len(logs) == 2
+    assert logs[0].changed_at == logs[1].changed_at
+    entered = {interval.entered_at for account in (first, second) for interval in _intervals(db, account.id)}
+    assert entered == {logs[0].changed_at}
+
+
+def test_string_status_is_normalized(db, make_account):
+    account = make_account("string_status")
+
+    account.status = "LOCKED"
+    db.flush()
+
+    [log] = _logs(db, [account.id])
+    assert log.old_status is AccountStatusEnum.GOOD_STANDING
+    assert log.new_status is AccountStatusEnum.LOCKED
+
+
+@pytest.mark.parametrize("same_status", [AccountStatusEnum.GOOD_STANDING, "GOOD_STANDING"])
+def test_no_op_assignment_is_not_logged(db, make_account, same_status):
+    account = make_account("no_op")
+
+    account.status = same_status
+    db.flush()
+
+    assert _logs(db, [account.id]) == []
+    assert _intervals(db, account.id) == []
+
+
+def test_open_interval_is_closed_and_new_one_opened(db, make_account):
+    account = make_account("intervals")
+    account.status = AccountStatusEnum.LOCKED
+    db.flush()
+
+    account.status = AccountStatusEnum.GOOD_STANDING
+    db.flush()
+
+    first, second = _intervals(db, account.id)
+    logs = _logs(db, [account.id])
+    assert first.status is AccountStatusEnum.LOCKED
+    assert first.entered_at == logs[0].changed_at
+    assert first.exited_at == logs[1].changed_at
+    assert second.status is AccountStatusEnum.GOOD_STANDING
+    assert second.entered_at == logs[1].changed_at
+    assert second.exited_at is None
+
+
+def test_first_exit_is_flagged_once(db, make_account):
+    account = make_account("first_exit")
+
+    for status in (AccountStatusEnum.LOCKED, AccountStatusEnum.GOOD_STANDING, AccountStatusEnum.CAPTCHA):
+        account.status = status
+        db.flush()
+
+    assert [(interval.status, interval.is_first_exit) for interval in _intervals(db, account.id)] == [
+        (AccountStatusEnum.LOCKED, True),
+        (AccountStatusEnum.GOOD_STANDING, False),
+        (AccountStatusEnum.CAPTCHA, False),
+    ]
+
+
+@pytest.mark.parametrize("new_status", [AccountStatusEnum.GOOD_STANDING, AccountStatusEnum.RECENTLY_INGESTED])
+def test_move_between_exit_from_statuses_is_not_a_first_exit(db, make_account, new_status):
+    old_status = (AccountStatusEnum.RECENTLY_INGESTED if new_status is AccountStatusEnum.GOOD_STANDING
+                  else AccountStatusEnum.GOOD_STANDING)
+    account = make_account("no_exit", status=old_status)
+
+    account.status = new_status
+    db.flush()
+
+    [interval] = _intervals(db, account.id)
+    assert interval.is_first_exit is False
+
+
+def test_change_before_added_to_system_is_not_a_first_exit(db, make_account):
+    added_to_system_date = datetime.utcnow()
+    account = make_account("added_later", added_to_system_date=added_to_system_date)
+
+    record_status_changes(
+        db.connection(), [(account.id, AccountStatusEnum.GOOD_STANDING, AccountStatusEnum.LOCKED)],
+        added_to_system_date
+    )
+
+    [interval] = _intervals(db, account.id)
+    assert interval.status is AccountStatusEnum.LOCKED
+    assert interval.is_first_exit is False
@@ -0,0 +1,49 @@
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from app.routers import snapchat_account_router
+from app.services.snapchat_account_statistics_service import SnapchatAccountStatisticsService
+
+
+@pytest.fixture
+def missing_account(monkeypatch):
+    """Makes the timeline lookup fail as for a missing or foreign account, recording its arguments."""
+    calls = []
+
+    def get_user_timeline_statistics(db, account_id, agency_id=None, limit=None, after=None):
+        calls.append(after)
+        raise ValueError(f"No Snapchat account found with ID {account_id}")
+
+    monkeypatch.setattr(SnapchatAccountStatisticsService, "get_user_timeline_statistics",
+                        staticmethod(get_user_timeline_statistics))
+    return calls
+
+
+def _get_timeline(cursor):
+    return snapchat_account_router.get_user_timeline_statistics(
+        account_id=1, db=None, current_user={}, agency_id=1, limit=10, cursor=cursor
+    )
+
+
+def test_decode_timeline_cursor_round_trip():
+    start_time = datetime(2026, 1, 2, 3, 4, 5, 6)
+    cursor = SnapchatAccountStatisticsService.encode_timeline_cursor(start_time, 42)
+    assert SnapchatAccountStatisticsService.decode_timeline_cursor(cursor) == (start_time, 42)
+
+
+@pytest.mark.parametrize("cursor", [None, SnapchatAccountStatisticsService.encode_timeline_cursor(datetime(2026, 1, 1), 7)])
+def test_missing_account_is_404_with_or_without_cursor(missing_account, cursor):
+    with pytest.raises(HTTPException) as error:
+        _get_timeline(cursor)
+    assert error.value.status_code == 404
+    assert missing_account == [None if cursor is None else (datetime(2026, 1, 1), 7)]
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "2026-01-01T00:00:00|x"])
+def test_malformed_cursor_is_400(missing_account, cursor):
+    with pytest.raises(HTTPException) as error:
+        _get_timeline(cursor)
+    assert error.value.status_code == 400
+    assert missing_account == []